@@ -1,45 +1,6 @@
-from . import agents
-from . import archive
-from . import auth
-from . import bots
-from . import chunker
-from . import cli
-from . import components
-from . import database
-from . import discovery_engine
-from . import embedder
-from . import excel
-from . import gcs
-from . import genai
-from . import invoke
-from . import langfuse
-from . import llamaindex
-from . import lookup
-try:
-    from . import mcp
-except ImportError:
-    mcp = None
-try:
-    from . import adk
-except ImportError:
-    adk = None
-try:
-    from . import channels
-except ImportError:
-    channels = None
-try:
-    from . import messaging
-except ImportError:
-    messaging = None
-from . import ollama
-from . import pubsub
-from . import qna
-from . import senses
-from . import streaming
-from . import terraform
-from . import tools
-from . import utils
-from . import vertex
+# Subpackages are imported on first attribute access (PEP 562), so `import sunholo`
+# stays cheap and code only pays for the subpackages it uses.
+from ._lazy import lazy_attributes
 import logging
 
 
@@ -75,4 +36,7 @@ __all__ = ['adk',
            'vertex',
            'logging']
 
-
+__getattr__, __dir__ = lazy_attributes(
+    __name__, globals(),
+    {name: f".{name}" for name in __all__ if name != 'logging'},
+    optional=('mcp', 'adk', 'channels', 'messaging'))
@@ -0,0 +1,67 @@
+#   Copyright [2024] [Holosun ApS]
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+import importlib
+
+
+def lazy_attributes(package: str, namespace: dict, attributes: dict, optional=()):
+    """
+    Returns PEP 562 `__getattr__` and `__dir__` functions that import a package's attributes on first use.
+
+    Args:
+        package: The `__name__` of the package.
+        namespace: The package's `globals()`, where loaded attributes are stored.
+        attributes: Maps attribute name to "module" or "module:attribute", relative to the package.
+            Other names are imported as submodules of the package, if there is one.
+        optional: Attribute names that are None instead of raising if their module can't be imported.
+
+    Example:
+    ```python
+    __getattr__, __dir__ = lazy_attributes(__name__, globals(), {
+        "create_app": ".flask:create_app",
+        "flask": ".flask",
+    })
+    ```
+    """
+    def __getattr__(name):
+        target = attributes.get(name)
+        if target is None:
+            return _submodule(name)
+
+        module_name, _, attribute = target.partition(":")
+        try:
+            module = importlib.import_module(module_name, package)
+        except ImportError:
+            if name not in optional:
+                raise
+            value = None
+        else:
+            value = getattr(module, attribute) if attribute else module
+
+        namespace[name] = value
+        return value
+
+    def _submodule(name):
+        # submodules that aren't mapped are still reachable as attributes
+        if not name.startswith("__"):
+            try:
+                return importlib.import_module(f".{name}", package)
+            except ModuleNotFoundError as err:
+                if err.name != f"{package}.{name}":
+                    raise
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    def __dir__():
+        return sorted(set(namespace) | set(attributes))
+
+    return __getattr__, __dir__
@@ -1,7 +1,17 @@
-from .chat_history import extract_chat_history
-from .dispatch_to_qa import send_to_qa, send_to_qa_async
-from .pubsub import process_pubsub
-from .special_commands import handle_special_commands, app_to_store, handle_files
-from .flask import create_app, VACRoutes
-from .fastapi import register_qna_fastapi_routes, create_fastapi_app
-from .swagger import config_to_swagger
+# The Flask and FastAPI apps are only imported when used, see sunholo/_lazy.py
+from .._lazy import lazy_attributes
+
+__getattr__, __dir__ = lazy_attributes(__name__, globals(), {
+    "extract_chat_history": ".chat_history:extract_chat_history",
+    "send_to_qa": ".dispatch_to_qa:send_to_qa",
+    "send_to_qa_async": ".dispatch_to_qa:send_to_qa_async",
+    "process_pubsub": ".pubsub:process_pubsub",
+    "handle_special_commands": ".special_commands:handle_special_commands",
+    "app_to_store": ".special_commands:app_to_store",
+    "handle_files": ".special_commands:handle_files",
+    "create_app": ".flask:create_app",
+    "VACRoutes": ".flask:VACRoutes",
+    "register_qna_fastapi_routes": ".fastapi:register_qna_fastapi_routes",
+    "create_fastapi_app": ".fastapi:create_fastapi_app",
+    "config_to_swagger": ".swagger:config_to_swagger",
+})
@@ -13,11 +13,13 @@
 #   limitations under the License.
 from ..custom_logging import log
 from ..utils import ConfigManager
-from ..auth import get_header
+from ..auth import get_header, get_header_async
 import requests
 from .langserve import prepare_request_data
 import traceback
-from .route import route_endpoint
+from .route import lookup_endpoints
+from ..utils.http_sessions import get_http_session, get_aiohttp_session
+from ..langfuse.client import get_langfuse_client
 import os
 
 try:
@@ -66,7 +68,7 @@ def prep_request_payload(user_input, chat_history, vector_name, stream, **kwargs
         log.info(f"Overriding endpoint with {override_endpoint}")
 
     # {'stream': '', 'invoke': ''}
-    post_endpoints = route_endpoint(override_endpoint=override_endpoint, config=config)
+    post_endpoints = lookup_endpoints(override_endpoint=override_endpoint, config=config)
 
     if stream:
         qna_endpoint = post_endpoints["stream"]
@@ -74,7 +76,7 @@ def prep_request_payload(user_input, chat_history, vector_name, stream, **kwargs
         qna_endpoint = post_endpoints["invoke"]
 
     if agent == "langserve" or agent_type == "langserve":
-        get_endpoints = route_endpoint(override_endpoint=override_endpoint, method = 'get', config=config)
+        get_endpoints = lookup_endpoints(override_endpoint=override_endpoint, method = 'get', config=config)
         qna_data = prepare_request_data(user_input, get_endpoints["input_schema"], vector_name, **kwargs)
     else:
         # Base qna_data dictionary
@@ -94,8 +96,7 @@ def prep_request_payload(user_input, chat_history, vector_name, stream, **kwargs
 
 def add_langfuse_trace(qna_endpoint):
     try:
-        from langfuse import Langfuse
-        langfuse = Langfuse()
+        langfuse = get_langfuse_client()
     except Exception as err:
         log.error(err)
         return None
@@ -133,14 +134,18 @@ def send_to_qa(user_input, vector_name, chat_history, stream=False, **kwargs):
 
     log.info(f"Send_to_qa to {qna_endpoint} this data: {qna_data} with this header: {header}")
     try:
-        qna_response = requests.post(qna_endpoint, json=qna_data, stream=stream, headers=header)
+        qna_response = get_http_session().post(qna_endpoint, json=qna_data, stream=stream, headers=header)
         qna_response.raise_for_status()
 
         if stream:
             # If streaming, return a generator that yields response content chunks
             def content_generator():
-                for chunk in qna_response.iter_content(chunk_size=8192):
-                    yield chunk
+                try:
+                    for chunk in qna_response.iter_content(chunk_size=8192):
+                        yield chunk
+                finally:
+                    # hand the connection back to the pool even if the consumer stops early
+                    qna_response.close()
             return content_generator()
         else:
             # Otherwise, return the JSON response directly
@@ -193,25 +198,25 @@ async def send_to_qa_async(user_input, vector_name, chat_history, stream=False,
         )
     
     qna_endpoint, qna_data = prep_request_payload(user_input, chat_history, vector_name, stream, **kwargs)
-    header = get_header(vector_name)
+    header = await get_header_async(vector_name)
     header = add_header_ids(header, **kwargs)
 
     log.info(f"send_to_qa_async to {qna_endpoint} this data: {qna_data} with this header: {header}")
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(qna_endpoint, json=qna_data, headers=header) as resp:
-                resp.raise_for_status()
+        session = get_aiohttp_session()
+        async with session.post(qna_endpoint, json=qna_data, headers=header) as resp:
+            resp.raise_for_status()
 
-                if stream:
-                    # Stream the response
-                    async for chunk in resp.content.iter_any():
-                        yield chunk
-                else:
-                    # Return the complete response
-                    qna_response = await resp.json()
-                    log.info(f"Got back QA response: {qna_response}")
-                    yield qna_response
+            if stream:
+                # Stream the response
+                async for chunk in resp.content.iter_any():
+                    yield chunk
+            else:
+                # Return the complete response
+                qna_response = await resp.json()
+                log.info(f"Got back QA response: {qna_response}")
+                yield qna_response
     except aiohttp.ClientResponseError as e:
         log.error(f"HTTP error occurred: {e}")
         error_message = f"There was an error processing your request: {str(e)}"
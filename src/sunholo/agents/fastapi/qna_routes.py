@@ -14,7 +14,7 @@ from typing import Optional
 from ...agents import extract_chat_history, handle_special_commands
 from ...qna.parsers import parse_output
 from ...streaming import start_streaming_chat_async
-from ...archive import archive_qa
+from ...archive import archive_qa_async
 from ...custom_logging import log
 
 class VACRequest(BaseModel):
@@ -44,7 +44,7 @@ def create_stream_qa_endpoint(stream_interpreter):
                                                             wait_time=request.stream_wait_time,
                                                             timeout=request.stream_timeout):
                 if isinstance(chunk, dict) and 'answer' in chunk:
-                    archive_qa(chunk, vector_name)
+                    await archive_qa_async(chunk, vector_name)
                     yield f"###JSON_START###{json.dumps(chunk)}###JSON_END###"
                     break
                 else:
@@ -71,7 +71,7 @@ def create_process_qna_endpoint(qna_interpreter):
                 bot_output = qna_interpreter(user_input, vector_name, chat_history=paired_messages)
 
             bot_output = parse_output(bot_output)
-            archive_qa(bot_output, vector_name)
+            await archive_qa_async(bot_output, vector_name)
         except Exception as err:
             bot_output = {'answer': f'QNA_ERROR: An error occurred while processing /qna/{vector_name}: {str(err)} traceback: {traceback.format_exc()}'}
         
@@ -20,9 +20,11 @@ import datetime
 import uuid
 import inspect
 import asyncio
+import threading
 from typing import Dict, List, Optional, Callable, Any, TYPE_CHECKING
 from functools import partial
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 
 if TYPE_CHECKING:
     from fastapi import FastAPI, Request, Response, HTTPException
@@ -46,11 +48,14 @@ except ImportError:
 
 from ..chat_history import extract_chat_history_with_cache, extract_chat_history_async_cached
 from ...qna.parsers import parse_output
-from ...streaming import start_streaming_chat, start_streaming_chat_async
-from ...archive import archive_qa
+from ...streaming import start_streaming_chat, start_streaming_chat_async, stream_sync_generator_async
+from ...archive import archive_qa_async, flush_archive
+from ...archive.archive import ARCHIVE_FLUSH_TIMEOUT
 from ...custom_logging import log
 from ...utils import ConfigManager
 from ...utils.version import sunholo_version
+from ...langfuse.prompts import prewarm_prompts
+from ...utils.http_sessions import close_aiohttp_session, close_http_session
 
 try:
     from ...mcp.mcp_manager import MCPClientManager
@@ -79,6 +84,52 @@ class VACRequest(BaseModel):
     eval_percent: Optional[float] = 0.01
 
 
+class OpenAIChunkEnvelope:
+    """
+    Serialises the `chat.completion.chunk` events of one OpenAI-compatible stream.
+
+    The JSON around the delta content is the same for every chunk of a response, so it is
+    encoded once and each delta only needs its content string encoding.
+    """
+
+    _marker = "\x00delta\x00"
+
+    def __init__(self, response_id: str, model: str, system_fingerprint: str = None):
+        created = int(datetime.datetime.now().timestamp())
+        self.content = self._envelope({
+            "id": response_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": self._marker}, "finish_reason": None}]
+        })
+        self.answer = self._envelope({
+            "id": response_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "system_fingerprint": system_fingerprint,
+            "choices": [{"index": 0, "delta": {"content": self._marker}, "logprobs": None, "finish_reason": None}]
+        })
+        self.stop = "data: " + json.dumps({
+            "id": response_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]
+        }) + "\n\n"
+
+    @classmethod
+    def _envelope(cls, chunk: dict):
+        prefix, suffix = json.dumps(chunk).split(json.dumps(cls._marker))
+        return "data: " + prefix, suffix + "\n\n"
+
+    def delta(self, content, final: bool = False) -> str:
+        """Returns the SSE event for a content delta, with the final answer's extra fields if final."""
+        prefix, suffix = self.answer if final else self.content
+        return prefix + json.dumps(content) + suffix
+
+
 class VACRoutesFastAPI:
     """
     FastAPI implementation of VAC routes with streaming support and extensible MCP integration.
@@ -354,7 +405,9 @@ class VACRoutesFastAPI:
         mcp_servers: Optional[List[Dict[str, Any]]] = None,
         add_langfuse_eval: bool = True,
         enable_a2a_agent: bool = False,
-        a2a_vac_names: Optional[List[str]] = None
+        a2a_vac_names: Optional[List[str]] = None,
+        stream_queue_size: int = 32,
+        interpreter_workers: int = 16
     ):
         """
         Initialize FastAPI VAC routes with comprehensive AI and MCP integration.
@@ -372,6 +425,12 @@ class VACRoutesFastAPI:
             add_langfuse_eval: Whether to enable Langfuse evaluation and tracing
             enable_a2a_agent: Whether to enable A2A (Agent-to-Agent) protocol endpoints
             a2a_vac_names: List of VAC names available for A2A agent interactions
+            stream_queue_size: Maximum chunks buffered between a sync stream_interpreter's
+                             worker thread and the streaming response before the worker waits
+            interpreter_workers: Size of the thread pool that runs sync interpreters, kept apart from
+                               the event loop's default executor so busy VACs can't starve it.
+                               Requests beyond this wait for a free worker. The pool is started on
+                               first use and shut down with the app's lifespan.
         
         ## Stream Interpreter Function
         
@@ -445,6 +504,10 @@ class VACRoutesFastAPI:
         # Detect if interpreters are async
         self.stream_is_async = inspect.iscoroutinefunction(stream_interpreter)
         self.vac_is_async = inspect.iscoroutinefunction(self.vac_interpreter)
+        self.stream_queue_size = stream_queue_size
+        self.interpreter_workers = interpreter_workers
+        self._interpreter_executor = None
+        self._interpreter_executor_lock = threading.Lock()
         
         # MCP client initialization
         self.mcp_servers = mcp_servers or []
@@ -473,6 +536,8 @@ class VACRoutesFastAPI:
         
         self.additional_routes = additional_routes or []
         self.add_langfuse_eval = add_langfuse_eval
+        # fetch the prompts listed in LANGFUSE_PREWARM_PROMPTS before the first request needs them
+        prewarm_prompts()
         
         self.register_routes()
     
@@ -623,7 +688,16 @@ class VACRoutesFastAPI:
         """
         if self.vac_mcp_server:
             mcp_app = self.vac_mcp_server.get_http_app()
-            return mcp_app.lifespan
+            
+            @asynccontextmanager
+            async def lifespan(app: FastAPI):
+                try:
+                    async with mcp_app.lifespan(app) as lifespan_state:
+                        yield lifespan_state
+                finally:
+                    self._shutdown_interpreter_executor()
+            
+            return lifespan
         return None
     
     async def vac_interpreter_default(self, question: str, vector_name: str, chat_history=None, **kwargs):
@@ -649,10 +723,8 @@ class VACRoutesFastAPI:
                 **kwargs
             )
         else:
-            # Run sync function in executor
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
+            # Run sync function in the interpreter pool
+            result = await self._run_sync_interpreter(
                 self.stream_interpreter,
                 question,
                 vector_name,
@@ -662,6 +734,11 @@ class VACRoutesFastAPI:
             )
         
         return result
+
+    async def _run_sync_interpreter(self, func: Callable, *args, **kwargs):
+        """Runs a sync interpreter in the interpreter thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.interpreter_executor, partial(func, *args, **kwargs))
     
     def register_routes(self):
         """Register all VAC routes with the FastAPI application."""
@@ -752,33 +829,54 @@ class VACRoutesFastAPI:
         self._setup_lifespan()
     
     def _setup_lifespan(self):
-        """Set up lifespan context manager for app initialization."""
-        # Only set lifespan if we have MCP servers to initialize
-        if not (self.mcp_servers and self.mcp_client_manager):
-            return
-        
+        """Set up lifespan context manager for app initialization and shutdown."""
         # Store the existing lifespan if any
         existing_lifespan = getattr(self.app, 'router', self.app).lifespan_context
         
         @asynccontextmanager
         async def lifespan(app: FastAPI):
             # Startup
-            if not self._mcp_initialized:
+            if self.mcp_servers and self.mcp_client_manager and not self._mcp_initialized:
                 await self._initialize_mcp_servers()
                 self._mcp_initialized = True
             
-            # Call existing lifespan startup if any
-            if existing_lifespan:
-                async with existing_lifespan(app) as lifespan_state:
-                    yield lifespan_state
-            else:
-                yield
-            
-            # Shutdown (no cleanup needed for now)
+            try:
+                # Call existing lifespan startup if any
+                if existing_lifespan:
+                    async with existing_lifespan(app) as lifespan_state:
+                        yield lifespan_state
+                else:
+                    yield
+            finally:
+                # Shutdown
+                await self._close_resources()
         
         # Set the new lifespan
         self.app.router.lifespan_context = lifespan
     
+    @property
+    def interpreter_executor(self) -> ThreadPoolExecutor:
+        """The thread pool that runs sync interpreters, started on first use."""
+        if self._interpreter_executor is None:
+            with self._interpreter_executor_lock:
+                if self._interpreter_executor is None:
+                    self._interpreter_executor = ThreadPoolExecutor(max_workers=self.interpreter_workers,
+                                                                    thread_name_prefix="vac-interpreter")
+        return self._interpreter_executor
+    
+    def _shutdown_interpreter_executor(self):
+        with self._interpreter_executor_lock:
+            executor, self._interpreter_executor = self._interpreter_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    async def _close_resources(self):
+        """Publishes queued archive messages, shuts down the interpreter pool and closes the pooled HTTP sessions."""
+        await asyncio.to_thread(flush_archive, ARCHIVE_FLUSH_TIMEOUT)
+        self._shutdown_interpreter_executor()
+        await close_aiohttp_session()
+        close_http_session()
+    
     async def home(self):
         """Home endpoint."""
         return JSONResponse(content="OK")
@@ -814,40 +912,15 @@ class VACRoutesFastAPI:
                         **all_input["kwargs"]
                     ):
                         if isinstance(chunk, dict) and 'answer' in chunk:
-                            archive_qa(chunk, vector_name)  # This is a sync function, not async
+                            await archive_qa_async(chunk, vector_name)
                             yield json.dumps(chunk)
                         else:
                             yield chunk
                 else:
-                    # Run sync streaming in executor
-                    loop = asyncio.get_event_loop()
-                    
-                    # Create a queue for passing chunks from sync to async
-                    queue = asyncio.Queue()
-                    
-                    def run_sync_streaming():
-                        for chunk in start_streaming_chat(
-                            question=all_input["user_input"],
-                            vector_name=vector_name,
-                            qna_func=self.stream_interpreter,
-                            chat_history=all_input["chat_history"],
-                            wait_time=all_input["stream_wait_time"],
-                            timeout=all_input["stream_timeout"],
-                            **all_input["kwargs"]
-                        ):
-                            asyncio.run_coroutine_threadsafe(queue.put(chunk), loop)
-                        asyncio.run_coroutine_threadsafe(queue.put(None), loop)
-                    
-                    # Run sync function in thread
-                    await loop.run_in_executor(None, run_sync_streaming)
-                    
-                    # Yield from queue
-                    while True:
-                        chunk = await queue.get()
-                        if chunk is None:
-                            break
+                    # Relay each chunk from the sync interpreter thread as soon as it is produced
+                    async for chunk in self._stream_sync_chat(vector_name, all_input):
                         if isinstance(chunk, dict) and 'answer' in chunk:
-                            archive_qa(chunk, vector_name)  # This is a sync function, not async
+                            await archive_qa_async(chunk, vector_name)
                             yield json.dumps(chunk)
                         else:
                             yield chunk
@@ -895,7 +968,7 @@ class VACRoutesFastAPI:
                         if isinstance(chunk, dict) and 'answer' in chunk:
                             # This is the final response with answer and sources
                             log.info(f"Final response received: {list(chunk.keys())}")
-                            archive_qa(chunk, vector_name)  # This is a sync function, not async
+                            await archive_qa_async(chunk, vector_name)
                             # Send the complete response with sources
                             final_data = f"data: {json.dumps(chunk)}\n\n"
                             log.info(f"Yielding final response: {final_data[:100]}...")
@@ -911,32 +984,11 @@ class VACRoutesFastAPI:
                             yield f"data: {json.dumps({'chunk': chunk})}\n\n"
                     log.info("SSE generator completed")
                 else:
-                    # Handle sync interpreter - similar to above
-                    loop = asyncio.get_event_loop()
-                    queue = asyncio.Queue()
-                    
-                    def run_sync_streaming():
-                        for chunk in start_streaming_chat(
-                            question=all_input["user_input"],
-                            vector_name=vector_name,
-                            qna_func=self.stream_interpreter,
-                            chat_history=all_input["chat_history"],
-                            wait_time=all_input["stream_wait_time"],
-                            timeout=all_input["stream_timeout"],
-                            **all_input["kwargs"]
-                        ):
-                            asyncio.run_coroutine_threadsafe(queue.put(chunk), loop)
-                        asyncio.run_coroutine_threadsafe(queue.put(None), loop)
-                    
-                    await loop.run_in_executor(None, run_sync_streaming)
-                    
-                    while True:
-                        chunk = await queue.get()
-                        if chunk is None:
-                            break
+                    # Handle sync interpreter - relayed chunk by chunk from a worker thread
+                    async for chunk in self._stream_sync_chat(vector_name, all_input):
                         if isinstance(chunk, dict) and 'answer' in chunk:
                             # This is the final response with answer and sources
-                            archive_qa(chunk, vector_name)  # This is a sync function, not async
+                            await archive_qa_async(chunk, vector_name)
                             # Send the complete response with sources
                             yield f"data: {json.dumps(chunk)}\n\n"
                             # Then send the completion signal
@@ -961,6 +1013,29 @@ class VACRoutesFastAPI:
             }
         )
     
+    def _stream_sync_chat(self, vector_name: str, all_input: dict):
+        """
+        Stream a sync stream_interpreter via start_streaming_chat in a worker thread.
+
+        Chunks are relayed to the event loop as soon as they are produced, with a bounded
+        queue for backpressure. The worker runs in the interpreter pool and stops when the
+        client disconnects.
+        """
+        return stream_sync_generator_async(
+            partial(
+                start_streaming_chat,
+                question=all_input["user_input"],
+                vector_name=vector_name,
+                qna_func=self.stream_interpreter,
+                chat_history=all_input["chat_history"],
+                wait_time=all_input["stream_wait_time"],
+                timeout=all_input["stream_timeout"],
+                **all_input["kwargs"]
+            ),
+            max_queue_size=self.stream_queue_size,
+            executor=self.interpreter_executor
+        )
+    
     async def handle_process_vac(self, vector_name: str, request: Request):
         """Handle non-streaming VAC requests."""
         data = await request.json()
@@ -978,10 +1053,8 @@ class VACRoutesFastAPI:
                     **all_input["kwargs"]
                 )
             else:
-                # Run sync function in executor
-                loop = asyncio.get_event_loop()
-                bot_output = await loop.run_in_executor(
-                    None,
+                # Run sync function in the interpreter pool
+                bot_output = await self._run_sync_interpreter(
                     self.vac_interpreter,
                     all_input["user_input"],
                     vector_name,
@@ -990,7 +1063,7 @@ class VACRoutesFastAPI:
                 )
             
             bot_output = parse_output(bot_output)
-            archive_qa(bot_output, vector_name)  # This is a sync function, not async
+            await archive_qa_async(bot_output, vector_name)
             log.info(f'==LLM Q:{all_input["user_input"]} - A:{bot_output}')
             
         except Exception as err:
@@ -1061,9 +1134,11 @@ class VACRoutesFastAPI:
         response_id = str(uuid.uuid4())
         
         if stream:
+            envelope = OpenAIChunkEnvelope(response_id, vector_name, sunholo_version())
+
             async def generate_openai_stream():
                 if self.stream_is_async:
-                    async for chunk in start_streaming_chat_async(
+                    chunks = start_streaming_chat_async(
                         question=user_message,
                         vector_name=vector_name,
                         qna_func_async=self.stream_interpreter,
@@ -1071,50 +1146,30 @@ class VACRoutesFastAPI:
                         wait_time=data.get("stream_wait_time", 1),
                         timeout=data.get("stream_timeout", 60),
                         **data
-                    ):
-                        if isinstance(chunk, dict) and 'answer' in chunk:
-                            openai_chunk = {
-                                "id": response_id,
-                                "object": "chat.completion.chunk",
-                                "created": int(datetime.datetime.now().timestamp()),
-                                "model": vector_name,
-                                "system_fingerprint": sunholo_version(),
-                                "choices": [{
-                                    "index": 0,
-                                    "delta": {"content": chunk['answer']},
-                                    "logprobs": None,
-                                    "finish_reason": None
-                                }]
-                            }
-                            yield f"data: {json.dumps(openai_chunk)}\n\n"
-                        else:
-                            # Stream partial content
-                            openai_chunk = {
-                                "id": response_id,
-                                "object": "chat.completion.chunk",
-                                "created": int(datetime.datetime.now().timestamp()),
-                                "model": vector_name,
-                                "choices": [{
-                                    "index": 0,
-                                    "delta": {"content": chunk},
-                                    "finish_reason": None
-                                }]
-                            }
-                            yield f"data: {json.dumps(openai_chunk)}\n\n"
+                    )
+                else:
+                    # Relay each chunk from the sync interpreter thread as soon as it is produced
+                    chunks = self._stream_sync_chat(vector_name, {
+                        "user_input": user_message,
+                        "chat_history": chat_history or [],
+                        "stream_wait_time": data.get("stream_wait_time", 1),
+                        "stream_timeout": data.get("stream_timeout", 60),
+                        "kwargs": data
+                    })
+
+                streamed = False
+                async for chunk in chunks:
+                    if isinstance(chunk, dict) and 'answer' in chunk:
+                        # the final answer repeats what was streamed, so only send it if nothing was
+                        if not streamed:
+                            yield envelope.delta(chunk['answer'], final=True)
+                    elif chunk:
+                        # Stream partial content
+                        streamed = True
+                        yield envelope.delta(chunk)
                 
                 # Send final chunk
-                final_chunk = {
-                    "id": response_id,
-                    "object": "chat.completion.chunk",
-                    "created": int(datetime.datetime.now().timestamp()),
-                    "model": vector_name,
-                    "choices": [{
-                        "index": 0,
-                        "delta": {},
-                        "finish_reason": "stop"
-                    }]
-                }
-                yield f"data: {json.dumps(final_chunk)}\n\n"
+                yield envelope.stop
                 yield "data: [DONE]\n\n"
             
             return StreamingResponse(
@@ -1132,9 +1187,7 @@ class VACRoutesFastAPI:
                         **data
                     )
                 else:
-                    loop = asyncio.get_event_loop()
-                    bot_output = await loop.run_in_executor(
-                        None,
+                    bot_output = await self._run_sync_interpreter(
                         self.vac_interpreter,
                         user_message,
                         vector_name,
@@ -11,11 +11,13 @@ from typing import Dict, List, Optional, Callable, Any
 
 from ..chat_history import extract_chat_history_with_cache, extract_chat_history_async_cached
 from ...qna.parsers import parse_output
-from ...streaming import start_streaming_chat, start_streaming_chat_async
-from ...archive import archive_qa
+from ...streaming import start_streaming_chat, start_streaming_chat_async, get_background_loop
+from ...archive import queue_archive_qa, archive_qa_async
 from ...custom_logging import log
 from ...utils import ConfigManager
 from ...utils.version import sunholo_version
+from ...langfuse.client import get_langfuse_client
+from ...langfuse.prompts import prewarm_prompts
 import os
 from ...gcs.add_file import add_file_to_gcs, handle_base64_image
 from ..swagger import validate_api_key
@@ -98,9 +100,12 @@ if __name__ == "__main__":
         # MCP client initialization
         self.mcp_servers = mcp_servers or []
         self.mcp_client_manager = MCPClientManager()    
+        # Async work from the sync Flask views runs on one long-lived loop per process,
+        # so MCP sessions and connection pools created on it are reused across requests
+        self.background_loop = get_background_loop()
         # Initialize MCP connections
         if self.mcp_servers and self.mcp_client_manager:
-            asyncio.create_task(self._initialize_mcp_servers())
+            self.background_loop.submit(self._initialize_mcp_servers())
 
         # MCP server initialization
         self.enable_mcp_server = enable_mcp_server
@@ -123,6 +128,8 @@ if __name__ == "__main__":
         self.additional_routes = additional_routes if additional_routes is not None else []
         self.async_stream = async_stream
         self.add_langfuse_eval = add_langfuse_eval
+        # fetch the prompts listed in LANGFUSE_PREWARM_PROMPTS before the first request needs them
+        prewarm_prompts()
         self.register_routes()
         
 
@@ -329,52 +336,32 @@ if __name__ == "__main__":
         def generate_response_content():
             try:
                 if is_async:
-                    from queue import Queue, Empty
-                    result_queue = Queue()
-                    import threading
-
-                    def run_async():
-                        async def process_async():
-                            try:
-                                async_gen = start_streaming_chat_async(
-                                    question=all_input["user_input"],
-                                    vector_name=vector_name,
-                                    qna_func_async=observed_stream_interpreter,
-                                    chat_history=all_input["chat_history"],
-                                    wait_time=all_input["stream_wait_time"],
-                                    timeout=all_input["stream_timeout"],
-                                    trace_id=trace.id if trace else None,
-                                    **all_input["kwargs"]
-                                )
-                                log.info(f"{async_gen=}")
-                                async for chunk in async_gen:
-                                    if isinstance(chunk, dict) and 'answer' in chunk:
-                                        if trace:
-                                            chunk["trace_id"] = trace.id
-                                            chunk["trace_url"] = trace.get_trace_url()
-                                            span.end(output=json.dumps(chunk))
-                                            trace.update(output=json.dumps(chunk))
-                                        archive_qa(chunk, vector_name)
-                                        result_queue.put(json.dumps(chunk))
-                                    else:
-                                        result_queue.put(chunk)
-                            except Exception as e:
-                                result_queue.put(f"Streaming Error: {str(e)} {traceback.format_exc()}")
-                            finally:
-                                result_queue.put(None)  # Sentinel
-                        asyncio.run(process_async())
-
-                    thread = threading.Thread(target=run_async)
-                    thread.start()
-
-                    # Read from the queue and yield results
-                    while True:
-                        chunk = result_queue.get()
-                        if chunk is None:
-                            break
-                        yield chunk
+                    async def process_async():
+                        async_gen = start_streaming_chat_async(
+                            question=all_input["user_input"],
+                            vector_name=vector_name,
+                            qna_func_async=observed_stream_interpreter,
+                            chat_history=all_input["chat_history"],
+                            wait_time=all_input["stream_wait_time"],
+                            timeout=all_input["stream_timeout"],
+                            trace_id=trace.id if trace else None,
+                            **all_input["kwargs"]
+                        )
+                        log.info(f"{async_gen=}")
+                        async for chunk in async_gen:
+                            if isinstance(chunk, dict) and 'answer' in chunk:
+                                if trace:
+                                    chunk["trace_id"] = trace.id
+                                    chunk["trace_url"] = trace.get_trace_url()
+                                    span.end(output=json.dumps(chunk))
+                                    trace.update(output=json.dumps(chunk))
+                                queue_archive_qa(chunk, vector_name)
+                                yield json.dumps(chunk)
+                            else:
+                                yield chunk
 
-                    thread.join()
+                    # Stream from the shared background loop, rather than a new loop and thread per request
+                    yield from self.background_loop.iterate(process_async())
                 else:
                     log.info("sync streaming response")
                     for chunk in start_streaming_chat(
@@ -391,7 +378,7 @@ if __name__ == "__main__":
                             if trace:
                                 chunk["trace_id"] = trace.id
                                 chunk["trace_url"] = trace.get_trace_url()
-                            archive_qa(chunk, vector_name)
+                            queue_archive_qa(chunk, vector_name)
                             if trace:
                                 span.end(output=json.dumps(chunk))
                                 trace.update(output=json.dumps(chunk))
@@ -444,7 +431,7 @@ if __name__ == "__main__":
                 log.info(f"{async_gen=}")
                 async for chunk in async_gen:
                     if isinstance(chunk, dict) and 'answer' in chunk:
-                        await archive_qa(chunk, vector_name)
+                        await archive_qa_async(chunk, vector_name)
                         yield json.dumps(chunk)
                     else:
                         yield chunk
@@ -527,7 +514,7 @@ if __name__ == "__main__":
             if trace:
                 bot_output["trace_id"] = trace.id
                 bot_output["trace_url"] = trace.get_trace_url()
-            archive_qa(bot_output, vector_name)
+            queue_archive_qa(bot_output, vector_name)
             log.info(f'==LLM Q:{all_input["user_input"]} - A:{bot_output}')
 
 
@@ -705,8 +692,7 @@ if __name__ == "__main__":
 
     def create_langfuse_trace(self, request, vector_name, trace_id):
         try:
-            from langfuse import Langfuse
-            langfuse = Langfuse()
+            langfuse = get_langfuse_client()
         except ImportError as err:
             print(f"No langfuse installed for agents.flask.register_qna_routes, install via `pip install sunholo[http]` - {str(err)}")
             
@@ -906,14 +892,8 @@ if __name__ == "__main__":
                 for tool in tools
             ]
         
-        # Run async in sync context
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            tools = loop.run_until_complete(get_tools())
-            return jsonify({"tools": tools})
-        finally:
-            loop.close()
+        tools = self.background_loop.run(get_tools())
+        return jsonify({"tools": tools})
     
     def handle_mcp_call_tool(self):
         """Call an MCP tool."""
@@ -944,15 +924,10 @@ if __name__ == "__main__":
             except Exception as e:
                 return {"error": str(e)}
         
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            result = loop.run_until_complete(call_tool())
-            if "error" in result:
-                return jsonify(result), 500
-            return jsonify(result)
-        finally:
-            loop.close()
+        result = self.background_loop.run(call_tool())
+        if "error" in result:
+            return jsonify(result), 500
+        return jsonify(result)
     
     def handle_mcp_list_resources(self):
         """List available MCP resources."""
@@ -971,13 +946,8 @@ if __name__ == "__main__":
                 for resource in resources
             ]
         
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            resources = loop.run_until_complete(get_resources())
-            return jsonify({"resources": resources})
-        finally:
-            loop.close()
+        resources = self.background_loop.run(get_resources())
+        return jsonify({"resources": resources})
     
     def handle_mcp_read_resource(self):
         """Read an MCP resource."""
@@ -1000,15 +970,10 @@ if __name__ == "__main__":
             except Exception as e:
                 return {"error": str(e)}
         
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            result = loop.run_until_complete(read_resource())
-            if "error" in result:
-                return jsonify(result), 500
-            return jsonify(result)
-        finally:
-            loop.close()
+        result = self.background_loop.run(read_resource())
+        if "error" in result:
+            return jsonify(result), 500
+        return jsonify(result)
     
     def handle_mcp_server(self):
         """Handle MCP server requests using HTTP transport."""
@@ -1138,10 +1103,8 @@ if __name__ == "__main__":
                         }
                 
                 # Run the async handler
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
                 try:
-                    response_data = loop.run_until_complete(process_request())
+                    response_data = self.background_loop.run(process_request())
                     return jsonify(response_data)
 
                 except Exception as e:
@@ -1154,8 +1117,6 @@ if __name__ == "__main__":
                         },
                         "id": data.get("id") if isinstance(data, dict) else None
                     }), 500
-                finally:
-                    loop.close()
                         
             except Exception as e:
                 log.error(f"MCP server error: {str(e)}")
@@ -1223,13 +1184,8 @@ if __name__ == "__main__":
                 }), 400
             
             # Run async handler
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                response = loop.run_until_complete(agent.handle_task_send(data))
-                return jsonify(response)
-            finally:
-                loop.close()
+            response = self.background_loop.run(agent.handle_task_send(data))
+            return jsonify(response)
                 
         except Exception as e:
             log.error(f"A2A task send error: {e}")
@@ -1261,21 +1217,7 @@ if __name__ == "__main__":
                 async for chunk in agent.handle_task_send_subscribe(data):
                     yield chunk
             
-            def sync_generator():
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    async_gen = sse_generator()
-                    while True:
-                        try:
-                            chunk = loop.run_until_complete(async_gen.__anext__())
-                            yield chunk
-                        except StopAsyncIteration:
-                            break
-                finally:
-                    loop.close()
-            
-            return Response(sync_generator(), content_type='text/event-stream')
+            return Response(self.background_loop.iterate(sse_generator()), content_type='text/event-stream')
             
         except Exception as e:
             log.error(f"A2A task send subscribe error: {e}")
@@ -1303,13 +1245,8 @@ if __name__ == "__main__":
                 }), 400
             
             # Run async handler
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                response = loop.run_until_complete(agent.handle_task_get(data))
-                return jsonify(response)
-            finally:
-                loop.close()
+            response = self.background_loop.run(agent.handle_task_get(data))
+            return jsonify(response)
                 
         except Exception as e:
             log.error(f"A2A task get error: {e}")
@@ -1341,13 +1278,8 @@ if __name__ == "__main__":
                 }), 400
             
             # Run async handler
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                response = loop.run_until_complete(agent.handle_task_cancel(data))
-                return jsonify(response)
-            finally:
-                loop.close()
+            response = self.background_loop.run(agent.handle_task_cancel(data))
+            return jsonify(response)
                 
         except Exception as e:
             log.error(f"A2A task cancel error: {e}")
@@ -1379,13 +1311,8 @@ if __name__ == "__main__":
                 }), 400
             
             # Run async handler
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                response = loop.run_until_complete(agent.handle_push_notification_set(data))
-                return jsonify(response)
-            finally:
-                loop.close()
+            response = self.background_loop.run(agent.handle_push_notification_set(data))
+            return jsonify(response)
                 
         except Exception as e:
             log.error(f"A2A push notification error: {e}")
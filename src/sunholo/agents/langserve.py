@@ -1,6 +1,7 @@
 import requests
 from ..custom_logging import log
 from ..auth import get_header
+from ..utils.http_sessions import get_http_session
 
 # Global cache for storing input schemas
 langserve_input_schema_cache = {}
@@ -43,7 +44,7 @@ def fetch_input_schema(endpoint, vector_name):
     header = get_header(vector_name)
 
     try:
-        response = requests.get(endpoint, headers = header)
+        response = get_http_session().get(endpoint, headers = header)
         response.raise_for_status()
         schema = response.json()
         log.info(f"Fetched schema: {schema}")
@@ -11,11 +11,67 @@
 #   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
+import os
+import threading
+
 from ..custom_logging import log
-from ..utils import load_config, ConfigManager
+from ..utils import ConfigManager
+from ..utils.config_store import config_store
+
+# Resolved VAC urls and endpoint dicts, valid for the config generation they were built in
+_routes = {}
+_routes_generation = None
+_routes_lock = threading.Lock()
+# cloud_run_urls.json files that routes were read from, re-checked for changes on lookup
+_cloud_run_urls_files = set()
+
+
+def clear_routing_table():
+    """Forgets all resolved routes so they are rebuilt on next lookup."""
+    global _routes_generation
+    with _routes_lock:
+        _routes.clear()
+        _routes_generation = None
+
+
+def _cached_route(key, build):
+    """Returns the route for key, building it if missing or if configs changed since it was built."""
+    global _routes_generation
+    generation = config_store.generation
+    with _routes_lock:
+        if _routes_generation != generation:
+            _routes.clear()
+            _routes_generation = generation
+        route = _routes.get(key)
+    if route is not None:
+        return route
+
+    route = build()
+    with _routes_lock:
+        # don't cache a route built from configs that changed while building it
+        if _routes_generation == generation == config_store.generation:
+            _routes[key] = route
+    return route
+
+
+def _config_for(vector_name=None, config=None):
+    if not config:
+        config = ConfigManager(vector_name)
+    # pick up changed configs (checked at most every config_store.check_interval) before using the table
+    config._check_and_reload_configs()
+    for path in list(_cloud_run_urls_files):
+        try:
+            config_store.load_file(path)
+        except FileNotFoundError:
+            _cloud_run_urls_files.discard(path)
+    return config
+
 
 def read_cloud_run_url(agent, cloud_run_urls_file='config/cloud_run_urls.json'):
-    agent_route, _ = load_config(cloud_run_urls_file)
+    config_folder = os.getenv("VAC_CONFIG_FOLDER") if os.getenv("VAC_CONFIG_FOLDER") else os.getcwd()
+    path = os.path.join(config_folder, cloud_run_urls_file)
+    agent_route = config_store.load_file(path)
+    _cloud_run_urls_files.add(path)
     log.info(f'agent_route: {agent_route}')
 
     try:
@@ -27,63 +83,83 @@ def read_cloud_run_url(agent, cloud_run_urls_file='config/cloud_run_urls.json'):
 
     return agent_url
 
-def route_vac(vector_name: str=None, config=None) -> str :
+def lookup_vac_url(vector_name: str=None, config=None) -> str:
     """
-    Considers what VAC this vector_name belongs to
+    Returns the URL stem of the VAC serving `vector_name`, from `agent_url` or `cloud_run_urls.json`.
+
+    Resolved URLs are memoized until a config file or `cloud_run_urls.json` changes.
     """
     if not vector_name and not config:
         raise ValueError("Must provide config or vector_name argument")
-    
-    if not config:
-        config = ConfigManager(vector_name)
 
-    agent_url = config.vacConfig('agent_url')
-    if agent_url:
-        log.info('agent_url found in llm_config.yaml')
-        return agent_url
+    config = _config_for(vector_name, config)
 
-    agent = config.vacConfig('agent')
+    def build():
+        agent_url = config.vacConfig('agent_url')
+        if agent_url:
+            log.info('agent_url found in llm_config.yaml')
+            return agent_url
 
-    return read_cloud_run_url(agent)
+        agent = config.vacConfig('agent')
 
-def route_endpoint(vector_name=None, method = 'post', override_endpoint=None, config=None):
+        return read_cloud_run_url(agent)
+
+    return _cached_route(("url", config.vector_name), build)
+
+def lookup_endpoints(vector_name=None, method='post', override_endpoint=None, config=None) -> dict:
+    """
+    Returns the endpoint URLs for a VAC, e.g. `{'stream': ..., 'invoke': ...}` for method 'post'.
 
+    Endpoints are built from the VAC's agentConfig templates once per
+    (vector_name, method, override_endpoint) and memoized until configs change.
+    The returned dict is shared, so copy it before modifying.
+    """
     if vector_name is None and config is None:
         raise ValueError('vector_name and config can not both be None')
-    
-    if config:
-        vector_name = config.vector_name
 
-    if not config:
-        config = ConfigManager(vector_name)
+    config = _config_for(vector_name, config)
+    vector_name = config.vector_name
 
-    agent_type = config.vacConfig('agent_type')
-    if not agent_type:
-        agent_type = config.vacConfig('agent')
+    def build():
+        agent_type = config.vacConfig('agent_type')
+        if not agent_type:
+            agent_type = config.vacConfig('agent')
 
-    stem = route_vac(config=config) if not override_endpoint else override_endpoint
-    
-    agents_config = config.agentConfig(agent_type)
-    
-    log.debug(f"agents_config: {agents_config}")
-    if method not in agents_config:
-        raise ValueError(f"Invalid method '{method}' for agent configuration.")
-
-    # 'post' or 'get'
-    endpoints_config = agents_config[method]
-
-    log.debug(f"endpoints_config: {endpoints_config}")
-    # Replace placeholders in the config
-    endpoints = {}
-    for key, value in endpoints_config.items():
-        format_args = {'stem': stem}
-        if '{vector_name}' in value and vector_name is not None:
-            format_args['vector_name'] = vector_name
-        
-        if not isinstance(value, str):
-            log.warning('endpoint value not string? format_args: {format_args} - value: {value} - key: {key}')
-            
-        endpoints[key] = value.format(**format_args)
-
-    return endpoints
+        stem = lookup_vac_url(config=config) if not override_endpoint else override_endpoint
+
+        agents_config = config.agentConfig(agent_type)
+
+        log.debug(f"agents_config: {agents_config}")
+        if method not in agents_config:
+            raise ValueError(f"Invalid method '{method}' for agent configuration.")
+
+        # 'post' or 'get'
+        endpoints_config = agents_config[method]
+
+        log.debug(f"endpoints_config: {endpoints_config}")
+        # Replace placeholders in the config
+        endpoints = {}
+        for key, value in endpoints_config.items():
+            format_args = {'stem': stem}
+            if '{vector_name}' in value and vector_name is not None:
+                format_args['vector_name'] = vector_name
+
+            if not isinstance(value, str):
+                log.warning('endpoint value not string? format_args: {format_args} - value: {value} - key: {key}')
+
+            endpoints[key] = value.format(**format_args)
+
+        return endpoints
+
+    return _cached_route(("endpoints", vector_name, method, override_endpoint), build)
+
+def route_vac(vector_name: str=None, config=None) -> str :
+    """
+    Considers what VAC this vector_name belongs to
+    """
+    return lookup_vac_url(vector_name=vector_name, config=config)
+
+def route_endpoint(vector_name=None, method = 'post', override_endpoint=None, config=None):
 
+    return dict(lookup_endpoints(vector_name=vector_name, method=method,
+                                 override_endpoint=override_endpoint, config=config))
@@ -1,6 +1,6 @@
 import copy
 from ..utils.config import load_all_configs
-from .route import route_vac
+from .route import lookup_vac_url
 from ..custom_logging import log
 from ruamel.yaml import YAML
 from io import StringIO
@@ -197,7 +197,7 @@ def generate_swagger(vac_config, agent_config):
         agent_type = config['agent']
         log.info(f'Configuring swagger for agent_type: {agent_type} for vector_name: {vector_name}')
         try:
-            stem = route_vac(vector_name).strip()
+            stem = lookup_vac_url(vector_name).strip()
         except ValueError:
             log.warning(f"Failed to find URL stem for {vector_name}/{agent_type} - skipping")
             return
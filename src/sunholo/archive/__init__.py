@@ -1 +1 @@
-from .archive import archive_qa
\ No newline at end of file
+from .archive import archive_qa, archive_qa_async, queue_archive_qa, flush_archive
@@ -12,20 +12,117 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 from ..pubsub import PubSubManager
+from ..pubsub.pubsub_manager import stop_publishers
 from ..custom_logging import log
 
 
 
+import atexit
 import datetime
+import queue
+import threading
+
+ARCHIVE_TOPIC = "qna-to-pubsub-bq-archive"
+ARCHIVE_QUEUE_SIZE = 1000
+# Seconds to wait at exit for queued archive messages to be published
+ARCHIVE_FLUSH_TIMEOUT = 10
+
+_archive_queue = queue.Queue(maxsize=ARCHIVE_QUEUE_SIZE)
+_archive_worker = None
+_archive_worker_lock = threading.Lock()
 
 
 def archive_qa(bot_output, vector_name):
+    """
+    Publishes a Q&A result to the archive Pub/Sub topic.
+
+    Uses the shared publisher for the topic so only the first call per process pays for
+    client creation and the topic check. The publish itself is batched by the client.
+    """
     try:
-        pubsub_manager = PubSubManager(vector_name, pubsub_topic="qna-to-pubsub-bq-archive")
+        pubsub_manager = PubSubManager(vector_name, pubsub_topic=ARCHIVE_TOPIC)
         the_data = {"bot_output": bot_output,
                     "vector_name": vector_name,
                     "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-        
+
         pubsub_manager.publish_message(the_data)
     except Exception as e:
-        log.warning(f"Could not publish message for {vector_name} to qna-to-pubsub-bq-archive - {str(e)}")
\ No newline at end of file
+        log.warning(f"Could not publish message for {vector_name} to {ARCHIVE_TOPIC} - {str(e)}")
+
+
+def _archive_loop():
+    while True:
+        bot_output, vector_name = _archive_queue.get()
+        try:
+            archive_qa(bot_output, vector_name)
+        finally:
+            _archive_queue.task_done()
+
+
+def _ensure_archive_worker():
+    global _archive_worker
+    if _archive_worker is not None and _archive_worker.is_alive():
+        return
+    with _archive_worker_lock:
+        if _archive_worker is None or not _archive_worker.is_alive():
+            _archive_worker = threading.Thread(target=_archive_loop, name="sunholo-archive-qa", daemon=True)
+            _archive_worker.start()
+
+
+def queue_archive_qa(bot_output, vector_name) -> bool:
+    """
+    Fire-and-forget version of `archive_qa` for use on the request path.
+
+    The message is handed to a background thread that does the publishing, so the caller
+    never waits on Pub/Sub. If the queue is full the message is dropped with a warning.
+
+    Returns:
+        bool: True if the message was queued.
+    """
+    _ensure_archive_worker()
+    try:
+        _archive_queue.put_nowait((bot_output, vector_name))
+        return True
+    except queue.Full:
+        log.warning(f"Archive queue full ({ARCHIVE_QUEUE_SIZE}) - dropping archive message for {vector_name}")
+        return False
+
+
+async def archive_qa_async(bot_output, vector_name) -> bool:
+    """
+    Async variant of `queue_archive_qa` - enqueues the archive message and returns immediately.
+
+    Example:
+    ```python
+    async for chunk in start_streaming_chat_async(...):
+        if isinstance(chunk, dict) and 'answer' in chunk:
+            await archive_qa_async(chunk, vector_name)
+    ```
+    """
+    return queue_archive_qa(bot_output, vector_name)
+
+
+def flush_archive(timeout: float = None) -> bool:
+    """
+    Publishes all queued archive messages, e.g. at shutdown.
+
+    Waits for the queue to drain, then sends the messages still batched in the archive
+    topic's publisher. Registered to run at exit, and called by the FastAPI app's shutdown.
+
+    Args:
+        timeout: Maximum seconds to wait for the queue. None waits until it is drained.
+
+    Returns:
+        bool: True if the queue was drained.
+    """
+    with _archive_queue.all_tasks_done:
+        drained = _archive_queue.all_tasks_done.wait_for(
+            lambda: _archive_queue.unfinished_tasks == 0, timeout)
+    if not drained:
+        log.warning(f"{_archive_queue.unfinished_tasks} archive messages were not published within {timeout}s")
+    stop_publishers(ARCHIVE_TOPIC)
+    return drained
+
+
+# the worker is a daemon thread, so publish what is queued before the process exits
+atexit.register(flush_archive, ARCHIVE_FLUSH_TIMEOUT)
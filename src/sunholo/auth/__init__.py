@@ -1,2 +1,2 @@
-from .run import get_header, get_cloud_run_token
+from .run import get_header, get_header_async, get_cloud_run_token
 from .gcloud import get_local_gcloud_token
\ No newline at end of file
@@ -2,33 +2,27 @@
 import inspect
 
 from typing import Dict, Optional
-from ..utils.config import load_config
 from ..utils import ConfigManager
 from ..utils.gcp import is_running_on_cloudrun
 from ..utils.api_key import has_multivac_api_key, get_multivac_api_key
 from ..custom_logging import log
-from ..agents.route import route_vac
+from ..agents.route import lookup_vac_url
 from .gcloud import get_local_gcloud_token
+from .token_cache import id_token_cache
+
+# Cache key for the local gcloud identity token, which is the same for every audience
+LOCAL_GCLOUD_AUDIENCE = "local-gcloud"
 
 def get_run_url(config):
 
     if not config:
         raise ValueError('Vector name was not specified')
     
-    cloud_urls = route_vac(config=config)
-    
-    cloud_urls, _ = load_config('config/cloud_run_urls.json')
-    agent = config.vacConfig("agent")
-
-    try:
-        log.info(f'Looking up URL for {agent}')
-        url = cloud_urls[agent]
-        return url
-    except KeyError:
-        raise ValueError(f'Could not find cloud_run_url for {agent} within {cloud_urls}')
+    # memoized per config generation, so this is a dict lookup after the first call
+    return lookup_vac_url(config=config)
 
-def get_id_token(url: str) -> str:
-    """Helper method to generate ID tokens for authenticated requests"""
+def fetch_id_token(url: str) -> str:
+    """Mints a new ID token for `url`, bypassing the token cache."""
     # Use Application Default Credentials on Cloud Run
     if is_running_on_cloudrun():
         import google.auth.transport.requests  # type: ignore
@@ -40,6 +34,22 @@ def get_id_token(url: str) -> str:
 
     return get_local_gcloud_token()
 
+def _token_audience(url: str) -> str:
+    return url if is_running_on_cloudrun() else LOCAL_GCLOUD_AUDIENCE
+
+def get_id_token(url: str) -> str:
+    """
+    Helper method to generate ID tokens for authenticated requests.
+
+    Tokens are cached per audience and refreshed in the background before they expire,
+    so only the first request to each service pays for minting one.
+    """
+    return id_token_cache.get(_token_audience(url), lambda: fetch_id_token(url))
+
+async def get_id_token_async(url: str) -> str:
+    """Async variant of `get_id_token`."""
+    return await id_token_cache.aget(_token_audience(url), lambda: fetch_id_token(url))
+
 def get_cloud_run_token(vector_name):
     if has_multivac_api_key():
         
@@ -75,9 +85,23 @@ def get_cloud_run_token(vector_name):
     id_token = get_id_token(run_url)
     return id_token
 
+def _auth_header(token) -> dict:
+    if isinstance(token, dict):
+        # an API key header from get_cloud_run_token
+        return dict(token)
+    return {"Authorization": f"Bearer {token}"}
+
 def get_header(vector_name) -> Optional[dict]:
     id_token = get_cloud_run_token(vector_name)
 
-    headers = {"Authorization": f"Bearer {id_token}"}
-    
-    return headers
\ No newline at end of file
+    return _auth_header(id_token)
+
+async def get_header_async(vector_name) -> Optional[dict]:
+    """Async variant of `get_header` that doesn't block the event loop while a token is minted."""
+    if has_multivac_api_key():
+        return _auth_header({"x-api-key": get_multivac_api_key()})
+
+    config = ConfigManager(vector_name)
+    run_url = get_run_url(config)
+
+    return _auth_header(await get_id_token_async(run_url))
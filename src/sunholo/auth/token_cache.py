@@ -0,0 +1,143 @@
+#   Copyright [2024] [Holosun ApS]
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+import asyncio
+import base64
+import json
+import threading
+import time
+from typing import Callable
+
+from ..custom_logging import log
+
+# Google ID tokens last an hour; used when a token's expiry can't be read
+DEFAULT_TOKEN_LIFETIME = 3600
+# Start refreshing a token in the background this many seconds before it expires
+REFRESH_MARGIN = 300
+# Never use a token this close to expiry - fetch a new one instead
+MIN_TOKEN_TTL = 30
+
+
+def token_expiry(token: str) -> float:
+    """
+    Returns the expiry of a JWT as a unix timestamp, read from its `exp` claim without verifying it.
+
+    Falls back to `DEFAULT_TOKEN_LIFETIME` from now if the token can't be decoded.
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except Exception:
+        return time.time() + DEFAULT_TOKEN_LIFETIME
+
+
+class IdTokenCache:
+    """
+    A thread-safe cache of ID tokens keyed by audience.
+
+    Tokens are reused until `refresh_margin` seconds before they expire. From then on the
+    cached token is still returned while a single background refresh fetches its
+    replacement, so callers only wait on a fetch for the very first token or one that
+    has already lapsed. Concurrent callers for the same audience share a single fetch.
+
+    Example:
+    ```python
+    cache = IdTokenCache()
+    token = cache.get("https://my-vac.run.app", lambda: fetch_token("https://my-vac.run.app"))
+    ```
+    """
+
+    def __init__(self, refresh_margin: float = REFRESH_MARGIN, min_ttl: float = MIN_TOKEN_TTL):
+        self.refresh_margin = refresh_margin
+        self.min_ttl = min_ttl
+        self._tokens = {}       # audience -> (token, expiry)
+        self._locks = {}        # audience -> lock held while fetching
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def _audience_lock(self, audience):
+        with self._lock:
+            return self._locks.setdefault(audience, threading.Lock())
+
+    def _cached(self, audience, min_ttl):
+        entry = self._tokens.get(audience)
+        if entry is not None and entry[1] - time.time() > min_ttl:
+            return entry
+        return None
+
+    def get(self, audience: str, fetch: Callable[[], str]) -> str:
+        """
+        Returns a valid token for `audience`, calling `fetch()` to mint one when needed.
+        """
+        entry = self._cached(audience, self.min_ttl)
+        if entry is not None:
+            if entry[1] - time.time() <= self.refresh_margin:
+                self._refresh_in_background(audience, fetch)
+            return entry[0]
+
+        with self._audience_lock(audience):
+            # another caller may have fetched it while we waited
+            entry = self._cached(audience, self.min_ttl)
+            if entry is not None:
+                return entry[0]
+            return self._fetch(audience, fetch)
+
+    async def aget(self, audience: str, fetch: Callable[[], str]) -> str:
+        """
+        Async variant of `get` - cached tokens are returned without leaving the event loop,
+        and fetches run in a worker thread.
+        """
+        entry = self._cached(audience, self.min_ttl)
+        if entry is not None:
+            if entry[1] - time.time() <= self.refresh_margin:
+                self._refresh_in_background(audience, fetch)
+            return entry[0]
+        return await asyncio.to_thread(self.get, audience, fetch)
+
+    def _fetch(self, audience, fetch):
+        token = fetch()
+        expiry = token_expiry(token)
+        self._tokens[audience] = (token, expiry)
+        log.debug(f"Fetched ID token for {audience}, expires in {int(expiry - time.time())}s")
+        return token
+
+    def _refresh_in_background(self, audience, fetch):
+        with self._lock:
+            if audience in self._refreshing:
+                return
+            self._refreshing.add(audience)
+
+        def refresh():
+            try:
+                with self._audience_lock(audience):
+                    if self._cached(audience, self.refresh_margin) is None:
+                        self._fetch(audience, fetch)
+            except Exception as err:
+                log.warning(f"Background ID token refresh failed for {audience}: {err}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(audience)
+
+        threading.Thread(target=refresh, name="sunholo-id-token-refresh", daemon=True).start()
+
+    def invalidate(self, audience: str = None):
+        """Forgets the token for `audience`, or all tokens if it is None."""
+        with self._lock:
+            if audience is None:
+                self._tokens.clear()
+            else:
+                self._tokens.pop(audience, None)
+
+
+id_token_cache = IdTokenCache()
@@ -1,3 +1,8 @@
-from .pubsub import data_to_embed_pubsub
-from .azure import data_to_embed_azure
-from .process_chunker_data import direct_file_to_embed
+# Submodules are imported on first attribute access, see sunholo/_lazy.py
+from .._lazy import lazy_attributes
+
+__getattr__, __dir__ = lazy_attributes(__name__, globals(), {
+    "data_to_embed_pubsub": ".pubsub:data_to_embed_pubsub",
+    "data_to_embed_azure": ".azure:data_to_embed_azure",
+    "direct_file_to_embed": ".process_chunker_data:direct_file_to_embed",
+})
@@ -63,10 +63,11 @@ def create_big_doc(docs):
     if not docs:
         return None, None, None
     
-    # merge docs into one document object
+    # merge docs into one document object, the content is joined once at the end
     big_doc = Document(page_content="", 
                         metadata={"images_gsurls": [],
                                   "chunk_metadata": []})
+    contents = []
     doc_id = None
     for doc in docs:
         if doc_id is None:
@@ -79,8 +80,8 @@ def create_big_doc(docs):
 
         doc.metadata["docstore_doc_id"] = str(doc_id)
 
-        content = remove_whitespace(doc.page_content)
-        big_doc.page_content += f"\n{content}"
+        contents.append("\n")
+        contents.append(remove_whitespace(doc.page_content))
         
         image_gsurl = upload_doc_images(doc.metadata)
         if image_gsurl:
@@ -95,6 +96,7 @@ def create_big_doc(docs):
         
         big_doc.metadata["chunk_metadata"].append(doc.metadata)
 
+    big_doc.page_content = "".join(contents)
     big_doc.metadata["doc_id"] = doc_id
     big_doc.metadata["char_count"] = len(big_doc.page_content)
 
@@ -30,6 +30,7 @@ import shutil
 from urllib.parse import urlparse, unquote
 import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from pydantic import BaseModel, Field
 from typing import Optional
@@ -274,6 +275,36 @@ def read_file_to_documents(gs_file: pathlib.Path, metadata: dict = None):
 
     return docs
 
+def read_pdf_pages_to_documents(pages: list, metadata: dict = None, max_workers: int = 4):
+    """
+    Parses the single page PDFs from `split_pdf_to_pages` concurrently within this instance.
+
+    Each page goes through `read_file_to_documents`, which spends its time waiting on the
+    Unstructured API, so pages are parsed by a bounded thread pool. Documents are returned in
+    page order, each with its 1-based `page_number` in metadata.
+
+    Args:
+        pages (list): The page file paths, in page order.
+        metadata (dict, optional): Metadata added to every document.
+        max_workers (int): Maximum pages parsed at once.
+
+    Returns:
+        list: The documents of all pages.
+    """
+    def read_page(page_number, page):
+        page_metadata = {**(metadata or {}), "page_number": page_number}
+        log.info(f"Sending page {page_number} file {page} to loaders.read_file_to_documents")
+        page_docs = read_file_to_documents(page, metadata=page_metadata)
+        if page_docs is None:
+            log.warning(f"loaders.read_file_to_documents failed to load page {page_number} of {metadata}")
+            return []
+        return page_docs
+
+    workers = max(1, min(max_workers, len(pages)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf-pages") as pool:
+        page_docs = pool.map(read_page, range(1, len(pages) + 1), pages)
+        return [doc for docs in page_docs for doc in docs]
+
 def convert_to_txt_and_extract(gs_file, split=False):
     from langchain_unstructured import UnstructuredLoader
     if not  UnstructuredLoader:
@@ -32,15 +32,40 @@ except ImportError:
 from ..langchain_types import Document
 
 from .splitter import chunk_doc_to_docs
-from .pdfs import split_pdf_to_pages
+from .pdfs import split_pdf_to_pages, pdf_parse_config
 from .publish import publish_if_urls
 from . import loaders
 
 from ..utils.parsers import extract_urls
 from ..gcs.add_file import add_file_to_gcs, get_pdf_split_file_name
+from ..database.fingerprints import get_fingerprint_store, file_fingerprint, document_key
+from ..database.fingerprints import CONTENT_FINGERPRINT, FINGERPRINT_KEY
 from ..azure.blobs import extract_blob_parts
 from ..azure.auth import azure_auth
 
+def _check_file_fingerprint(message_data: str, file_path: str, vector_name: str):
+    """
+    Checks a file against the fingerprint recorded when it was last chunked for vector_name.
+
+    Returns:
+        (unchanged, fingerprint): unchanged is True if the file was already chunked with the same
+        content. Otherwise fingerprint holds the keys format_chunk_return records once the chunks
+        are published, or is empty if the fingerprint store is not configured or can't be read.
+    """
+    try:
+        fingerprint_store = get_fingerprint_store(vector_name)
+        if not fingerprint_store:
+            return False, {}
+        key = document_key(message_data)
+        fingerprint = file_fingerprint(file_path)
+        if fingerprint_store.is_unchanged(vector_name, key, fingerprint):
+            return True, {}
+    except Exception as err:
+        log.warning(f"Could not check the content fingerprint of {message_data} for {vector_name}: {err}")
+        return False, {}
+
+    return False, {FINGERPRINT_KEY: key, CONTENT_FINGERPRINT: fingerprint}
+
 def handle_gcs_message(message_data: str, metadata: dict, vector_name: str):
 
     if not storage:
@@ -63,11 +88,17 @@ def handle_gcs_message(message_data: str, metadata: dict, vector_name: str):
         tmp_file_path = os.path.join(temp_dir, file_name.name)
         blob.download_to_filename(tmp_file_path)
 
+        unchanged, fingerprint = _check_file_fingerprint(message_data, tmp_file_path, vector_name)
+        if unchanged:
+            log.info(f"Content of {message_data} is unchanged since it was last chunked for {vector_name} - skipping")
+            return None, None
+
+        pdf_fanout_pages, pdf_workers = pdf_parse_config(vector_name)
         if file_name.suffix.lower() == ".pdf":
             pages = split_pdf_to_pages(tmp_file_path, temp_dir)
             if not metadata.get("source"):
                 metadata["source"] = str(file_name)
-            if len(pages) > 1: # we send it back to GCS to parrallise the imports
+            if len(pages) > pdf_fanout_pages: # we send big PDFs back to GCS to parrallise the imports over instances
                 log.info(f"Got back {len(pages)} pages for file {tmp_file_path}")
                 for pp in pages:
                     pp_basename = os.path.basename(pp)
@@ -95,13 +126,17 @@ def handle_gcs_message(message_data: str, metadata: dict, vector_name: str):
 
         metadata.update(the_metadata)
 
-        docs = []
-        for page in pages:
-            log.info(f"Sending file {page} to loaders.read_file_to_documents {metadata}")
-            docs2 = loaders.read_file_to_documents(page, metadata=metadata)
-            if docs2 is None:
-                log.warning(f"loaders.read_file_to_documents docs2 failed to load file {metadata}")
-            docs.extend(docs2)
+        if len(pages) > 1:
+            log.info(f"Parsing {len(pages)} pages of {file_name.name} with {pdf_workers} workers")
+            docs = loaders.read_pdf_pages_to_documents(pages, metadata=metadata, max_workers=pdf_workers)
+        else:
+            docs = []
+            for page in pages:
+                log.info(f"Sending file {page} to loaders.read_file_to_documents {metadata}")
+                docs2 = loaders.read_file_to_documents(page, metadata=metadata)
+                if docs2 is None:
+                    log.warning(f"loaders.read_file_to_documents docs2 failed to load file {metadata}")
+                docs.extend(docs2)
 
         if docs is None:
             log.warning(f"loaders.read_file_to_documents docs failed to load file {metadata}")
@@ -109,6 +144,10 @@ def handle_gcs_message(message_data: str, metadata: dict, vector_name: str):
         else:
             chunks = chunk_doc_to_docs(docs, file_name.suffix, vector_name=vector_name)
 
+        # added after chunking, and to a copy, so the keys are not copied onto each chunk
+        if fingerprint:
+            metadata = {**metadata, **fingerprint}
+
         return chunks, metadata
 
 def handle_google_drive_message(message_data: str, metadata: dict, vector_name: str):
@@ -11,11 +11,41 @@
 #   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
+import multiprocessing
 import os
 import pathlib
+from concurrent.futures import ProcessPoolExecutor
 from ..custom_logging import log
 from ..langchain_types import Document
 
+# PDFs with more pages than this are split and sent back to the bucket so separate chunker
+# instances parse the pages, smaller ones are parsed page-by-page in this instance.
+PDF_FANOUT_PAGES = 50
+# Upper bound on the worker processes/threads parsing the pages of one PDF
+PDF_PARSE_WORKERS = min(8, os.cpu_count() or 1)
+# Starting worker processes costs more than extracting the text of a few pages
+MIN_PAGES_PER_PROCESS = 8
+
+def pdf_parse_config(vector_name=None):
+    """
+    Returns (fanout_pages, workers) for a VAC, from its vacConfig:
+
+    ```yaml
+    chunker:
+      pdf_fanout_pages: 50 # PDFs with more pages are split to other chunker instances via the bucket
+      pdf_workers: 4 # pages parsed concurrently within one chunker instance
+    ```
+    """
+    chunker_config = None
+    if vector_name:
+        from ..utils import ConfigManager
+        chunker_config = ConfigManager(vector_name).vacConfig("chunker")
+    chunker_config = chunker_config or {}
+
+    fanout_pages = int(chunker_config.get("pdf_fanout_pages", PDF_FANOUT_PAGES))
+    workers = max(1, int(chunker_config.get("pdf_workers", PDF_PARSE_WORKERS)))
+    return fanout_pages, workers
+
 def split_pdf_to_pages(pdf_path, temp_dir):
 
     log.info(f"Splitting PDF {pdf_path} into pages...")
@@ -51,18 +81,45 @@ def split_pdf_to_pages(pdf_path, temp_dir):
     log.info(f"Split PDF {pdf_path} into {len(page_files)} pages...")
     return page_files
 
-def read_pdf_file(pdf_path, metadata):
+def _extract_page_range(pdf_path, start, stop):
+    # runs in a worker process, so opens its own reader
+    from pypdf import PdfReader
+    pdf = PdfReader(pdf_path)
+    return [pdf.pages[page].extract_text() for page in range(start, stop)]
+
+def _process_context():
+    # forking copies locks held by the logging, event loop and archive threads into the child
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+def extract_pdf_page_texts(pdf_path, max_workers=PDF_PARSE_WORKERS):
+    """
+    Extracts the text of every page of a PDF via pypdf, returned in page order.
+
+    Text extraction is CPU bound, so larger PDFs are divided into contiguous page ranges
+    that are extracted in a pool of at most `max_workers` processes.
+    """
     from pypdf import PdfReader
+    pdf_path = str(pdf_path)
+    page_count = len(PdfReader(pdf_path).pages)
+
+    workers = min(max_workers, page_count // MIN_PAGES_PER_PROCESS)
+    if workers <= 1:
+        return _extract_page_range(pdf_path, 0, page_count)
+
+    log.info(f"Extracting {page_count} pages of {pdf_path} with {workers} processes")
+    bounds = [page_count * i // workers for i in range(workers + 1)]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_process_context()) as pool:
+        ranges = pool.map(_extract_page_range, [pdf_path] * workers, bounds[:-1], bounds[1:])
+        return [text for page_range in ranges for text in page_range]
+
+def read_pdf_file(pdf_path, metadata, max_workers=PDF_PARSE_WORKERS):
     log.info(f"Trying local PDF parsing.  Reading PDF {pdf_path}...")
 
     pdf_path = pathlib.Path(pdf_path)
-    
-    pdf = PdfReader(pdf_path)
 
     try:
-        text = ""
-        for page in pdf.pages:
-            text += page.extract_text() + "\n"
+        text = "".join(page_text + "\n" for page_text in extract_pdf_page_texts(pdf_path, max_workers=max_workers))
     except Exception as err:
         log.warning(f"Could not extract PDF via pypdf ERROR - {str(err)}")
         return None
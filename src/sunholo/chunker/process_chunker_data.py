@@ -16,6 +16,7 @@ from .publish import process_docs_chunks_vector_name
 from .splitter import chunk_doc_to_docs
 from ..azure.blobs import is_azure_blob
 from ..utils import ConfigManager
+from ..database.fingerprints import get_fingerprint_store, CONTENT_FINGERPRINT, FINGERPRINT_KEY
 
 from ..custom_logging import log
 
@@ -69,9 +70,12 @@ def process_chunker_data(message_data, metadata, vector_name):
     return format_chunk_return(chunks, metadata, vector_name)
 
 def format_chunk_return(chunks, metadata, vector_name):
+    fingerprint = {}
     # to be really sure
     if metadata:
         metadata["vector_name"] = vector_name
+        # internal bookkeeping, kept out of the published and returned metadata
+        fingerprint = {key: metadata.pop(key) for key in (FINGERPRINT_KEY, CONTENT_FINGERPRINT) if key in metadata}
 
         if metadata.get("return_chunks"):
             log.info("attributes.return_chunks=True detected, skipping process chunks queue")
@@ -83,10 +87,22 @@ def format_chunk_return(chunks, metadata, vector_name):
             return output_list
 
     # returns None when not on GCP
-    process_docs_chunks_vector_name(chunks, vector_name, metadata)
+    published = process_docs_chunks_vector_name(chunks, vector_name, metadata)
+
+    if published and chunks and fingerprint.get(CONTENT_FINGERPRINT):
+        record_document_fingerprint(fingerprint, vector_name)
 
     return metadata
 
+def record_document_fingerprint(fingerprint: dict, vector_name: str):
+    """Records a chunked file's fingerprint so an unchanged re-upload is skipped, see database/fingerprints.py"""
+    try:
+        fingerprint_store = get_fingerprint_store(vector_name)
+        if fingerprint_store:
+            fingerprint_store.put(vector_name, fingerprint[FINGERPRINT_KEY], fingerprint[CONTENT_FINGERPRINT])
+    except Exception as err:
+        log.warning(f"Could not record fingerprint for {fingerprint.get(FINGERPRINT_KEY)}: {err}")
+
 
 def direct_file_to_embed(file_name: pathlib.Path, metadata: dict, vector_name: str):
     """
@@ -1,8 +1,11 @@
+import time
+
 from ..custom_logging import log
 from ..pubsub import PubSubManager
 from ..utils.parsers import contains_url, extract_urls
 from ..utils.gcp_project import get_gcp_project
 from ..langchain_types import Document
+from ..database.fingerprints import get_fingerprint_store
     
 def publish_if_urls(the_content, vector_name):
     """
@@ -17,32 +20,76 @@ def publish_if_urls(the_content, vector_name):
             publish_text(url, vector_name)
 
 
+# Chunks can be large, so allow bigger client side batches than the default for this topic.
+# Pub/Sub accepts up to 10MB per publish request.
+CHUNK_BATCH_SETTINGS = {
+    "max_messages": 500,
+    "max_bytes": 9 * 1024 * 1024,
+    "max_latency": 0.1,
+}
+
 def publish_chunks(chunks: list[Document], vector_name: str):
+    """
+    Publishes document chunks to the chunk-to-pubsub-embed topic for embedding.
+
+    All chunks are published through one shared publisher that groups them into size-bounded
+    batches, and the results are awaited together. A single summary is logged per document.
+    If the VAC has a `fingerprint_store`, chunks that were already embedded are not published.
+
+    Returns:
+        dict: The publish summary from `PubSubManager.publish_messages`, or None if nothing was sent.
+    """
     project = get_gcp_project()
     if not project:
         log.warning("No GCP project found for PubSub, no message sent")
 
         return None
     
-    log.info("Publishing chunks to embed_chunk")
-    
     try:
         pubsub_manager = PubSubManager(vector_name, 
                                     pubsub_topic="chunk-to-pubsub-embed", 
-                                    project_id=project)
+                                    project_id=project,
+                                    batch_settings=CHUNK_BATCH_SETTINGS)
     except Exception as err:
         log.error(f"PubSubManager init error: Could not publish chunks to {project} {vector_name} pubsub_topic chunk-to-pubsub-embed - {str(err)}")
         
         return None
-        
+
+    unchanged = 0
+    try:
+        fingerprint_store = get_fingerprint_store(vector_name)
+        changed = fingerprint_store.filter_changed_chunks(vector_name, chunks) if fingerprint_store else chunks
+    except Exception as err:
+        log.warning(f"Could not check chunk fingerprints for {vector_name}, publishing all chunks: {err}")
+    else:
+        unchanged = len(chunks) - len(changed)
+        if unchanged:
+            log.info(f"Skipping {unchanged}/{len(chunks)} chunks already embedded for {vector_name}")
+        chunks = changed
+
+    messages = []
+    skipped = 0
     for chunk in chunks:
         # Convert chunk to string, as Pub/Sub messages must be strings or bytes
         chunk_str = chunk.json()
         if len(chunk_str) < 10:
-            log.warning(f"Not publishing {chunk_str} as too small < 10 chars")
+            log.debug(f"Not publishing {chunk_str} as too small < 10 chars")
+            skipped += 1
             continue
-        log.info(f"Publishing chunk: {chunk_str}")
-        pubsub_manager.publish_message(chunk_str)
+        messages.append(chunk_str)
+
+    start = time.time()
+    summary = pubsub_manager.publish_messages(messages)
+    summary["skipped"] = skipped
+    summary["unchanged"] = unchanged
+
+    log.info(f"Published {summary['published']}/{len(chunks)} chunks ({summary['bytes']} bytes) "
+             f"for {vector_name} to chunk-to-pubsub-embed in {round(time.time() - start, 2)}s - "
+             f"failed: {summary['failed']} skipped: {skipped}")
+    if summary["errors"]:
+        log.error(f"Errors publishing chunks for {vector_name}: {summary['errors'][:5]}")
+
+    return summary
     
 
 def publish_text(text:str, vector_name: str):
@@ -74,7 +121,7 @@ def process_docs_chunks_vector_name(chunks, vector_name, metadata):
         pubsub_manager.publish_message(f"No chunks for: {metadata} to {vector_name} embedding")
         return None
         
-    publish_chunks(chunks, vector_name=vector_name)
+    summary = publish_chunks(chunks, vector_name=vector_name)
 
     msg = f"data_to_embed_pubsub published chunks with metadata: {metadata}"
 
@@ -82,4 +129,8 @@ def process_docs_chunks_vector_name(chunks, vector_name, metadata):
     
     pubsub_manager.publish_message(f"Sent doc chunks with metadata: {metadata} to {vector_name} embedding")
 
+    if not summary or summary["failed"]:
+        # so the document is not fingerprinted as done and gets chunked again next time
+        return None
+
     return metadata   
\ No newline at end of file
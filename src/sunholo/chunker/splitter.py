@@ -27,7 +27,9 @@ except ImportError:
 
 def chunk_doc_to_docs(documents: list, extension: str = ".md", min_size: int = 800, vector_name=None, **kwargs):
     """Turns a Document object into a list of many Document chunks.
-       If a document or chunk is smaller than min_size, it will be merged with adjacent documents or chunks."""
+       If a document or chunk is smaller than min_size, it will be merged with adjacent documents or chunks.
+       
+       See `iter_doc_chunks` to receive the chunks as they are produced instead of as a list."""
     
     if Document is None:
         raise ImportError("Document chunker needs langchain installed via sunholo[pipeline]")
@@ -36,6 +38,21 @@ def chunk_doc_to_docs(documents: list, extension: str = ".md", min_size: int = 8
         log.warning("No documents found to chunk in chunk_doc_to_docs")
         return None
 
+    return list(iter_doc_chunks(documents, extension=extension, min_size=min_size, vector_name=vector_name, **kwargs))
+
+def iter_doc_chunks(documents: list, extension: str = ".md", min_size: int = 800, vector_name=None, **kwargs):
+    """Generator version of `chunk_doc_to_docs` that yields each Document chunk as soon as it is produced.
+
+       Small documents and chunks are accumulated in lists and joined once, so the work is linear
+       in the size of the input however many small elements it is made of."""
+    
+    if Document is None:
+        raise ImportError("Document chunker needs langchain installed via sunholo[pipeline]")
+
+    if not documents:
+        log.warning("No documents found to chunk in iter_doc_chunks")
+        return
+
     # send full parsed doc to docstore
     docstore_doc_id, documents = send_doc_to_docstore(documents, vector_name=vector_name)
 
@@ -48,9 +65,41 @@ def chunk_doc_to_docs(documents: list, extension: str = ".md", min_size: int = 8
                 # If the objectId is found in doc_summaries, add the summary location to the document's metadata
                 doc.metadata["summary_location"] = doc_summaries[objectId]
 
-    # Combine entire documents that are smaller than min_size
-    combined_documents_content = ""
-    combined_documents = []
+    splitter = choose_splitter(extension, vector_name=vector_name, **kwargs)
+
+    temporary_chunk = []
+    chunk_number = 0
+    for document in _combine_small_documents(documents, docstore_doc_id, min_size):
+        for chunk in splitter.split_text(document.page_content):
+            # If a chunk is smaller than the min_size, append it to temporary_chunk with a line break and continue
+            if len(chunk) < min_size:
+                temporary_chunk.append(chunk + "\n")
+                log.debug(f"Appending chunk as its smaller than {min_size}: length {len(chunk)}")
+                continue
+
+            # If there's content in temporary_chunk, prepend it to the current chunk
+            if temporary_chunk:
+                temporary_chunk.append(chunk)
+                chunk = "".join(temporary_chunk)
+                temporary_chunk = []
+            
+            log.info(f"Adding chunk of length {len(chunk)}")
+            document.metadata["chunk_number"] = chunk_number
+            yield Document(page_content=chunk, metadata=document.metadata)
+
+        # If there's any remaining content in temporary_chunk, yield it as a new chunk
+        if temporary_chunk:
+            yield Document(page_content="".join(temporary_chunk), metadata=document.metadata)
+            temporary_chunk = []
+        
+        chunk_number += 1
+
+    log.info(f"Chunked into {chunk_number} documents")
+
+def _combine_small_documents(documents, docstore_doc_id, min_size):
+    """Yields the documents with runs of documents smaller than min_size merged into one."""
+    combined_content = []
+    combined_length = 0
     for document in documents:
         content = remove_whitespace(document.page_content)
 
@@ -69,53 +118,18 @@ def chunk_doc_to_docs(documents: list, extension: str = ".md", min_size: int = 8
             document.metadata["image_gsurl"] = image_gsurl
 
         if len(content) < min_size:
-            combined_documents_content += content + "\n"
-            log.debug(f"Appending document as its smaller than {min_size}: length {len(content)} - appended doc length {len(combined_documents_content)}")
+            combined_content.append(content + "\n")
+            combined_length += len(content) + 1
+            log.debug(f"Appending document as its smaller than {min_size}: length {len(content)} - appended doc length {combined_length}")
         else:
-            if combined_documents_content:
-                combined_documents.append(Document(page_content=combined_documents_content, metadata=document.metadata))
-                combined_documents_content = ""
-            combined_documents.append(document)
-
-    if combined_documents_content:
-        combined_documents.append(Document(page_content=combined_documents_content, metadata=documents[-1].metadata))
-
-    source_chunks = []
-    temporary_chunk = ""
-    chunk_number = 0
-    for document in combined_documents:
-        splitter = choose_splitter(extension, vector_name=vector_name, **kwargs)
-        for chunk in splitter.split_text(document.page_content):
-            # If a chunk is smaller than the min_size, append it to temporary_chunk with a line break and continue
-            if len(chunk) < min_size:
-                temporary_chunk += chunk + "\n"
-                log.debug(f"Appending chunk as its smaller than {min_size}: length {len(chunk)}")
-                continue
-
-            # If there's content in temporary_chunk, append it to the current chunk
-            if temporary_chunk:
-                chunk = temporary_chunk + chunk
-                temporary_chunk = ""
-
-            # If the combined chunk is still less than the min_size, append to temporary_chunk with a line break and continue
-            if len(chunk) < min_size:
-                temporary_chunk += chunk + "\n"
-                log.debug(f"Appending chunk as its smaller than {min_size}: length {len(chunk)}")
-                continue
-            
-            log.info(f"Adding chunk of length {len(chunk)}")
-            document.metadata["chunk_number"] = chunk_number
-            source_chunks.append(Document(page_content=chunk, metadata=document.metadata))
-
-        # If there's any remaining content in temporary_chunk, append it as a new chunk
-        if temporary_chunk:
-            source_chunks.append(Document(page_content=temporary_chunk, metadata=document.metadata))
-            temporary_chunk = ""
-        
-        chunk_number += 1
-
-    log.info(f"Chunked into {chunk_number} documents")
-    return source_chunks
+            if combined_content:
+                yield Document(page_content="".join(combined_content), metadata=document.metadata)
+                combined_content = []
+                combined_length = 0
+            yield document
+
+    if combined_content:
+        yield Document(page_content="".join(combined_content), metadata=documents[-1].metadata)
 
 def choose_splitter(extension: str, chunk_size: int=1024, chunk_overlap:int=200, vector_name: str=None):
 
@@ -1,3 +1,16 @@
-from .vectorstore import pick_vectorstore
-from .retriever import pick_retriever, load_memories
-from .llm import pick_llm, get_embeddings, get_llm, get_llm_chat, pick_embedding
+# Submodules are imported on first attribute access, see sunholo/_lazy.py
+from .._lazy import lazy_attributes
+
+__getattr__, __dir__ = lazy_attributes(__name__, globals(), {
+    "pick_vectorstore": ".vectorstore:pick_vectorstore",
+    "pick_retriever": ".retriever:pick_retriever",
+    "load_memories": ".retriever:load_memories",
+    "pick_llm": ".llm:pick_llm",
+    "get_embeddings": ".llm:get_embeddings",
+    "get_llm": ".llm:get_llm",
+    "get_llm_chat": ".llm:get_llm_chat",
+    "pick_embedding": ".llm:pick_embedding",
+    "component_registry": ".registry:component_registry",
+    "get_cached_embeddings": ".registry:get_cached_embeddings",
+    "get_cached_vectorstore": ".registry:get_cached_vectorstore",
+})
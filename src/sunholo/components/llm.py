@@ -257,8 +257,11 @@ def get_embeddings(vector_name=None, config:ConfigManager=None):
         if not vector_name:
             raise ValueError(f"config and vector_name was None: {vector_name}")
         config = ConfigManager(vector_name)
-    
 
+    return pick_embedding(embedding_llm_str(config), config=config)
+
+def embedding_llm_str(config:ConfigManager):
+    """The embedding provider for a VAC - `embedder.llm` falling back to `llm`."""
     llm_str = None
     embed_dict = config.vacConfig("embedder")
 
@@ -271,7 +274,7 @@ def get_embeddings(vector_name=None, config:ConfigManager=None):
     if llm_str is None:
         raise ValueError(f"llm_str was None: {llm_str}")
 
-    return pick_embedding(llm_str, config=config)
+    return llm_str
 
 
 #TODO: specify model
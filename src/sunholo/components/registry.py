@@ -0,0 +1,161 @@
+#   Copyright [2024] [Holosun ApS]
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from ..custom_logging import log
+from ..utils import ConfigManager
+from .vectorstore import pick_vectorstore
+from .llm import pick_embedding, embedding_llm_str
+
+
+class ComponentRegistry:
+    """
+    A thread-safe, TTL-evicting cache of constructed components such as vectorstores,
+    embeddings and retrievers.
+
+    Keys are tuples whose second element is the vector_name they were built for, so
+    all components for a VAC can be invalidated together when its config changes.
+
+    Args:
+        ttl: Seconds an entry is reused before it is rebuilt.
+        max_size: Maximum entries held; the least recently used entry is evicted first.
+
+    Example:
+    ```python
+    registry = ComponentRegistry(ttl=600)
+    vs = registry.get_or_create(("vectorstore", "my_vac", "lancedb"), lambda: build_vs())
+    registry.invalidate("my_vac")
+    ```
+    """
+
+    def __init__(self, ttl: float = 3600, max_size: int = 256):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._building = {}
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Returns the cached component for `key`, calling `factory` to build it if missing or expired.
+
+        Concurrent callers for the same key wait for a single build. Components that are
+        None or that raise are not cached.
+        """
+        component = self._get(key)
+        if component is not None:
+            return component
+
+        with self._lock:
+            build_lock = self._building.setdefault(key, threading.Lock())
+
+        with build_lock:
+            # another thread may have built it while we waited
+            component = self._get(key)
+            if component is not None:
+                return component
+
+            log.debug(f"Building component for {key}")
+            try:
+                component = factory()
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+            if component is None:
+                return None
+
+            with self._lock:
+                self._entries[key] = (component, time.monotonic())
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+            return component
+
+    def _get(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[1] >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def invalidate(self, vector_name: str = None):
+        """Removes all entries for `vector_name`, or everything if it is None."""
+        with self._lock:
+            if vector_name is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if len(k) > 1 and k[1] == vector_name]:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+component_registry = ComponentRegistry()
+
+
+def embeddings_key(embeddings):
+    """Identifies an embeddings object by class and model, falling back to its identity."""
+    model = getattr(embeddings, "model", None) or getattr(embeddings, "model_name", None)
+    if isinstance(model, str):
+        return (type(embeddings).__name__, model)
+    return (type(embeddings).__name__, id(embeddings))
+
+
+def get_cached_embedding(llm_str: str, config: ConfigManager):
+    """Cached version of `pick_embedding` shared across requests for the same VAC."""
+    return component_registry.get_or_create(
+        ("embeddings", config.vector_name, llm_str),
+        lambda: pick_embedding(llm_str, config=config))
+
+
+def get_cached_embeddings(vector_name: str = None, config: ConfigManager = None):
+    """Cached version of `get_embeddings` shared across requests for the same VAC."""
+    if not config:
+        if not vector_name:
+            raise ValueError(f"config and vector_name was None: {vector_name}")
+        config = ConfigManager(vector_name)
+    return get_cached_embedding(embedding_llm_str(config), config)
+
+
+def get_cached_vectorstore(vs_str: str, vector_name: str = None, embeddings=None,
+                           config: ConfigManager = None, read_only=None):
+    """
+    Cached version of `pick_vectorstore`.
+
+    Keyed by vector_name, vectorstore type, embedding model and read_only, so database
+    clients, engines and table checks are only set up once per combination.
+    """
+    if not embeddings:
+        raise ValueError("Requires embeddings")
+    name = config.vector_name if config else vector_name
+    key = ("vectorstore", name, vs_str, embeddings_key(embeddings), bool(read_only))
+    return component_registry.get_or_create(
+        key,
+        lambda: pick_vectorstore(vs_str, vector_name=vector_name, embeddings=embeddings,
+                                 config=config, read_only=read_only))
+
+
+def _invalidate_on_config_reload(filename: str):
+    log.info(f"Config {filename} changed - clearing cached vectorstores, embeddings and retrievers")
+    component_registry.invalidate()
+
+
+ConfigManager.register_reload_callback(_invalidate_on_config_reload)
@@ -12,9 +12,8 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 from ..custom_logging import log
-from .vectorstore import pick_vectorstore
 from ..utils import ConfigManager
-from .llm import get_embeddings
+from .registry import component_registry, get_cached_embeddings, get_cached_vectorstore, embeddings_key
 from ..utils.gcp_project import get_gcp_project
 
 try:
@@ -46,12 +45,21 @@ def load_memories(vector_name:str=None, config:ConfigManager=None):
     return memories
 
 def pick_retriever(vector_name:str=None, config:ConfigManager=None, embeddings=None):
+    """
+    Returns the retriever combining all the memories configured for a VAC.
 
+    Retrievers and the vectorstores/embeddings they use are cached in the component registry,
+    so only the first call per VAC (or after its config changes) pays for construction.
+    """
     if config is None:
         if vector_name is None:
             raise ValueError("vector_name and config were none")
         config = ConfigManager(vector_name)
 
+    key = ("retriever", config.vector_name, embeddings_key(embeddings) if embeddings else None)
+    return component_registry.get_or_create(key, lambda: _build_retriever(config, embeddings))
+
+def _build_retriever(config:ConfigManager, embeddings=None):
     memories = load_memories(config=config)
 
     retriever_list = []
@@ -91,10 +99,10 @@ def pick_retriever(vector_name:str=None, config:ConfigManager=None, embeddings=N
                     log.info(f"Skipped from_metadata_id for {vectorstore}")
                     continue
 
-                embeddings = embeddings or get_embeddings(config=config)
+                embeddings = embeddings or get_cached_embeddings(config=config)
                 read_only = value.get('read_only')
                 try:
-                    vectorstore_obj = pick_vectorstore(
+                    vectorstore_obj = get_cached_vectorstore(
                         vectorstore, 
                         config=config,
                         embeddings=embeddings, 
@@ -141,8 +149,8 @@ def metadata_retriever(metadata: dict, key: str, config:ConfigManager, embedding
                         raise ValueError(f"Missing {key} in {metadata}")
                     the_id = metadata[key]
                     read_only = value.get('read_only')
-                    embeddings = embeddings or get_embeddings(config=config)
-                    vectorstore = pick_vectorstore(vectorstore, 
+                    embeddings = embeddings or get_cached_embeddings(config=config)
+                    vectorstore = get_cached_vectorstore(vectorstore, 
                                                    vector_name=the_id, 
                                                    embeddings=embeddings, 
                                                    read_only=read_only)
@@ -166,7 +174,7 @@ def process_retrieval(retriever_list: list, config: ConfigManager):
     k_override = config.vacConfig('memory_k')
     lotr = MergerRetriever(retrievers=retriever_list)
 
-    filter_embeddings = get_embeddings(config=config)
+    filter_embeddings = get_cached_embeddings(config=config)
 
     filter = EmbeddingsRedundantFilter(embeddings=filter_embeddings)
     pipeline = DocumentCompressorPipeline(transformers=[filter])
@@ -22,9 +22,197 @@ from .utils.version import sunholo_version
 import logging
 import inspect
 import os
+import sys
 import json
+import queue
+import atexit
+import threading
+import time
 from functools import wraps
 
+# Severities that are never sampled away and that briefly block the caller when the queue is full
+PRIORITY_SEVERITIES = {"WARNING", "ERROR", "CRITICAL", "ALERT", "EMERGENCY"}
+
+
+class LogShipper:
+    """
+    Ships structured log entries to Cloud Logging from a background thread in batches.
+
+    Callers only pay for a queue put; the API writes happen off the request path, one
+    `batch().commit()` per logger name per flush. The queue is bounded so a logging burst
+    can't grow memory without limit:
+
+    * Once the queue is `sample_watermark` full, only one in `sample_rate` DEBUG/INFO entries is kept.
+    * When the queue is full, DEBUG/INFO entries are dropped and WARNING+ entries wait up to
+      `priority_timeout` seconds for space before being dropped.
+
+    Dropped entries are counted and reported in a WARNING entry with the next batch.
+
+    Args:
+        client: A `google.cloud.logging.Client`.
+        max_queue: Maximum number of entries waiting to be shipped.
+        batch_size: Maximum number of entries per batch write.
+        flush_interval: Seconds the background thread waits to fill a batch before writing it.
+        sample_watermark: Fraction of `max_queue` at which DEBUG/INFO entries start being sampled.
+        sample_rate: Keep one in this many DEBUG/INFO entries while sampling.
+        priority_timeout: Seconds WARNING+ entries wait for queue space.
+    """
+    def __init__(self, client, max_queue=10000, batch_size=500, flush_interval=1.0,
+                 sample_watermark=0.8, sample_rate=10, priority_timeout=0.1):
+        self.client = client
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample_threshold = int(max_queue * sample_watermark)
+        self.sample_rate = max(1, sample_rate)
+        self.priority_timeout = priority_timeout
+        self.dropped = 0
+        self._sampled = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._pid = None
+
+    def _ensure_worker(self):
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # The parent's queue and worker thread don't survive a fork
+                self._queue = queue.Queue(maxsize=self.max_queue)
+                self._thread = None
+            if self._thread is None or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="sunholo-log-shipper", daemon=True)
+                self._thread.start()
+
+    def submit(self, logger_name, log_struct, severity="INFO", caller=None):
+        """
+        Queues an entry for shipping. Never raises and never blocks longer than `priority_timeout`.
+
+        Args:
+            logger_name (str): The Cloud Logging log name.
+            log_struct (dict): The structured payload.
+            severity (str): The entry severity.
+            caller (tuple, optional): (filename, line, function) of the logging call.
+
+        Returns:
+            bool: True if the entry was queued, False if it was dropped.
+        """
+        self._ensure_worker()
+        # shipped later, so a caller changing its dict afterwards must not change the entry
+        if isinstance(log_struct, dict):
+            log_struct = dict(log_struct)
+        entry = (logger_name, log_struct, severity, caller)
+        priority = severity in PRIORITY_SEVERITIES
+
+        if not priority and self._queue.qsize() >= self.sample_threshold:
+            with self._lock:
+                self._sampled += 1
+                keep = self._sampled % self.sample_rate == 0
+                if not keep:
+                    self.dropped += 1
+                    return False
+
+        try:
+            if priority:
+                self._queue.put(entry, timeout=self.priority_timeout)
+            else:
+                self._queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            entries = [first]
+            while len(entries) < self.batch_size:
+                try:
+                    entries.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self._write(entries)
+            except Exception as err:
+                print(f"Failed to ship {len(entries)} log entries: {err}")
+            finally:
+                for _ in entries:
+                    self._queue.task_done()
+
+    def _write(self, entries):
+        with self._lock:
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            logger_name = entries[0][0]
+            entries = entries + [(logger_name, {"message": f"Log shipper dropped {dropped} entries under load",
+                                                "dropped_entries": dropped}, "WARNING", None)]
+
+        by_logger = {}
+        for entry in entries:
+            by_logger.setdefault(entry[0], []).append(entry)
+
+        for logger_name, logger_entries in by_logger.items():
+            logger = self.client.logger(logger_name)
+            batch = logger.batch()
+            for _, log_struct, severity, caller in logger_entries:
+                batch.log_struct(log_struct, severity=severity, source_location=_source_location(caller))
+            try:
+                batch.commit()
+            except Exception as err:
+                print(f"Failed to commit log batch for {logger_name}: {err}")
+                self._write_individually(logger, logger_entries)
+
+    @staticmethod
+    def _write_individually(logger, entries):
+        for _, log_struct, severity, caller in entries:
+            source_location = _source_location(caller)
+            try:
+                logger.log_struct(log_struct, severity=severity, source_location=source_location)
+            except Exception as err:
+                print(f"Failed to log struct: {err}")
+                try:
+                    logger.log_text(log_struct.get("message") or str(log_struct),
+                                    severity=severity, source_location=source_location)
+                except Exception as text_err:
+                    print(f"Even fallback text logging failed: {text_err}")
+
+    def flush(self, timeout=5.0):
+        """
+        Waits until every queued entry has been written.
+
+        Args:
+            timeout (float): Maximum seconds to wait.
+
+        Returns:
+            bool: True if the queue drained in time.
+        """
+        if self._thread is None or self._pid != os.getpid():
+            return True
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+
+def _source_location(caller):
+    if caller is None:
+        return None
+    filename, line, function = caller
+    return {'file': filename, 'line': str(line), 'function': function}
+
+
 class GoogleCloudLogging:
     
     _instances = {}  # Dictionary to hold instances keyed by a tuple of (project_id, logger_name)
@@ -46,6 +234,7 @@ class GoogleCloudLogging:
             self.client = Client(project=self.project_id) if is_gcp_logged_in() else None
             self.logger_name = logger_name
             self.log_level = log_level
+            self.shipper = LogShipper(self.client) if self.client else None
             self.initialized = True  # Mark as initialized
             self.version = sunholo_version()
         print(f"Initialized logging object for logger_name: {logger_name}")
@@ -142,11 +331,9 @@ class GoogleCloudLogging:
                 e.g. logName="run.googleapis.com%2Fstderr"
             severity (str, optional): The severity level of the log entry. Defaults to "INFO".
         """
-        from .utils.version import sunholo_version
-        
         # Add version to log_text if it exists
         if log_text is not None:
-            log_text = f"[{sunholo_version()}] {log_text}"
+            log_text = f"[{self.version}] {log_text}"
             log_text = self._append_trace_id(log_text)
         
         # Always create or update log_struct with trace_id if available
@@ -162,13 +349,13 @@ class GoogleCloudLogging:
             log_struct["trace_id"] = self.trace_id
         
         # Add version to log_struct
-        log_struct["version"] = sunholo_version()
+        log_struct["version"] = self.version
         
         if not logger_name and not self.logger_name:
             raise ValueError("Must provide a logger name e.g. 'run.googleapis.com%2Fstderr'")
         
-        from .utils.gcp import is_running_on_gcp, is_gcp_logged_in
-        if not is_running_on_gcp() and not is_gcp_logged_in():
+        # The client is only created when GCP credentials were found at init
+        if self.client is None:
             import logging as log
             log.basicConfig(level=log.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
             if log_text:
@@ -177,23 +364,32 @@ class GoogleCloudLogging:
                 log.info(f"[{severity}][{logger_name or self.logger_name}][{self.version}] - {str(log_struct)}")
             return
         
-        logger = self.client.logger(logger_name or self.logger_name)
-        caller_info = self._get_caller_info()
-        
         # Always log struct, and include message if provided
         if log_text:
             log_struct["message"] = log_text
-        
+
+        # Only the frame's code and line are captured here, the source location dict is built when shipped
         try:
-            logger.log_struct(log_struct, severity=severity, source_location=caller_info)
-        except Exception as err:
-            print(f"Failed to log struct: {err}")
-            # Fallback to text logging
-            fallback_message = log_text if log_text else str(log_struct)
-            try:
-                logger.log_text(fallback_message, severity=severity, source_location=caller_info)
-            except Exception as text_err:
-                print(f"Even fallback text logging failed: {text_err}")
+            frame = sys._getframe(2)
+            caller = (frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name)
+        except ValueError:
+            caller = None
+
+        self.shipper.submit(logger_name or self.logger_name, log_struct, severity=severity, caller=caller)
+
+    def flush(self, timeout=5.0):
+        """
+        Waits for queued log entries to be written to Cloud Logging, e.g. before shutdown.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait. Defaults to 5.0.
+
+        Returns:
+            bool: True if all entries were written in time.
+        """
+        if self.shipper is None:
+            return True
+        return self.shipper.flush(timeout)
 
     def log(self, message, *args, **kwargs):
         """
@@ -353,6 +549,12 @@ class StandardLoggerWrapper:
     def exception(self, log_text=None, log_struct=None):
         self.structured_log(log_text=log_text, log_struct=log_struct, severity="CRITICAL")
         
+    def flush(self, timeout=None):
+        """Flushes the underlying logger's handlers."""
+        for handler in self.logger.handlers:
+            handler.flush()
+        return True
+
     # Forward any other standard logging methods to the underlying logger
     def __getattr__(self, name):
         return getattr(self.logger, name)
@@ -472,6 +674,27 @@ def setup_logging(logger_name=None, log_level=logging.INFO, project_id=None):
         wrapper.set_version(sunholo_version())
         return wrapper
     
+def flush_logs(timeout=5.0):
+    """
+    Waits for every GoogleCloudLogging instance to write its queued entries.
+
+    Registered with `atexit`; call it explicitly from shutdown hooks that exit without
+    running `atexit` handlers, e.g. a Cloud Run SIGTERM handler.
+
+    Args:
+        timeout (float, optional): Maximum seconds to wait per logger. Defaults to 5.0.
+
+    Returns:
+        bool: True if all loggers drained in time.
+    """
+    drained = True
+    for instance in list(GoogleCloudLogging._instances.values()):
+        if getattr(instance, 'initialized', False):
+            drained = instance.flush(timeout) and drained
+    return drained
+
+atexit.register(flush_logs)
+
 # for debugging
 def safe_log_struct(log, severity, message, struct):
     try:
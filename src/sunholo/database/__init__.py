@@ -1,7 +1,19 @@
-from .database import setup_supabase
-from .database import setup_cloudsql
-from .database import setup_database
-from .database import return_sources_last24
-from .database import delete_row_from_source
-from .static_dbs import get_db_directory
-from .alloydb_client import AlloyDBClient
+# Submodules are imported on first attribute access, see sunholo/_lazy.py
+from .._lazy import lazy_attributes
+
+__getattr__, __dir__ = lazy_attributes(__name__, globals(), {
+    "setup_supabase": ".database:setup_supabase",
+    "setup_cloudsql": ".database:setup_cloudsql",
+    "setup_database": ".database:setup_database",
+    "return_sources_last24": ".database:return_sources_last24",
+    "delete_row_from_source": ".database:delete_row_from_source",
+    "get_db_directory": ".static_dbs:get_db_directory",
+    "AlloyDBClient": ".alloydb_client:AlloyDBClient",
+    "do_sql": ".database:do_sql",
+    "execute_many": ".database:execute_many",
+    "do_sql_async": ".database:do_sql_async",
+    "execute_many_async": ".database:execute_many_async",
+    "get_connection_pool": ".pool:get_connection_pool",
+    "close_connection_pools": ".pool:close_connection_pools",
+    "get_fingerprint_store": ".fingerprints:get_fingerprint_store",
+})
@@ -9,11 +9,21 @@ except ImportError:
     pass
 
 import json
+import re
 from .database import get_vector_size
 from .uuid import generate_uuid_from_object_id
 from ..custom_logging import log
 from ..utils import ConfigManager
 from ..components import get_embeddings
+
+# Rows per multi-row INSERT in insert_rows_safely
+INSERT_BATCH_SIZE = 500
+# Postgres allows at most 65535 bind parameters per statement
+MAX_BIND_PARAMS = 65535
+
+_INTEGER_PATTERN = re.compile(r'[-+]?\d+')
+_NUMERIC_PATTERN = re.compile(r'[-+]?\d+(\.\d+)?')
+
 class AlloyDBClient:
     """
     A class to manage interactions with an AlloyDB instance.
@@ -268,8 +278,8 @@ class AlloyDBClient:
         
         return result
 
-    async def _execute_sql_async_langchain(self, sql_statement):
-        return await self.engine._afetch(query = sql_statement)
+    async def _execute_sql_async_langchain(self, sql_statement, values=None):
+        return await self.engine._afetch(query = sql_statement, params = values)
         
     async def _execute_sql_async_pg8000(self, sql_statement, values=None):
         """Executes a given SQL statement asynchronously with error handling.
@@ -1128,8 +1138,7 @@ class AlloyDBClient:
                     # Try to extract a number from the string
                     cleaned = value.replace(',', '')
                     # Extract the first number if there's text
-                    import re
-                    match = re.search(r'[-+]?\d+', cleaned)
+                    match = _INTEGER_PATTERN.search(cleaned)
                     if match:
                         return int(match.group())
                 return None
@@ -1142,8 +1151,7 @@ class AlloyDBClient:
                     cleaned = value.replace('$', '').replace('€', '').replace('£', '')
                     cleaned = cleaned.replace(',', '.')
                     # Extract the first number if there's text
-                    import re
-                    match = re.search(r'[-+]?\d+(\.\d+)?', cleaned)
+                    match = _NUMERIC_PATTERN.search(cleaned)
                     if match:
                         return float(match.group())
                 return None
@@ -1192,35 +1200,118 @@ class AlloyDBClient:
             log.debug(f"Conversion error for value '{value}' to {target_type}: {e}")
             return None
 
-    async def insert_rows_safely(self, table_name, rows, metadata=None, continue_on_error=False, primary_key_column="id"  # Specify the correct primary key column here
-):
+    def _convert_rows(self, rows, columns, metadata=None):
+        """
+        Maps rows onto table columns and converts their values column by column.
+
+        Key to column resolution is done once per distinct key rather than per row.
+
+        Returns:
+            list: One dict per row of column name to converted value
+        """
+        column_map_lower = {col['name'].lower(): col for col in columns}
+
+        resolved = {}
+        def resolve(key):
+            if key not in resolved:
+                resolved[key] = column_map_lower.get(key.lower())
+            return resolved[key]
+
+        # gather the values for each table column across all rows, then convert each column in one pass
+        column_values = {}
+        for i, row in enumerate(rows):
+            for key, value in row.items():
+                col_info = resolve(key)
+                if col_info is not None:
+                    column_values.setdefault(col_info['name'], ([], [], col_info['type']))
+                    indexes, values, _ = column_values[col_info['name']]
+                    indexes.append(i)
+                    values.append(value)
+
+        converted_rows = [{} for _ in rows]
+        for col_name, (indexes, values, col_type) in column_values.items():
+            convert = self.safe_convert_value
+            for i, value in zip(indexes, values):
+                converted_rows[i][col_name] = convert(value, col_type)
+
+        if metadata:
+            metadata_values = {}
+            for key, value in metadata.items():
+                col_info = resolve(key)
+                if col_info is not None:
+                    metadata_values[col_info['name']] = value
+            for converted in converted_rows:
+                converted.update(metadata_values)
+
+        return converted_rows
+
+    async def _insert_rows_batch(self, table_name: str, column_names: tuple, batch: list, primary_key_column: str = "id"):
+        """
+        Inserts rows sharing the same columns with a single multi-row INSERT.
+
+        Returns:
+            list: The RETURNING rows, in the order the rows were given
+        """
+        columns_str = ", ".join(f'"{col}"' for col in column_names)
+        params = {}
+        values_sql = []
+        for r, row in enumerate(batch):
+            placeholders = []
+            for c, col in enumerate(column_names):
+                param_name = f"p{r}_{c}"
+                value = row[col]
+                # For JSON values, convert to string
+                params[param_name] = json.dumps(value) if isinstance(value, (dict, list)) else value
+                placeholders.append(f":{param_name}")
+            values_sql.append(f"({', '.join(placeholders)})")
+
+        sql = f'''
+        INSERT INTO "{table_name}" ({columns_str})
+        VALUES {", ".join(values_sql)}
+        RETURNING {primary_key_column}
+        '''
+
+        if self.engine_type == "pg8000":
+            result = self._execute_sql_pg8000(sql, params)
+        else:
+            result = await self._execute_sql_async_langchain(sql, params)
+
+        return list(result) if result is not None else []
+
+    async def insert_rows_safely(self, table_name, rows, metadata=None, continue_on_error=False, primary_key_column="id",  # Specify the correct primary key column here
+                                 batch_size:int=INSERT_BATCH_SIZE):
         """
         Insert multiple rows into a table with error handling for individual rows.
-        
+
+        Rows are inserted with multi-row INSERT statements of up to `batch_size` rows.
+        If a batch fails it is split in half and retried, down to single rows, so only the
+        rows that actually fail are reported and the rest are still inserted.
+
         Args:
             table_name (str): The table to insert into
             rows (list): List of dictionaries containing row data
             metadata (dict, optional): Additional metadata to include in each row
             continue_on_error (bool): Whether to continue if some rows fail
             primary_key_column (str): The primary key in the table, default 'id'
-            
+            batch_size (int): Maximum rows per INSERT statement. 1 inserts row by row.
+
         Returns:
             dict: {
                 'success': bool,
                 'total_rows': int,
                 'inserted_rows': int,
                 'failed_rows': int,
-                'errors': list of errors with row data
+                'errors': list of errors with row data,
+                'return_ids': list of returned primary keys for each inserted row, in row order
             }
         """
         if not rows:
             return {'success': True, 'total_rows': 0, 'inserted_rows': 0, 'failed_rows': 0, 'errors': []}
-        
+
         # Get table columns for mapping and type conversion
         columns = await self.get_table_columns(table_name)
-        column_map = {col['name']: col for col in columns}
-        column_map_lower = {col['name'].lower(): col for col in columns}
-        
+        converted_rows = self._convert_rows(rows, columns, metadata=metadata)
+
         results = {
             'success': True,
             'total_rows': len(rows),
@@ -1229,55 +1320,58 @@ class AlloyDBClient:
             'errors': [],
             'return_ids': []
         }
-        
-        for i, row in enumerate(rows):
+        return_ids = {}
+
+        # multi-row VALUES need the same columns in each row, so batch rows by their column set
+        groups = {}
+        for i, row in enumerate(converted_rows):
+            groups.setdefault(tuple(row.keys()), []).append(i)
+
+        async def insert_indexes(column_names, indexes):
+            """Inserts the rows at indexes, bisecting on failure. Returns False to stop."""
             try:
-                # Map row data to actual table columns
-                filtered_row = {}
-                
-                # First, do case-insensitive mapping
-                for key, value in row.items():
-                    key_lower = key.lower()
-                    if key_lower in column_map_lower:
-                        col_info = column_map_lower[key_lower]
-                        col_name = col_info['name']  # Use the correct case from DB
-                        col_type = col_info['type']
-                        
-                        # Try to convert value to the appropriate type
-                        converted_value = self.safe_convert_value(value, col_type)
-                        filtered_row[col_name] = converted_value
-                
-                # Add metadata if provided
-                if metadata:
-                    for key, value in metadata.items():
-                        key_lower = key.lower()
-                        if key_lower in column_map_lower:
-                            col_name = column_map_lower[key_lower]['name']
-                            filtered_row[col_name] = value
-                
-                # Insert the row
-                result = await self._insert_single_row(table_name, filtered_row, primary_key_column=primary_key_column)
-                result_ids = []
-                for res in result:
-                    result_ids.append(str(res))
-                results['return_ids'].append(result_ids)
-                results['inserted_rows'] += 1
-                
+                inserted = await self._insert_rows_batch(
+                    table_name, column_names, [converted_rows[i] for i in indexes],
+                    primary_key_column=primary_key_column)
             except Exception as e:
-                error_info = {
+                if len(indexes) > 1:
+                    log.warning(f"Batch of {len(indexes)} rows failed for {table_name} - retrying in halves: {e}")
+                    middle = len(indexes) // 2
+                    return (await insert_indexes(column_names, indexes[:middle])
+                            and await insert_indexes(column_names, indexes[middle:]))
+
+                i = indexes[0]
+                results['errors'].append({
                     'row_index': i,
                     'error': str(e),
-                    'row_data': row
-                }
-                results['errors'].append(error_info)
+                    'row_data': rows[i]
+                })
                 results['failed_rows'] += 1
-                
-                log.error(f"Error inserting row {i}: {e} for data: {row}")
-                
-                if not continue_on_error:
-                    results['success'] = False
-                    return results
-        
+                log.error(f"Error inserting row {i}: {e} for data: {rows[i]}")
+                return continue_on_error
+
+            for i, res in zip(indexes, inserted):
+                return_ids[i] = [str(res)]
+            results['inserted_rows'] += len(indexes)
+            log.info(f"Inserted {len(indexes)} rows into table {table_name}")
+            return True
+
+        # insert batches in order of their first row, so stopping on an error leaves earlier rows inserted
+        batches = []
+        for column_names, indexes in groups.items():
+            # keep each statement under the bind parameter limit
+            size = max(1, min(batch_size, MAX_BIND_PARAMS // max(len(column_names), 1)))
+            for start in range(0, len(indexes), size):
+                batches.append((column_names, indexes[start:start + size]))
+        batches.sort(key=lambda batch: batch[1][0])
+
+        for column_names, indexes in batches:
+            if not await insert_indexes(column_names, indexes):
+                results['success'] = False
+                results['return_ids'] = [return_ids[i] for i in sorted(return_ids)]
+                return results
+
+        results['return_ids'] = [return_ids[i] for i in sorted(return_ids)]
         # Overall success is true if any rows were inserted successfully
         results['success'] = results['inserted_rows'] > 0
         return results
@@ -12,13 +12,14 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-import os
+import asyncio
 import time
 import math
 
 from ..utils.config import get_module_filepath
 from ..custom_logging import log
 from ..utils.config import load_config_key
+from .pool import get_connection_pool, get_async_connection_pool, psycopg2, asyncpg
 
 
 
@@ -34,7 +35,7 @@ def setup_cloudsql(vector_name:str, verbose:bool=False):
     log.debug(hello)
     if verbose:
         print(hello)
-    setup_database(vector_name, verbose)
+    setup_database("cloudsql", vector_name, verbose)
 
 def lookup_connection_env(vs_str):
     
@@ -91,14 +92,7 @@ def return_sources_last24(vector_name:str):
                                  connection_env=lookup_connection_env(vector_name))
 
 def delete_row_from_source(source: str, vector_name:str):
-    # adapt the user input and decode from bytes to string to protect against sql injection
-    try:
-        import psycopg2
-        from psycopg2.extensions import adapt
-    except ImportError:
-        log.error("Couldn't import psycopg2 - please install via 'pip install psycopg2'") 
-
-    source = adapt(source).getquoted().decode()
+    # source is passed as a query parameter so psycopg2 escapes it, protecting against sql injection
     sql_params = {'source_delete': source}
     sql = f"""
         DELETE FROM {vector_name}
@@ -108,76 +102,172 @@ def delete_row_from_source(source: str, vector_name:str):
     do_sql(sql, sql_params=sql_params, connection_env=lookup_connection_env(vector_name))
 
 
+def _is_duplicate_error(error) -> bool:
+    return isinstance(error, (psycopg2.errors.DuplicateObject,
+                              psycopg2.errors.DuplicateTable,
+                              psycopg2.errors.DuplicateFunction))
 
-def do_sql(sql, sql_params=None, return_rows=False, verbose=False, connection_env='DB_CONNECTION_STRING', max_retries=5):
 
-    if connection_env is None:
-        raise ValueError("Need to specify connection_env to connect to DB")
-    
-    try:
-        import psycopg2
-        from psycopg2.extensions import adapt
-    except ImportError:
-        log.error("Couldn't import psycopg2 - please install via 'pip install psycopg2'") 
+def _is_retryable_error(error) -> bool:
+    return isinstance(error, (psycopg2.OperationalError,
+                              psycopg2.InterfaceError,
+                              psycopg2.errors.InternalError))
+
+
+def _run_pooled(run, verbose=False, connection_env='DB_CONNECTION_STRING', max_retries=5):
+    """
+    Calls `run(cursor)` on a pooled connection and commits, retrying with backoff on connection errors.
 
-    rows = []
-    connection_string = os.getenv(connection_env, None)
-    if connection_string is None:
-        raise ValueError("No connection string")
+    Duplicate object errors (e.g. re-running setup SQL) are logged and not retried.
+    Any other error is logged and None returned.
+    """
+    if psycopg2 is None:
+        log.error("Couldn't import psycopg2 - please install via 'pip install psycopg2'")
+        raise ImportError("psycopg2 is required for do_sql")
+
+    pool = get_connection_pool(connection_env)
 
     for attempt in range(max_retries):
         try:
-            connection = psycopg2.connect(connection_string)
-            cursor = connection.cursor()
+            with pool.connection() as connection:
+                with connection.cursor() as cursor:
+                    result = run(cursor)
+                connection.commit()
+            log.debug("SQL successfully fetched")
+            return result
 
-            if verbose:
-                log.info(f"SQL: {sql}")
-            else:
-                pass
-            # execute the SQL - raise the error if already found
-            cursor.execute(sql, sql_params)
+        except psycopg2.Error as error:
+            if _is_duplicate_error(error):
+                log.debug(str(error))
+                if verbose:
+                    print(str(error))
+                return None
+            if not _is_retryable_error(error):
+                log.error(f"Error while executing SQL: {str(error)}", exc_info=True)
+                return None
+            log.error(f"{type(error).__name__}, retrying... Attempt {attempt+1} out of {max_retries}")
+            if attempt + 1 < max_retries:
+                time.sleep(math.pow(2, attempt))  # Exponential backoff
 
-            # commit the transaction to save changes to the database
-            connection.commit()
+    # If we've exhausted all retries and still haven't succeeded, raise an error
+    raise Exception("Maximum number of retries exceeded")
 
-            if return_rows:
-                rows = cursor.fetchall()
-            log.debug("SQL successfully fetched")
-            break  # If all operations were successful, break the loop
 
-        except (psycopg2.errors.DuplicateObject, 
-                psycopg2.errors.DuplicateTable, 
-                psycopg2.errors.DuplicateFunction) as e:
-            log.debug(str(e))
-            if verbose:
-                print(str(e))
-            continue
-
-        except psycopg2.errors.InternalError as error:
-            log.error(f"InternalError, retrying... Attempt {attempt+1} out of {max_retries}")
-            time.sleep(math.pow(2, attempt))  # Exponential backoff
-            continue  # Go to the next iteration of the loop to retry the operation
-
-        except (Exception, psycopg2.Error) as error:
-            log.error(f"Error while connecting to PostgreSQL: {str(error)}", exc_info=True)
-            continue
-
-        finally:
-            if connection:
-                cursor.close()
-                connection.close()
-                log.debug("PostgreSQL connection is closed")
-    
-        # If we've exhausted all retries and still haven't succeeded, raise an error
-        if attempt + 1 == max_retries:
-            raise Exception("Maximum number of retries exceeded")
+def do_sql(sql, sql_params=None, return_rows=False, verbose=False, connection_env='DB_CONNECTION_STRING', max_retries=5):
+    """
+    Executes a SQL statement on a pooled connection to the database in `connection_env`.
+
+    Connections are reused across calls via `get_connection_pool`, so only the first
+    statement per process pays for the connection handshake.
+
+    Args:
+        sql: The SQL to execute, with psycopg2 style placeholders e.g. `%(name)s`
+        sql_params: Parameters for the placeholders
+        return_rows: Whether to fetch and return the resulting rows
+        verbose: Log the SQL before executing it
+        connection_env: The environment variable holding the connection string
+        max_retries: Attempts made on connection errors before raising
+
+    Returns:
+        The fetched rows if `return_rows` and there were any, else None
+    """
+    if connection_env is None:
+        raise ValueError("Need to specify connection_env to connect to DB")
+
+    def run(cursor):
+        if verbose:
+            log.info(f"SQL: {sql}")
+        cursor.execute(sql, sql_params)
+        if return_rows:
+            return cursor.fetchall()
+        return None
+
+    rows = _run_pooled(run, verbose=verbose, connection_env=connection_env, max_retries=max_retries)
 
     if rows:
         return rows
-    
+
     return None
 
 
+def execute_many(sql, params_list, verbose=False, connection_env='DB_CONNECTION_STRING', page_size=100, max_retries=5):
+    """
+    Executes one SQL statement for each set of parameters in `params_list` in a single transaction.
+
+    Parameters are sent in pages of `page_size` statements per round trip via
+    `psycopg2.extras.execute_batch`, rather than one round trip per row.
+
+    Returns:
+        int: The number of parameter sets executed
+    """
+    if connection_env is None:
+        raise ValueError("Need to specify connection_env to connect to DB")
+
+    params_list = list(params_list)
+    if not params_list:
+        return 0
+
+    def run(cursor):
+        from psycopg2.extras import execute_batch
+        if verbose:
+            log.info(f"SQL x {len(params_list)}: {sql}")
+        execute_batch(cursor, sql, params_list, page_size=page_size)
+        return len(params_list)
+
+    return _run_pooled(run, verbose=verbose, connection_env=connection_env, max_retries=max_retries) or 0
+
+
+async def do_sql_async(sql, *args, return_rows=False, verbose=False, connection_env='DB_CONNECTION_STRING', max_retries=5):
+    """
+    Async variant of `do_sql` using a pooled asyncpg connection.
+
+    asyncpg prepares and caches statements per connection, so repeated queries are only parsed once.
+    Placeholders are asyncpg style, e.g. `$1`, with their values passed as positional args.
+
+    Example:
+    ```python
+    rows = await do_sql_async("SELECT * FROM my_table WHERE id = $1", 42, return_rows=True)
+    ```
+    """
+    pool = await get_async_connection_pool(connection_env)
+
+    for attempt in range(max_retries):
+        try:
+            if verbose:
+                log.info(f"SQL: {sql}")
+            if return_rows:
+                rows = await pool.fetch(sql, *args)
+                return rows or None
+            await pool.execute(sql, *args)
+            return None
+        except (OSError, asyncpg.exceptions.InterfaceError, asyncpg.exceptions.InternalServerError) as error:
+            log.error(f"{type(error).__name__}, retrying... Attempt {attempt+1} out of {max_retries}")
+            if attempt + 1 < max_retries:
+                await asyncio.sleep(math.pow(2, attempt))  # Exponential backoff
+        except (asyncpg.exceptions.DuplicateObjectError,
+                asyncpg.exceptions.DuplicateTableError,
+                asyncpg.exceptions.DuplicateFunctionError) as error:
+            log.debug(str(error))
+            return None
+
+    raise Exception("Maximum number of retries exceeded")
+
+
+async def execute_many_async(sql, args_list, connection_env='DB_CONNECTION_STRING'):
+    """
+    Async variant of `execute_many` - runs a prepared statement once per args tuple in `args_list`.
+
+    Returns:
+        int: The number of args tuples executed
+    """
+    args_list = list(args_list)
+    if not args_list:
+        return 0
+    pool = await get_async_connection_pool(connection_env)
+    await pool.executemany(sql, args_list)
+    return len(args_list)
+
+
 def execute_sql_from_file(filepath, params, return_rows=False, verbose=False, connection_env=None):
     
     filepath = get_module_filepath(filepath)
@@ -0,0 +1,274 @@
+#   Copyright [2024] [Holosun ApS]
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""
+Content fingerprints so the chunk -> embed pipeline can skip content it has already processed.
+
+Fingerprints are sha256 hashes kept per vector_name in a pluggable store, configured per VAC:
+
+```yaml
+vac:
+  my_vac:
+    fingerprint_store:
+      type: sqlite # or firestore, alloydb
+      path: fingerprints.sqlite # sqlite only
+      collection: sunholo_fingerprints # firestore only
+      connection_env: DB_CONNECTION_STRING # alloydb only
+```
+
+Two kinds of entry are stored:
+
+* `document_key(source)` -> hash of the source file, recorded by the chunker once a file's
+  chunks are published, so an unchanged re-upload is skipped before it is parsed.
+* `chunk_key(doc)` -> hash of the chunk, recorded by the embedder once a chunk is written,
+  so when a document changes only its new or changed chunks are published and embedded.
+"""
+import hashlib
+import sqlite3
+from abc import ABC, abstractmethod
+import threading
+import time
+
+from ..custom_logging import log
+
+FINGERPRINT_TABLE = "sunholo_fingerprints"
+# Chunker metadata keys carrying a file's fingerprint to be recorded once its chunks are published
+FINGERPRINT_KEY = "fingerprint_key"
+CONTENT_FINGERPRINT = "content_fingerprint"
+FIRESTORE_BATCH_LIMIT = 500
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def content_fingerprint(content) -> str:
+    """Returns the sha256 hex digest of a str or bytes."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+def file_fingerprint(path, block_size: int = 1024 * 1024) -> str:
+    """Returns the sha256 hex digest of a file's bytes, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def document_key(source: str) -> str:
+    return f"doc:{source}"
+
+
+def chunk_key(doc) -> str:
+    """Returns the store key of a chunk Document: its source plus the hash of its content."""
+    metadata = doc.metadata or {}
+    source = (metadata.get("original_source") or metadata.get("source")
+              or metadata.get("objectId") or metadata.get("url") or "")
+    return f"chunk:{source}:{content_fingerprint(doc.page_content)}"
+
+
+class FingerprintStore(ABC):
+    """
+    Maps (vector_name, key) to a content fingerprint.
+
+    Subclasses implement `get_many` and `put_many`.
+    """
+
+    @abstractmethod
+    def get_many(self, vector_name: str, keys: list) -> dict:
+        """Returns {key: fingerprint} for the keys that are stored."""
+        ...
+
+    @abstractmethod
+    def put_many(self, vector_name: str, fingerprints: dict):
+        """Stores {key: fingerprint}, replacing existing fingerprints."""
+        ...
+
+    def get(self, vector_name: str, key: str):
+        return self.get_many(vector_name, [key]).get(key)
+
+    def put(self, vector_name: str, key: str, fingerprint: str):
+        self.put_many(vector_name, {key: fingerprint})
+
+    def is_unchanged(self, vector_name: str, key: str, fingerprint: str) -> bool:
+        return self.get(vector_name, key) == fingerprint
+
+    def filter_changed_chunks(self, vector_name: str, docs: list) -> list:
+        """Returns the chunk Documents that have not been recorded as embedded, in order."""
+        keys = [chunk_key(doc) for doc in docs]
+        stored = self.get_many(vector_name, list(set(keys)))
+        return [doc for doc, key in zip(docs, keys) if key not in stored]
+
+    def record_chunks(self, vector_name: str, docs: list):
+        """Records chunk Documents as embedded."""
+        if docs:
+            self.put_many(vector_name, {chunk_key(doc): content_fingerprint(doc.page_content) for doc in docs})
+
+
+class SQLiteFingerprintStore(FingerprintStore):
+    """A fingerprint store in a local SQLite file, for local development and single instance deployments."""
+
+    def __init__(self, path: str = "fingerprints.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {FINGERPRINT_TABLE} ("
+                               "vector_name TEXT NOT NULL, key TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+                               "updated_at REAL NOT NULL, PRIMARY KEY (vector_name, key))")
+
+    def get_many(self, vector_name, keys):
+        found = {}
+        with self._lock:
+            # keep under SQLite's default limit of 999 bound parameters
+            for start in range(0, len(keys), 900):
+                batch = keys[start:start + 900]
+                placeholders = ", ".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, fingerprint FROM {FINGERPRINT_TABLE} WHERE vector_name = ? AND key IN ({placeholders})",
+                    [vector_name, *batch])
+                found.update(rows)
+        return found
+
+    def put_many(self, vector_name, fingerprints):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {FINGERPRINT_TABLE} (vector_name, key, fingerprint, updated_at) VALUES (?, ?, ?, ?)",
+                [(vector_name, key, fingerprint, now) for key, fingerprint in fingerprints.items()])
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class FirestoreFingerprintStore(FingerprintStore):
+    """A fingerprint store in Firestore, at `{collection}/{vector_name}/fingerprints/{sha256(key)}`."""
+
+    def __init__(self, collection: str = FINGERPRINT_TABLE, client=None):
+        if client is None:
+            try:
+                from google.cloud import firestore
+            except ImportError:
+                raise ImportError("FirestoreFingerprintStore requires google-cloud-firestore installed via sunholo[gcp]")
+            client = firestore.Client()
+        self.client = client
+        self.collection = collection
+
+    def _ref(self, vector_name, key):
+        # keys contain "/" so can't be document ids themselves
+        return (self.client.collection(self.collection).document(vector_name)
+                .collection("fingerprints").document(content_fingerprint(key)))
+
+    def get_many(self, vector_name, keys):
+        refs = [self._ref(vector_name, key) for key in keys]
+        found = {}
+        for snapshot in self.client.get_all(refs):
+            if snapshot.exists:
+                data = snapshot.to_dict()
+                found[data["key"]] = data["fingerprint"]
+        return found
+
+    def put_many(self, vector_name, fingerprints):
+        items = list(fingerprints.items())
+        for start in range(0, len(items), FIRESTORE_BATCH_LIMIT):
+            batch = self.client.batch()
+            for key, fingerprint in items[start:start + FIRESTORE_BATCH_LIMIT]:
+                batch.set(self._ref(vector_name, key),
+                          {"key": key, "fingerprint": fingerprint, "updated_at": time.time()})
+            batch.commit()
+
+
+class PostgresFingerprintStore(FingerprintStore):
+    """A fingerprint store in an AlloyDB/PostgreSQL table, using the pooled connections from `get_connection_pool`."""
+
+    def __init__(self, connection_env: str = "DB_CONNECTION_STRING", table_name: str = FINGERPRINT_TABLE):
+        from .pool import get_connection_pool
+        self.pool = get_connection_pool(connection_env)
+        self.table_name = table_name
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"CREATE TABLE IF NOT EXISTS {table_name} ("
+                            "vector_name TEXT NOT NULL, key TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+                            "updated_at TIMESTAMPTZ NOT NULL DEFAULT now(), PRIMARY KEY (vector_name, key))")
+            conn.commit()
+
+    def get_many(self, vector_name, keys):
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"SELECT key, fingerprint FROM {self.table_name} WHERE vector_name = %s AND key = ANY(%s)",
+                            (vector_name, list(keys)))
+                found = dict(cur.fetchall())
+            conn.rollback()
+        return found
+
+    def put_many(self, vector_name, fingerprints):
+        from psycopg2.extras import execute_values
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                execute_values(cur,
+                               f"INSERT INTO {self.table_name} (vector_name, key, fingerprint) VALUES %s "
+                               "ON CONFLICT (vector_name, key) DO UPDATE "
+                               "SET fingerprint = EXCLUDED.fingerprint, updated_at = now()",
+                               [(vector_name, key, fingerprint) for key, fingerprint in fingerprints.items()])
+            conn.commit()
+
+
+def create_fingerprint_store(store_config: dict) -> FingerprintStore:
+    """Creates a FingerprintStore from a `fingerprint_store` config dict."""
+    store_type = store_config.get("type", "sqlite")
+    if store_type == "sqlite":
+        return SQLiteFingerprintStore(store_config.get("path", "fingerprints.sqlite"))
+    if store_type == "firestore":
+        return FirestoreFingerprintStore(store_config.get("collection", FINGERPRINT_TABLE))
+    if store_type in ("alloydb", "postgres"):
+        return PostgresFingerprintStore(store_config.get("connection_env", "DB_CONNECTION_STRING"),
+                                        table_name=store_config.get("table_name", FINGERPRINT_TABLE))
+    raise ValueError(f"Unknown fingerprint_store type: {store_type}")
+
+
+def get_fingerprint_store(vector_name: str, config=None):
+    """
+    Returns the FingerprintStore configured for a VAC, or None if it has no `fingerprint_store`.
+
+    Stores are created once per distinct config and shared by the process.
+    """
+    if config is None:
+        from ..utils import ConfigManager
+        config = ConfigManager(vector_name)
+    store_config = config.vacConfig("fingerprint_store")
+    if not store_config:
+        return None
+
+    key = tuple(sorted((k, str(v)) for k, v in store_config.items()))
+    store = _stores.get(key)
+    if store is not None:
+        return store
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            try:
+                store = create_fingerprint_store(store_config)
+            except Exception as err:
+                log.error(f"Could not create fingerprint_store for {vector_name}: {err} - content will not be deduplicated")
+                return None
+            _stores[key] = store
+        return store
+
+
+def clear_fingerprint_stores():
+    """Forgets the shared stores, e.g. after a config change in tests."""
+    with _stores_lock:
+        _stores.clear()
@@ -0,0 +1,173 @@
+#   Copyright [2024] [Holosun ApS]
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+import os
+import asyncio
+import threading
+import weakref
+from contextlib import contextmanager
+
+from ..custom_logging import log
+
+try:
+    import psycopg2
+    from psycopg2.pool import ThreadedConnectionPool
+except ImportError:
+    psycopg2 = None
+    ThreadedConnectionPool = None
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+POOL_MIN_CONNECTIONS = 1
+POOL_MAX_CONNECTIONS = 10
+# Seconds to wait for a free connection before giving up
+POOL_ACQUIRE_TIMEOUT = 30
+
+# Pools keyed by (connection_env, connection_string) so a rotated connection string gets a fresh pool.
+# asyncpg pools are bound to the event loop they were created in, so are also keyed per loop.
+_pools = {}
+_async_pools = weakref.WeakKeyDictionary()
+_pools_lock = threading.Lock()
+
+
+def _connection_string(connection_env: str) -> str:
+    if connection_env is None:
+        raise ValueError("Need to specify connection_env to connect to DB")
+    connection_string = os.getenv(connection_env, None)
+    if connection_string is None:
+        raise ValueError("No connection string")
+    return connection_string
+
+
+class SQLConnectionPool:
+    """
+    A thread-safe pool of psycopg2 connections for one connection string.
+
+    Wraps `psycopg2.pool.ThreadedConnectionPool`, but callers block for a free connection
+    instead of getting a `PoolError` when all `maxconn` connections are in use.
+    Connections that were broken while borrowed are closed rather than returned to the pool.
+
+    Example:
+    ```python
+    pool = get_connection_pool("DB_CONNECTION_STRING")
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+    ```
+    """
+
+    def __init__(self, connection_string: str, minconn: int = POOL_MIN_CONNECTIONS,
+                 maxconn: int = POOL_MAX_CONNECTIONS):
+        if ThreadedConnectionPool is None:
+            raise ImportError("Couldn't import psycopg2 - please install via 'pip install psycopg2'")
+        self.maxconn = maxconn
+        self._pool = ThreadedConnectionPool(minconn, maxconn, connection_string)
+        self._slots = threading.BoundedSemaphore(maxconn)
+
+    @contextmanager
+    def connection(self, timeout: float = POOL_ACQUIRE_TIMEOUT):
+        """Borrows a connection, rolling back any open transaction when it is returned."""
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No free database connection after {timeout} seconds")
+        conn = None
+        discard = False
+        try:
+            conn = self._pool.getconn()
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            discard = True
+            raise
+        except Exception:
+            try:
+                if not conn.closed:
+                    conn.rollback()
+            except Exception:
+                discard = True
+            raise
+        finally:
+            if conn is not None:
+                self._pool.putconn(conn, close=discard or bool(conn.closed))
+            self._slots.release()
+
+    def close(self):
+        self._pool.closeall()
+
+
+def get_connection_pool(connection_env: str = 'DB_CONNECTION_STRING',
+                        minconn: int = POOL_MIN_CONNECTIONS,
+                        maxconn: int = POOL_MAX_CONNECTIONS) -> SQLConnectionPool:
+    """
+    Returns the process-wide `SQLConnectionPool` for the database in `connection_env`.
+
+    The pool is created on first use; the size arguments only apply at creation.
+    """
+    key = (connection_env, _connection_string(connection_env))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            log.info(f"Creating database connection pool for {connection_env} (max {maxconn})")
+            pool = SQLConnectionPool(key[1], minconn=minconn, maxconn=maxconn)
+            _pools[key] = pool
+        return pool
+
+
+async def get_async_connection_pool(connection_env: str = 'DB_CONNECTION_STRING',
+                                    minconn: int = POOL_MIN_CONNECTIONS,
+                                    maxconn: int = POOL_MAX_CONNECTIONS):
+    """
+    Returns an `asyncpg.Pool` for the database in `connection_env`, shared within the running event loop.
+
+    asyncpg caches prepared statements per connection, so repeated queries skip re-parsing.
+    The connection string must be a `postgresql://` URI.
+    """
+    if asyncpg is None:
+        raise ImportError("Couldn't import asyncpg - please install via 'pip install asyncpg'")
+
+    key = (connection_env, _connection_string(connection_env))
+    loop = asyncio.get_running_loop()
+    with _pools_lock:
+        pools = _async_pools.setdefault(loop, {})
+        pool = pools.get(key)
+        if pool is None:
+            # store the creation task so concurrent callers share one pool
+            log.info(f"Creating async database connection pool for {connection_env} (max {maxconn})")
+            pool = loop.create_task(asyncpg.create_pool(key[1], min_size=minconn, max_size=maxconn))
+            pools[key] = pool
+    if isinstance(pool, asyncio.Task):
+        try:
+            created = await asyncio.shield(pool)
+        except Exception:
+            with _pools_lock:
+                if pools.get(key) is pool:
+                    del pools[key]
+            raise
+        with _pools_lock:
+            if pools.get(key) is pool:
+                pools[key] = created
+        return created
+    return pool
+
+
+def close_connection_pools():
+    """Closes all sync connection pools, e.g. at shutdown or after a fork."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        try:
+            pool.close()
+        except Exception as err:
+            log.warning(f"Could not close database connection pool: {str(err)}")
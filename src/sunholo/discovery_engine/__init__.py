@@ -1,2 +1,8 @@
-from .discovery_engine_client import DiscoveryEngineClient
-from .get_ai_search_chunks import get_all_chunks, async_get_all_chunks
+# Submodules are imported on first attribute access, see sunholo/_lazy.py
+from .._lazy import lazy_attributes
+
+__getattr__, __dir__ = lazy_attributes(__name__, globals(), {
+    "DiscoveryEngineClient": ".discovery_engine_client:DiscoveryEngineClient",
+    "get_all_chunks": ".get_ai_search_chunks:get_all_chunks",
+    "async_get_all_chunks": ".get_ai_search_chunks:async_get_all_chunks",
+})
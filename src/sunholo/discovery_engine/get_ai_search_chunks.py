@@ -3,30 +3,61 @@ from ..utils.gcp_project  import get_gcp_project
 from ..custom_logging import log
 from .discovery_engine_client import DiscoveryEngineClient
 from ..components import load_memories
+import asyncio
+import threading
+import time
 import traceback
+import weakref
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
-def get_all_chunks(question:str, config:ConfigManager, filter_str=None):
+# Seconds to wait for a single Vertex AI Search memory before dropping its results
+DEFAULT_CHUNK_TIMEOUT = 30
+
+# Shared clients keyed by (project_id, data_store_id, location).
+# Async clients are bound to the event loop they were created in, so are also keyed per loop.
+_clients = {}
+_async_clients = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+def get_discovery_engine_client(data_store_id, project_id, location="eu"):
     """
-    Look through a config memory key and find all Vertex AI Search retrievers, call them and return a joined string of chunks
+    Returns a DiscoveryEngineClient shared across calls for the same (project, data store, location).
 
-        args: question - question to search similarity for
-        config: A ConfigManager object
-        filter_str: A filter that will restrict ai search via its metadata. See https://cloud.google.com/generative-ai-app-builder/docs/filter-search-metadata
+    When called inside a running event loop the client (with its async search client) is
+    shared per loop, otherwise it is shared process-wide.
+    """
+    key = (project_id, data_store_id, location)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
 
-        returns: a big string of chunks
+    with _clients_lock:
+        cache = _clients if loop is None else _async_clients.setdefault(loop, {})
+        client = cache.get(key)
+        if client is None:
+            client = DiscoveryEngineClient(data_store_id, project_id=project_id, location=location)
+            cache[key] = client
+        return client
+
+
+def _search_memories(config:ConfigManager):
+    """
+    Returns the search settings for each Vertex AI Search memory in a config, in config order.
     """
     memories = load_memories(config=config)
-    chunks = []
-
     if not memories:
         return None
 
-    vector_name = config.vector_name
+    searches = []
+    gcp_config = config.vacConfig("gcp_config") or {}
     for memory in memories:
         for key, value in memory.items():  # Now iterate over the dictionary
             log.info(f"Found memory {key}")
             vectorstore = value.get('vectorstore')
             if vectorstore == "discovery_engine" or vectorstore == "vertex_ai_search":
+                vector_name = config.vector_name
                 if value.get('read_only'):
                     new_vector_name = value.get('vector_name')
                     if not new_vector_name:
@@ -34,91 +65,130 @@ def get_all_chunks(question:str, config:ConfigManager, filter_str=None):
                         continue
                     else:
                         vector_name = new_vector_name
-                
-                num_chunks = value.get('num_chunks') or 3
-                gcp_config = config.vacConfig("gcp_config")
-                project_id = gcp_config.get('project_id')
-                serving_config = value.get('serving_config')
-
-                chunk = get_chunks(question, vector_name, num_chunks, filter_str=filter_str, project_id=project_id, serving_config=serving_config)
-                if chunk:
-                    chunks.append(chunk)
+
+                searches.append({
+                    "memory": key,
+                    "vector_name": vector_name,
+                    "num_chunks": value.get('num_chunks') or 3,
+                    "project_id": value.get('project_id') or gcp_config.get('project_id'),
+                    "serving_config": value.get('serving_config'),
+                    "timeout": value.get('timeout'),
+                })
+    return searches
+
+
+def get_all_chunks(question:str, config:ConfigManager, filter_str=None, timeout:float=DEFAULT_CHUNK_TIMEOUT):
+    """
+    Look through a config memory key and find all Vertex AI Search retrievers, call them and return a joined string of chunks
+
+    The memories are searched concurrently in a thread pool, so latency is that of the slowest
+    store rather than the sum. A memory that does not answer within its timeout is dropped.
+    Results are joined in config order.
+
+        args: question - question to search similarity for
+        config: A ConfigManager object
+        filter_str: A filter that will restrict ai search via its metadata. See https://cloud.google.com/generative-ai-app-builder/docs/filter-search-metadata
+        timeout: Seconds to wait per memory, unless the memory sets its own `timeout`
+
+        returns: a big string of chunks
+    """
+    searches = _search_memories(config)
+    if not searches:
+        return None
+
+    start = time.monotonic()
+    pool = ThreadPoolExecutor(max_workers=len(searches), thread_name_prefix="ai-search-chunks")
+    try:
+        futures = [pool.submit(get_chunks, question, search["vector_name"], search["num_chunks"],
+                               filter_str=filter_str,
+                               project_id=search["project_id"],
+                               serving_config=search["serving_config"])
+                   for search in searches]
+        chunks = []
+        for search, future in zip(searches, futures):
+            try:
+                # timeouts count from when all searches started, not from the previous result
+                remaining = start + (search["timeout"] or timeout) - time.monotonic()
+                chunk = future.result(timeout=max(remaining, 0))
+            except FutureTimeoutError:
+                log.warning(f"Timed out fetching chunks for memory {search['memory']} ({search['vector_name']}) - skipping")
+                continue
+            if chunk:
+                chunks.append(chunk)
+    finally:
+        # don't wait for memories that timed out
+        pool.shutdown(wait=False)
+
     if chunks:
         return "\n".join(chunks)
 
-    log.warning(f"No chunks found for {vector_name}")
+    log.warning(f"No chunks found for {config.vector_name}")
     return None
 
 def get_chunks(question, vector_name, num_chunks, filter_str=None, project_id=None, serving_config=None):
     if serving_config is None:
         serving_config = "default_serving_config"
-    de = DiscoveryEngineClient(vector_name, project_id=project_id or get_gcp_project(include_config=True))
+    de = get_discovery_engine_client(vector_name, project_id=project_id or get_gcp_project(include_config=True))
     try:
         if filter_str:
-            return de.search_with_filters(query=question, 
+            return de.search_with_filters(query=question,
                                          filter_str=filter_str,
-                                         num_previous_chunks=num_chunks, 
+                                         num_previous_chunks=num_chunks,
                                          num_next_chunks=num_chunks)
         else:
             return de.get_chunks(question, num_previous_chunks=num_chunks, num_next_chunks=num_chunks, serving_config=serving_config)
     except Exception as err:
         log.error(f"No discovery engine chunks found: {str(err)} {traceback.format_exc()}")
-    
 
 
-async def async_get_all_chunks(question:str, config:ConfigManager, filter_str=None):
+
+async def async_get_all_chunks(question:str, config:ConfigManager, filter_str=None, timeout:float=DEFAULT_CHUNK_TIMEOUT):
     """
     Look through a config memory key and find all Vertex AI Search retrievers, call them and return a joined string of chunks
 
+    The memories are searched concurrently with `asyncio.gather`, so latency is that of the slowest
+    store rather than the sum. A memory that does not answer within its timeout is dropped.
+    Results are joined in config order.
+
         args: question - question to search similarity for
         config: A ConfigManager object
         filter_str: A filter that will restrict ai search via its metadata. See https://cloud.google.com/generative-ai-app-builder/docs/filter-search-metadata
+        timeout: Seconds to wait per memory, unless the memory sets its own `timeout`
 
         returns: a big string of chunks
     """
-    memories = load_memories(config=config)
-    chunks = []
-
-    if not memories:
+    searches = _search_memories(config)
+    if not searches:
         return None
 
-    vector_name = config.vector_name
-    for memory in memories:
-        for key, value in memory.items():  # Now iterate over the dictionary
-            log.info(f"Found memory {key}")
-            vectorstore = value.get('vectorstore')
-            if vectorstore == "discovery_engine" or vectorstore == "vertex_ai_search":
-                if value.get('read_only'):
-                    new_vector_name = value.get('vector_name')
-                    if not new_vector_name:
-                        log.warning("read_only specified but no new vector_name to read from")
-                        continue
-                    else:
-                        vector_name = new_vector_name
+    async def search_memory(search):
+        try:
+            return await asyncio.wait_for(
+                async_get_chunks(question,
+                                 vector_name=search["vector_name"],
+                                 num_chunks=search["num_chunks"],
+                                 filter_str=filter_str,
+                                 project_id=search["project_id"] or get_gcp_project(include_config=True)),
+                timeout=search["timeout"] or timeout)
+        except asyncio.TimeoutError:
+            log.warning(f"Timed out fetching chunks for memory {search['memory']} ({search['vector_name']}) - skipping")
+            return None
+
+    results = await asyncio.gather(*(search_memory(search) for search in searches))
+    chunks = [chunk for chunk in results if chunk]
 
-                project_id = value.get('project_id') or get_gcp_project(include_config=True)
-                num_chunks = value.get('num_chunks') or 3
-
-                chunk = await async_get_chunks(question, 
-                                               vector_name=vector_name, 
-                                               num_chunks=num_chunks, 
-                                               filter_str=filter_str, 
-                                               project_id=project_id)
-
-                if chunk:
-                    chunks.append(chunk)
     if chunks:
         return "\n".join(chunks)
 
-    log.warning(f"No chunks found for {vector_name}")
+    log.warning(f"No chunks found for {config.vector_name}")
     return None
 
 async def async_get_chunks(question, vector_name, num_chunks, filter_str, project_id=None):
-    de = DiscoveryEngineClient(vector_name, project_id=project_id)
+    de = get_discovery_engine_client(vector_name, project_id=project_id)
     try:
-        return await de.async_search_with_filters(query=question, 
+        return await de.async_search_with_filters(query=question,
                                             filter_str=filter_str,
-                                            num_previous_chunks=num_chunks, 
+                                            num_previous_chunks=num_chunks,
                                             num_next_chunks=num_chunks)
     except Exception as err:
-        log.error(f"No discovery engine chunks found: {str(err)} {traceback.format_exc()}")
\ No newline at end of file
+        log.error(f"No discovery engine chunks found: {str(err)} {traceback.format_exc()}")
@@ -1 +1 @@
-from .embed_chunk import embed_pubsub_chunk
+from .embed_chunk import embed_pubsub_chunk, embed_pubsub_chunks, embed_pull_subscription
@@ -22,22 +22,22 @@ try:
 except ImportError:
     Document = None
     
-from ..components import get_embeddings, pick_vectorstore, load_memories, pick_embedding
+from ..components import load_memories
+from ..components.registry import get_cached_embeddings, get_cached_embedding, get_cached_vectorstore
 from ..custom_logging import log
 from ..database.uuid import generate_uuid_from_object_id
+from ..database.fingerprints import get_fingerprint_store
 from ..utils import ConfigManager
+from ..utils.gcp_project import get_gcp_project
 from .embed_metadata import audit_metadata
 
-def embed_pubsub_chunk(data: dict):
-    """Triggered from a message on a Cloud Pub/Sub topic "embed_chunk" topic
-    Will only attempt to send one chunk to vectorstore.
-    Args:
-         data JSON
+def _decode_chunk_message(data: dict):
     """
+    Decodes a Pub/Sub push message into the chunk Document to embed.
 
-    if Document is None:
-        raise ImportError("Embeddin requires langchain installed via sunholo[pipeline]")
-    
+    Returns:
+        (Document, doc_id, vector_name) or a str explaining why the chunk was skipped.
+    """
     message_data = base64.b64decode(data['message']['data']).decode('utf-8')
     messageId = data['message'].get('messageId')
     publishTime = data['message'].get('publishTime')
@@ -70,10 +70,7 @@ def embed_pubsub_chunk(data: dict):
         msg = f"FATAL: No vector name was found within metadata: {metadata}"
         log.error(msg)
         return msg
-    
-    config = ConfigManager(vector_name)
-    log.info(f"{config=}")
-    
+
     log.info(f"Embedding: {vector_name} page_content: {page_content[:30]}...[{len(page_content)}] - {metadata}")
 
     metadata = audit_metadata(metadata, chunk_length=len(page_content))
@@ -92,54 +89,117 @@ def embed_pubsub_chunk(data: dict):
     else:
         doc_id = metadata["doc_id"]
 
-    doc = Document(page_content=page_content, metadata=metadata)
+    return Document(page_content=page_content, metadata=metadata), doc_id, vector_name
 
-    # init embedding and vector store
-    embeddings = get_embeddings(config=config)
 
+def _writable_vectorstores(config: ConfigManager):
+    """Yields (memory_key, memory_value) for each memory with a vectorstore that is not read only."""
     memories = load_memories(config=config)
-    vectorstore_list = []
     for memory in memories:  # Iterate over the list
         for key, value in memory.items(): 
             log.info(f"Found memory {key}")
-            vectorstore = value.get('vectorstore')
-            if vectorstore:
-                # check if vectorstore specific embedding is available
-                embed_llm = value.get('llm')
-                if embed_llm:
-                    embeddings = pick_embedding(embed_llm, config=config)
-                # check if read only
-                read_only = value.get('read_only')
-                if read_only:
-                    continue
-                # read from a different vector_name
-                vector_name_other = value.get('vector_name')
-                if vector_name_other:
-                    log.warning(f"Using different vector_name for vectorstore: {vector_name_other} overriding {vector_name}")
-                    vector_name = vector_name_other
-                
-                # dynamic vectorstore names (for per user_id stores)
-                if value.get('from_metadata_id'):
-                    the_id = value.get('from_metadata_id')
-                    log.info(f"Lookup vectorstore vector_name from id: {the_id}")
-
-                    if the_id not in metadata:
-                        log.warning("Could not find vectorstore from_metadata_id {the_id} in metadata - skipping")
-                        continue
-                    else:
-                        match_id = metadata.get(the_id)
-                        if match_id:
-                            vector_name = match_id
-                        else:
-                            log.warning("Could not find any value for vectorstore from_metadata_id: {the_id} - skipping")
-                            continue
-
-                vectorstore_obj = pick_vectorstore(vectorstore, vector_name=vector_name, embeddings=embeddings)
-                if vectorstore_obj:
-                    vs_retriever = vectorstore_obj.as_retriever(search_kwargs=dict(k=3))
-                    vectorstore_list.append(vs_retriever)
-                else:
-                    log.warning(f"No vectorstore added for {vectorstore}")
+            if not value.get('vectorstore'):
+                continue
+            # check if read only
+            if value.get('read_only'):
+                continue
+            yield key, value
+
+
+def _target_vector_name(value: dict, vector_name: str, metadata: dict):
+    """Returns the vector_name a memory writes to for a document, or None to skip it."""
+    # read from a different vector_name
+    vector_name_other = value.get('vector_name')
+    if vector_name_other:
+        log.warning(f"Using different vector_name for vectorstore: {vector_name_other} overriding {vector_name}")
+        vector_name = vector_name_other
+    
+    # dynamic vectorstore names (for per user_id stores)
+    if value.get('from_metadata_id'):
+        the_id = value.get('from_metadata_id')
+        log.info(f"Lookup vectorstore vector_name from id: {the_id}")
+
+        if the_id not in metadata:
+            log.warning(f"Could not find vectorstore from_metadata_id {the_id} in metadata - skipping")
+            return None
+        match_id = metadata.get(the_id)
+        if not match_id:
+            log.warning(f"Could not find any value for vectorstore from_metadata_id: {the_id} - skipping")
+            return None
+        vector_name = match_id
+
+    return vector_name
+
+
+def _fingerprint_store(vector_name: str, config: ConfigManager):
+    try:
+        return get_fingerprint_store(vector_name, config=config)
+    except Exception as err:
+        log.warning(f"Could not load fingerprint_store for {vector_name}: {err}")
+        return None
+
+
+def _changed_chunks(fingerprint_store, vector_name: str, docs: list):
+    """Returns the docs not yet embedded for vector_name, or all of them if the store can't be read."""
+    try:
+        return fingerprint_store.filter_changed_chunks(vector_name, docs)
+    except Exception as err:
+        log.warning(f"Could not check chunk fingerprints for {vector_name}: {err}")
+        return docs
+
+
+def _record_chunks(fingerprint_store, vector_name: str, docs: list):
+    try:
+        fingerprint_store.record_chunks(vector_name, docs)
+    except Exception as err:
+        log.warning(f"Could not record chunk fingerprints for {vector_name}: {err}")
+
+
+def embed_pubsub_chunk(data: dict):
+    """Triggered from a message on a Cloud Pub/Sub topic "embed_chunk" topic
+    Will only attempt to send one chunk to vectorstore.
+    Args:
+         data JSON
+    """
+
+    if Document is None:
+        raise ImportError("Embeddin requires langchain installed via sunholo[pipeline]")
+    
+    decoded = _decode_chunk_message(data)
+    if isinstance(decoded, str):
+        return decoded
+    doc, doc_id, vector_name = decoded
+    metadata = doc.metadata
+
+    config = ConfigManager(vector_name)
+    log.info(f"{config=}")
+
+    fingerprint_store = _fingerprint_store(vector_name, config)
+    if fingerprint_store and not _changed_chunks(fingerprint_store, vector_name, [doc]):
+        log.info(f"Chunk for {metadata.get('source')} is unchanged since it was embedded for {vector_name} - skipping")
+        return "Unchanged content"
+
+    # init embedding and vector store
+    embeddings = get_cached_embeddings(config=config)
+
+    vectorstore_list = []
+    for key, value in _writable_vectorstores(config):
+        vectorstore = value.get('vectorstore')
+        # check if vectorstore specific embedding is available
+        embed_llm = value.get('llm')
+        if embed_llm:
+            embeddings = get_cached_embedding(embed_llm, config=config)
+
+        target_vector_name = _target_vector_name(value, vector_name, metadata)
+        if target_vector_name is None:
+            continue
+
+        vectorstore_obj = get_cached_vectorstore(vectorstore, vector_name=target_vector_name, embeddings=embeddings)
+        if vectorstore_obj:
+            vs_retriever = vectorstore_obj.as_retriever(search_kwargs=dict(k=3))
+            vectorstore_list.append(vs_retriever)
+        else:
+            log.warning(f"No vectorstore added for {vectorstore}")
 
     # can have multiple vectorstores per embed
     metadata_list = []
@@ -155,4 +215,151 @@ def embed_pubsub_chunk(data: dict):
             error_message = traceback.format_exc()
             log.error(f"Could not add document for {vector_name} to {vector_store} for {metadata}: {str(err)} traceback: {error_message}")
 
+    if fingerprint_store and vectorstore_list and len(metadata_list) == len(vectorstore_list):
+        _record_chunks(fingerprint_store, vector_name, [doc])
+
     return metadata_list
+
+
+def embed_pubsub_chunks(data_list: list[dict]):
+    """
+    Embeds a batch of Pub/Sub chunk messages, e.g. from a pull subscription.
+
+    Messages are grouped by vector_name and then by target vectorstore, so each store receives
+    one bulk `add_documents` call - and therefore one batched embedding request - per batch,
+    and configs, embeddings and vectorstores are built once per group rather than per chunk.
+    If the VAC has a `fingerprint_store`, chunks that were already embedded are skipped.
+
+    Args:
+        data_list: Messages in the same format as `embed_pubsub_chunk` receives.
+
+    Returns:
+        dict: `metadata` for every document written, `skipped` reasons and `errors` keyed by
+            message index, and `failed_indexes` for messages that could not be written
+            to at least one vectorstore (these should be retried).
+    """
+    if Document is None:
+        raise ImportError("Embeddin requires langchain installed via sunholo[pipeline]")
+
+    result = {"metadata": [], "skipped": {}, "errors": {}, "failed_indexes": set()}
+
+    # vector_name -> [(message index, doc, doc_id)]
+    by_vector_name = {}
+    for i, data in enumerate(data_list):
+        try:
+            decoded = _decode_chunk_message(data)
+        except Exception as err:
+            result["errors"][i] = str(err)
+            result["failed_indexes"].add(i)
+            continue
+        if isinstance(decoded, str):
+            result["skipped"][i] = decoded
+            continue
+        doc, doc_id, vector_name = decoded
+        by_vector_name.setdefault(vector_name, []).append((i, doc, doc_id))
+
+    for vector_name, items in by_vector_name.items():
+        config = ConfigManager(vector_name)
+
+        fingerprint_store = _fingerprint_store(vector_name, config)
+        if fingerprint_store:
+            changed = {id(doc) for doc in _changed_chunks(fingerprint_store, vector_name, [doc for _, doc, _ in items])}
+            for i, doc, _ in items:
+                if id(doc) not in changed:
+                    result["skipped"][i] = "Unchanged content"
+            items = [item for item in items if id(item[1]) in changed]
+            if not items:
+                continue
+
+        default_embeddings = get_cached_embeddings(config=config)
+
+        # (memory key, target vector_name) -> [(message index, doc, doc_id)]
+        targets = {}
+        memories = {}
+        for key, value in _writable_vectorstores(config):
+            memories[key] = value
+            for item in items:
+                target_vector_name = _target_vector_name(value, vector_name, item[1].metadata)
+                if target_vector_name is not None:
+                    targets.setdefault((key, target_vector_name), []).append(item)
+
+        for (key, target_vector_name), target_items in targets.items():
+            value = memories[key]
+            indexes = [i for i, _, _ in target_items]
+            try:
+                embed_llm = value.get('llm')
+                embeddings = get_cached_embedding(embed_llm, config=config) if embed_llm else default_embeddings
+                vectorstore_obj = get_cached_vectorstore(value.get('vectorstore'),
+                                                   vector_name=target_vector_name,
+                                                   embeddings=embeddings)
+                if not vectorstore_obj:
+                    log.warning(f"No vectorstore added for {value.get('vectorstore')}")
+                    continue
+
+                docs = [doc for _, doc, _ in target_items]
+                vectorstore_obj.add_documents(docs, ids=[doc_id for _, _, doc_id in target_items])
+                log.info(f"Added {len(docs)} docs for {vector_name} to {key} ({target_vector_name})")
+                result["metadata"].extend(doc.metadata for doc in docs)
+            except Exception as err:
+                error_message = traceback.format_exc()
+                log.error(f"Could not add {len(target_items)} documents for {vector_name} to {key}: {str(err)} traceback: {error_message}")
+                for i in indexes:
+                    result["errors"][i] = str(err)
+                result["failed_indexes"].update(indexes)
+
+        if fingerprint_store:
+            written = {i for target_items in targets.values() for i, _, _ in target_items}
+            _record_chunks(fingerprint_store, vector_name,
+                           [doc for i, doc, _ in items if i in written and i not in result["failed_indexes"]])
+
+    return result
+
+
+def embed_pull_subscription(subscription: str, max_messages: int = 500, project_id: str = None):
+    """
+    Drains up to `max_messages` chunk messages from a pull subscription and embeds them as one batch.
+
+    Messages that were embedded or skipped are acknowledged; messages that failed to write are
+    left unacknowledged so Pub/Sub redelivers them.
+
+    Args:
+        subscription: The subscription name, or full path `projects/{project}/subscriptions/{name}`.
+        max_messages: Maximum messages to pull in one batch.
+        project_id: The project, if `subscription` is not a full path.
+
+    Returns:
+        dict: The result from `embed_pubsub_chunks`, plus the number of messages `pulled`.
+    """
+    try:
+        from google.cloud import pubsub_v1
+    except ImportError:
+        raise ImportError("Pull subscriptions require google-cloud-pubsub installed via sunholo[gcp]")
+
+    if not subscription.startswith("projects/"):
+        project_id = project_id or get_gcp_project()
+        subscription = f"projects/{project_id}/subscriptions/{subscription}"
+
+    with pubsub_v1.SubscriberClient() as subscriber:
+        response = subscriber.pull(request={"subscription": subscription, "max_messages": max_messages})
+        received = list(response.received_messages)
+        if not received:
+            return {"pulled": 0, "metadata": [], "skipped": {}, "errors": {}, "failed_indexes": set()}
+
+        data_list = [{
+            "message": {
+                "data": base64.b64encode(msg.message.data).decode('utf-8'),
+                "messageId": msg.message.message_id,
+                "publishTime": str(msg.message.publish_time),
+            }
+        } for msg in received]
+
+        result = embed_pubsub_chunks(data_list)
+
+        ack_ids = [msg.ack_id for i, msg in enumerate(received) if i not in result["failed_indexes"]]
+        if ack_ids:
+            subscriber.acknowledge(request={"subscription": subscription, "ack_ids": ack_ids})
+
+    log.info(f"Embedded batch of {len(received)} messages from {subscription} - "
+             f"acked: {len(ack_ids)} failed: {len(result['failed_indexes'])} skipped: {len(result['skipped'])}")
+    result["pulled"] = len(received)
+    return result
@@ -1,5 +1,12 @@
-from .process_funcs_cls import GenAIFunctionProcessor
-from .safety import genai_safety
-from .init import init_genai
-from .file_handling import download_gcs_upload_genai, construct_file_content
-from .genaiv2 import GoogleAI, GoogleAIConfig
+# Submodules are imported on first attribute access, see sunholo/_lazy.py
+from .._lazy import lazy_attributes
+
+__getattr__, __dir__ = lazy_attributes(__name__, globals(), {
+    "GenAIFunctionProcessor": ".process_funcs_cls:GenAIFunctionProcessor",
+    "genai_safety": ".safety:genai_safety",
+    "init_genai": ".init:init_genai",
+    "download_gcs_upload_genai": ".file_handling:download_gcs_upload_genai",
+    "construct_file_content": ".file_handling:construct_file_content",
+    "GoogleAI": ".genaiv2:GoogleAI",
+    "GoogleAIConfig": ".genaiv2:GoogleAIConfig",
+})
@@ -1,11 +1,15 @@
 from ..custom_logging import log
-from ..gcs import get_bytes_from_gcs
 
+from collections import OrderedDict
 from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 import mimetypes
 import uuid
 import asyncio
 import tempfile
+import shutil
+import threading
+import time
 import re
 import os
 import traceback
@@ -18,6 +22,29 @@ except ImportError:
     genai = None
     genaiv2 = None
 
+try:
+    from google.cloud import storage
+except ImportError:
+    storage = None
+
+# Gemini deletes uploaded files after 48 hours, so known handles are reused for less than that
+FILE_HANDLE_TTL = 24 * 3600
+# Most file handles kept, least recently used are dropped first
+FILE_HANDLE_CACHE_SIZE = 1024
+# Concurrent GCS metadata lookups and genai file existence checks, run in their own thread pool
+# so they aren't limited by (or starve) the event loop's default executor
+PROBE_CONCURRENCY = 8
+# Concurrent downloads and uploads per call
+UPLOAD_CONCURRENCY = 5
+# Files bigger than this can't be used directly by the model
+MAX_UPLOAD_BYTES = 19434343
+
+# (gs_uri, generation, genai_lib) -> (expires_at, content items), in least recently used order
+_file_handle_cache = OrderedDict()
+_file_handle_cache_lock = threading.Lock()
+_clients = {}
+_clients_lock = threading.Lock()
+
 DOCUMENT_MIMES = [
     'application/pdf',
     'application/x-javascript',
@@ -107,6 +134,107 @@ def sanitize_file(filename):
     # Limit the length
     return sanitized_name[:40]
 
+def _shared_client(name, factory):
+    client = _clients.get(name)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _clients[name] = factory()
+    return client
+
+def get_genai_client():
+    """Returns a `google.genai` Client shared by the process, rather than one per file."""
+    if genaiv2 is None:
+        raise ImportError("google-genai is required - install via `pip install sunholo[gcp]`")
+    return _shared_client("genai", genaiv2.Client)
+
+def _probe_executor():
+    return _shared_client("probe_executor", lambda: ThreadPoolExecutor(max_workers=PROBE_CONCURRENCY, 
+                                                                       thread_name_prefix="genai-file-probe"))
+
+async def _probe(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(_probe_executor(), partial(func, *args))
+
+def _get_storage_client():
+    if storage is None:
+        raise ImportError("google storage pip required - install via `pip install sunholo[gcp]`")
+    return _shared_client("storage", storage.Client)
+
+def _gcs_blob(gs_uri):
+    bucket_name, blob_name = gs_uri[5:].split('/', 1)
+    return _get_storage_client().bucket(bucket_name).blob(blob_name)
+
+def get_gcs_object_info(gs_uri):
+    """
+    Returns (generation, size) of a GCS object, or (None, None) if it can't be read.
+
+    The generation changes whenever the object is overwritten, so identifies its content.
+    """
+    try:
+        blob = _gcs_blob(gs_uri)
+        blob.reload()
+        return blob.generation, blob.size
+    except Exception as err:
+        log.warning(f"Could not read GCS metadata for {gs_uri}: {str(err)}")
+        return None, None
+
+def download_gcs_to_file(gs_uri, file_path):
+    """Streams a GCS object to a local file without holding it all in memory."""
+    _gcs_blob(gs_uri).download_to_filename(file_path)
+
+def clear_file_handle_cache():
+    with _file_handle_cache_lock:
+        _file_handle_cache.clear()
+
+def _cached_file_content(gs_uri, generation, genai_lib):
+    if generation is None:
+        return None
+    key = (gs_uri, generation, genai_lib)
+    with _file_handle_cache_lock:
+        cached = _file_handle_cache.get(key)
+        if cached is None:
+            return None
+        expires_at, items = cached
+        if expires_at < time.monotonic():
+            del _file_handle_cache[key]
+            return None
+        _file_handle_cache.move_to_end(key)
+        return items
+
+def _cache_file_content(gs_uri, generation, genai_lib, items):
+    if generation is None:
+        return
+    now = time.monotonic()
+    with _file_handle_cache_lock:
+        # drop expired handles, and those of earlier generations of an overwritten object
+        stale = [key for key, (expires_at, _) in _file_handle_cache.items()
+                 if expires_at < now or (key[0] == gs_uri and key[2] == genai_lib and key[1] != generation)]
+        for key in stale:
+            del _file_handle_cache[key]
+        _file_handle_cache[(gs_uri, generation, genai_lib)] = (now + FILE_HANDLE_TTL, items)
+        _file_handle_cache.move_to_end((gs_uri, generation, genai_lib))
+        while len(_file_handle_cache) > FILE_HANDLE_CACHE_SIZE:
+            _file_handle_cache.popitem(last=False)
+
+def _get_existing_file(unique_name, genai_lib):
+    """Returns the uploaded genai file called unique_name, or None."""
+    try:
+        if not genai_lib:
+            return genai.get_file(unique_name)
+        return get_genai_client().files.get(name=unique_name)
+    except Exception as e:
+        log.info(f"Not found checking genai.get_file: '{unique_name}' {str(e)}")
+        return None
+
+def _upload_result_to_content(result, genai_lib):
+    """Returns (content items, whether the upload succeeded) for a download_gcs_upload_genai result."""
+    # Normalize the result structure based on genai_lib
+    if genai_lib and isinstance(result, list):
+        return [result[0], {"role": "user", "parts": [{"text": result[1]}]}], True
+    uploaded = isinstance(result, dict) and any("file_data" in part for part in result.get("parts", []))
+    return [result], uploaded
+
 async def construct_file_content(gs_list, 
                                  bucket:str, 
                                  genai_lib=False, 
@@ -117,7 +245,7 @@ async def construct_file_content(gs_list,
     - gs_list: a list of dicts representing files in a bucket
     - bucket: The bucket the files are in
     - genai_lib: whether its using the genai SDK
-    - timeout: timeout in seconds for the gather operation
+    - timeout: timeout in seconds for each file, files that time out are reported in the returned content
     - genai_lib_vertex: bool whether to use the vertex version of the genai library, using default credentials
     """
     
@@ -141,7 +269,6 @@ async def construct_file_content(gs_list,
     # export GOOGLE_CLOUD_LOCATION='us-central1'
     content = []
     if genai_lib_vertex or os.getenv("GOOGLE_GENAI_USE_VERTEXAI"):
-        client = genaiv2.Client(vertexai=True)
         # we can just use the gs:// uri directly
         for file_info in file_list:
             img_url = f"gs://{bucket}/{file_info['storagePath']}"
@@ -159,9 +286,9 @@ async def construct_file_content(gs_list,
         return content       
 
     
-    # Loop through the valid files and process them
-    tasks = []
-    for file_info in file_list:
+    upload_semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+
+    async def process_file(file_info):
         img_url = f"gs://{bucket}/{file_info['storagePath']}"
         display_url = file_info.get('url')
         mime_type = file_info['contentType']
@@ -170,49 +297,48 @@ async def construct_file_content(gs_list,
 
         display_name = file_info['name']
         log.info(f"Processing {unique_name=} {display_name=}")
-        
-        try:
-            if not genai_lib:
-                myfile = genai.get_file(unique_name)
-            else:
-                client = genaiv2.Client()
-                myfile = client.files.get(name=unique_name)
-            content.append(myfile)
-            content.append(f"You have been given the ability to work with file {display_name=} with {mime_type=} {display_url=}")
+
+        generation, size = await _probe(get_gcs_object_info, img_url)
+        cached = _cached_file_content(img_url, generation, genai_lib)
+        if cached is not None:
+            log.info(f"Reusing uploaded file for {img_url} generation {generation}")
+            return cached
+
+        myfile = await _probe(_get_existing_file, unique_name, genai_lib)
+        if myfile is not None:
             log.info(f"Found existing genai.get_file {unique_name=}")
-        except Exception as e:
-            log.info(f"Not found checking genai.get_file: '{unique_name}' {str(e)}")
-            tasks.append(
-                download_gcs_upload_genai(img_url, 
-                                         mime_type=mime_type, 
-                                         name=unique_name, 
-                                         display_url=display_url, 
-                                         display_name=display_name,
-                                         genai_lib=genai_lib)
-                                        )
-
-    # Process files with timeout
-    if tasks:
-        try:
-            # Add timeout to prevent hanging
-            task_results = await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout=timeout)
-            
-            # Process results, handle any exceptions
-            for result in task_results:
-                if isinstance(result, Exception):
-                    log.error(f"Task failed with error: {str(result)}")
-                    # Add error message to content
-                    content.append({"role": "user", "parts": [{"text": f"Error processing file: {str(result)}"}]})
-                else:
-                    # Normalize the result structure based on genai_lib
-                    if genai_lib and isinstance(result, list):
-                        content.append(result[0])  # The file object
-                        content.append({"role": "user", "parts": [{"text": result[1]}]})  # The message
-                    else:
-                        content.append(result)
-        except asyncio.TimeoutError:
-            log.error(f"Timeout occurred after {timeout} seconds while processing files")
-            content.append({"role": "user", "parts": [{"text": f"Some files could not be processed within the time limit ({timeout} seconds)"}]})
+            items = [myfile, f"You have been given the ability to work with file {display_name=} with {mime_type=} {display_url=}"]
+            _cache_file_content(img_url, generation, genai_lib, items)
+            return items
+
+        async with upload_semaphore:
+            result = await download_gcs_upload_genai(img_url, 
+                                                     mime_type=mime_type, 
+                                                     name=unique_name, 
+                                                     display_url=display_url, 
+                                                     display_name=display_name,
+                                                     genai_lib=genai_lib,
+                                                     size=size)
+        items, uploaded = _upload_result_to_content(result, genai_lib)
+        if uploaded:
+            _cache_file_content(img_url, generation, genai_lib, items)
+        return items
+
+    # Each file gets its own timeout, so slow files don't lose the ones that finished
+    results = await asyncio.gather(*[asyncio.wait_for(process_file(file_info), timeout=timeout) 
+                                     for file_info in file_list], 
+                                   return_exceptions=True)
+
+    for file_info, result in zip(file_list, results):
+        if isinstance(result, asyncio.TimeoutError):
+            log.error(f"Timeout occurred after {timeout} seconds while processing {file_info['name']}")
+            content.append({"role": "user", "parts": [{"text": f"File {file_info['name']} could not be processed within the time limit ({timeout} seconds)"}]})
+        elif isinstance(result, Exception):
+            log.error(f"Task failed with error: {str(result)}")
+            # Add error message to content
+            content.append({"role": "user", "parts": [{"text": f"Error processing file: {str(result)}"}]})
+        else:
+            content.extend(result)
     
     log.info(f"construct_file_content completed with {len(content)} items")
     return content
@@ -232,7 +358,8 @@ async def download_gcs_upload_genai(img_url,
                                     display_url=None, 
                                     display_name=None, 
                                     retries=3, delay=2, 
-                                    genai_lib=False):
+                                    genai_lib=False,
+                                    size=None):
     """
     Downloads and uploads a file with retries in case of failure.
     Thread-safe implementation using unique file paths.
@@ -244,29 +371,28 @@ async def download_gcs_upload_genai(img_url,
       - retries: int Number of retry attempts before failing.
       - delay: int Initial delay between retries, exponentially increasing.
       - genai_lin: bool whether to use newer genai library to upload files
+      - size: int Optional size of the GCS object if already known, else it is looked up
 
       
     Returns:
       - downloaded_content: The result of the file upload if successful.
     """
-    import aiofiles
     for attempt in range(retries):
         try:
             log.info(f"Upload attempt [{attempt}] for {img_url=}")
-            # Download the file bytes asynchronously
-            file_bytes = await asyncio.to_thread(get_bytes_from_gcs, img_url)
-            if not file_bytes:
+            if size is None:
+                _, size = await asyncio.to_thread(get_gcs_object_info, img_url)
+            if size is None:
                 msg = f"Failed to download file from {img_url}: got None"
                 log.warning(msg)
                 return {"role": "user", "parts": [{"text": msg}]}
             
-            # Log the size of the file bytes
-            file_size = len(file_bytes)
-            log.info(f"Downloaded file size for {img_url}: {file_size} bytes")
+            # Check the size before downloading anything
+            log.info(f"File size for {img_url}: {size} bytes")
 
-            if file_size > 19434343:
-                log.warning(f"File size for {img_url}: {file_size} is too big.")
-                msg = f"The file for {img_url} is too large ({file_size} bytes) to be used directly. Use RAG instead or {display_url=}"
+            if size > MAX_UPLOAD_BYTES:
+                log.warning(f"File size for {img_url}: {size} is too big.")
+                msg = f"The file for {img_url} is too large ({size} bytes) to be used directly. Use RAG instead or {display_url=}"
                 return {"role": "user", "parts": [{"text": msg}]}
             
             extension = mimetypes.guess_extension(mime_type)
@@ -281,10 +407,13 @@ async def download_gcs_upload_genai(img_url,
             
             api_name = sanitize_file(f"file-{unique_id[:8]}")
 
-
+            # Stream the GCS object straight to disk rather than via bytes in memory
             log.info(f"Writing file {file_path}")
-            async with aiofiles.open(file_path, 'wb') as f:
-                await f.write(file_bytes)
+            try:
+                await asyncio.to_thread(download_gcs_to_file, img_url, file_path)
+            except Exception:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+                raise
 
             try:
                 if not genai_lib:
@@ -293,50 +422,30 @@ async def download_gcs_upload_genai(img_url,
                             file_path  # Use the unsanitized path for filesystem access
                         )
                     
-                    # Clean up after successful upload
-                    try:
-                        os.remove(file_path)
-                        os.rmdir(temp_dir)
-                    except OSError as e:
-                        log.warning(f"Cleanup error (non-critical): {str(e)}")
-                        
                     return {"role": "user", "parts": [{"file_data": downloaded_content}, 
                                                     {"text": f"You have been given the ability to read and work with filename '{display_name}' with {mime_type=} {display_url=}"}
                                                    ]}
 
                 else:
-
-                    client = genaiv2.Client()
-                    
-                    # Use semaphore to limit concurrent uploads
-                    async with upload_semaphore:
-                        downloaded_content = await asyncio.to_thread(
-                            client.files.upload, 
-                            path=file_path,  # Use the unsanitized path for filesystem access
-                            config=dict(mime_type=mime_type, display_name=display_name, name=api_name)
-                        )
-                    
-                    # Clean up after successful upload
-                    try:
-                        os.remove(file_path)
-                        os.rmdir(temp_dir)
-                    except OSError as e:
-                        log.warning(f"Cleanup error (non-critical): {str(e)}")
+                    downloaded_content = await asyncio.to_thread(
+                        get_genai_client().files.upload, 
+                        path=file_path,  # Use the unsanitized path for filesystem access
+                        config=dict(mime_type=mime_type, display_name=display_name, name=api_name)
+                    )
                         
                     return [downloaded_content, 
                             f"You have been given the ability to read and work with filename '{display_name}' with {mime_type=} {display_url=}"]
 
             except Exception as err:
-                # Clean up on error
-                try:
-                    os.remove(file_path)
-                    os.rmdir(temp_dir)
-                except OSError:
-                    pass
-                
                 msg = f"Could not upload {file_path} to {'genai.upload_file' if not genai_lib else 'genaiv2.client.files.upload'}: {str(err)} {traceback.format_exc()} {display_url=}"
                 log.error(msg)
                 return {"role": "user", "parts": [{"text": msg}]}
+            finally:
+                try:
+                    os.remove(file_path)
+                    os.rmdir(temp_dir)
+                except OSError as e:
+                    log.warning(f"Cleanup error (non-critical): {str(e)}")
         
         except Exception as err:
             log.error(f"Error processing file {img_url} {mime_type=} on attempt {attempt + 1}/{retries}: {str(err)}")
@@ -347,8 +456,3 @@ async def download_gcs_upload_genai(img_url,
                 delay *= 2  # Exponential backoff
             else:
                 raise err  # Raise the error after max retries
-
-# Add this at the module level
-# Create a semaphore to limit concurrent uploads
-upload_semaphore = asyncio.Semaphore(5)  # Adjust the value based on your needs
-
@@ -24,6 +24,7 @@ Supports:
 - Streaming callback wrapping for real-time thinking capture
 - Multi-format thinking content (text blocks, tagged sections)
 - Thinking content aggregation across streaming chunks
+- Streaming multi-tag splitting into (kind, text) segments
 
 Usage:
     from sunholo.genai.thinking import ThinkingCapture, extract_thinking
@@ -43,7 +44,7 @@ from __future__ import annotations
 import logging
 import re
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -133,6 +134,176 @@ def extract_thinking_simple(text: str) -> Tuple[str, str]:
     return thinking_text, cleaned
 
 
+RESPONSE_KIND = "response"
+THINKING_KIND = "thinking"
+
+# Tags TagSplitter recognises by default, mapped to the kind of their segments
+STREAM_TAGS = {
+    "thinking": THINKING_KIND,
+    "antThinking": THINKING_KIND,
+    "reflection": THINKING_KIND,
+    "reasoning": THINKING_KIND,
+}
+
+
+def _marker_prefixes(markers: Tuple[str, ...]) -> Set[str]:
+    """All proper prefixes of the markers, to spot a marker split across chunks."""
+    return {marker[:i] for marker in markers for i in range(1, len(marker))}
+
+
+class TagSplitter:
+    """Splits streamed text into ``(kind, text)`` segments by tag.
+
+    A small state machine over the ``<tag>`` and ``</tag>`` markers of a set
+    of tags. Outside a tag any of the opening markers is matched, inside one
+    only its own closing marker is, so other tags nested in a thinking block
+    stay part of its text. Each chunk is scanned once from where the last
+    marker ended, and only a trailing partial marker (at most the length of
+    the longest marker) is held back for the next chunk.
+
+    Segments are slices of the chunk they came from, with the markers
+    removed; text outside any tag has the ``default_kind``.
+
+    Usage:
+        splitter = TagSplitter({"thinking": "thinking", "tool_call": "tool"})
+        for kind, text in splitter.split(stream):
+            channels[kind].send(text)
+    """
+
+    def __init__(
+        self,
+        tags: Union[Iterable[str], Dict[str, str]] = STREAM_TAGS,
+        default_kind: str = RESPONSE_KIND,
+    ):
+        """Initialize the splitter.
+
+        Args:
+            tags: Tag names to split on, or a mapping of tag name to the kind
+                of its segments. Tag names are used as kinds when not given.
+            default_kind: Kind of the text outside any tag.
+        """
+        kinds = dict(tags) if isinstance(tags, dict) else {tag: tag for tag in tags}
+        if not kinds:
+            raise ValueError("TagSplitter needs at least one tag")
+        for tag in kinds:
+            if not tag or "<" in tag or ">" in tag:
+                raise ValueError(f"Invalid tag name: {tag!r}")
+
+        self.default_kind = default_kind
+        self._kinds = kinds
+        self._open_markers = tuple(f"<{tag}>" for tag in kinds)
+        self._open_tags = dict(zip(self._open_markers, kinds))
+        self._close_markers = {tag: f"</{tag}>" for tag in kinds}
+        self._prefixes: Dict[Optional[str], Set[str]] = {None: _marker_prefixes(self._open_markers)}
+        for tag, marker in self._close_markers.items():
+            self._prefixes[tag] = _marker_prefixes((marker,))
+        self._max_marker = max(len(marker) for marker in self._close_markers.values())
+        self._tag: Optional[str] = None
+        self._pending = ""
+
+    @property
+    def active_tag(self) -> Optional[str]:
+        """The tag currently open, or None outside any tag."""
+        return self._tag
+
+    @property
+    def kind(self) -> str:
+        """The kind of the text currently being streamed."""
+        return self._kinds[self._tag] if self._tag is not None else self.default_kind
+
+    def _marker_at(self, text: str, pos: int) -> Optional[str]:
+        """The marker starting at ``text[pos]``, "" if text ends in a partial one, else None."""
+        if self._tag is None:
+            if text.startswith(self._open_markers, pos):
+                for marker in self._open_markers:
+                    if text.startswith(marker, pos):
+                        return marker
+        elif text.startswith(self._close_markers[self._tag], pos):
+            return self._close_markers[self._tag]
+        if len(text) - pos < self._max_marker and text[pos:] in self._prefixes[self._tag]:
+            return ""
+        return None
+
+    def _enter(self, marker: str) -> None:
+        self._tag = self._open_tags[marker] if self._tag is None else None
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """Split a streamed chunk.
+
+        Args:
+            chunk: The next text chunk from the stream.
+
+        Returns:
+            The ``(kind, text)`` segments completed by this chunk, in order.
+        """
+        segments: List[Tuple[str, str]] = []
+        carry, self._pending = self._pending, ""
+        start = 0
+
+        if carry:
+            # finish the marker that was split across chunks
+            probe = carry + chunk[:self._max_marker]
+            marker = self._marker_at(probe, 0)
+            if marker == "":
+                self._pending = probe
+                return segments
+            if marker:
+                self._enter(marker)
+                start = len(marker) - len(carry)
+                carry = ""
+
+        pos = start
+        while True:
+            lt = chunk.find("<", pos)
+            if lt < 0:
+                break
+            marker = self._marker_at(chunk, lt)
+            if marker is None:
+                pos = lt + 1
+                continue
+            text = carry + chunk[start:lt]
+            carry = ""
+            if text:
+                segments.append((self.kind, text))
+            if marker == "":
+                self._pending = chunk[lt:]
+                return segments
+            self._enter(marker)
+            start = pos = lt + len(marker)
+
+        text = carry + chunk[start:]
+        if text:
+            segments.append((self.kind, text))
+        return segments
+
+    def flush(self) -> List[Tuple[str, str]]:
+        """Release text held back as a possible partial marker at the end of the stream.
+
+        Returns:
+            The remaining segment, if any.
+        """
+        pending, self._pending = self._pending, ""
+        return [(self.kind, pending)] if pending else []
+
+    def split(self, chunks: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        """Lazily split a whole stream of chunks, flushing at its end.
+
+        Args:
+            chunks: Iterable of streamed text chunks.
+
+        Yields:
+            ``(kind, text)`` segments as soon as they are complete.
+        """
+        for chunk in chunks:
+            yield from self.feed(chunk)
+        yield from self.flush()
+
+    def reset(self) -> None:
+        """Reset state for reuse."""
+        self._tag = None
+        self._pending = ""
+
+
 class ThinkingCapture:
     """Captures thinking content from streaming responses.
 
@@ -147,19 +318,36 @@ class ThinkingCapture:
         response = capture.get_response()
     """
 
-    def __init__(self, tag: str = "thinking"):
+    def __init__(self, tag: str = "thinking", tags: Optional[Iterable[str]] = None):
         """Initialize thinking capture.
 
         Args:
             tag: The thinking tag name to look for (default: "thinking").
+            tags: Several thinking tag names to look for, instead of ``tag``.
         """
         self._tag = tag
-        self._open_tag = f"<{tag}>"
-        self._close_tag = f"</{tag}>"
+        self._splitter = TagSplitter({name: THINKING_KIND for name in (tags or [tag])})
         self._thinking_parts: List[str] = []
         self._response_parts: List[str] = []
-        self._in_thinking = False
-        self._buffer = ""
+
+    def _record(self, segments: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        for kind, text in segments:
+            if kind == THINKING_KIND:
+                self._thinking_parts.append(text)
+            else:
+                self._response_parts.append(text)
+        return segments
+
+    def process_segments(self, chunk: str) -> List[Tuple[str, str]]:
+        """Process a streaming chunk, returning its thinking and response segments.
+
+        Args:
+            chunk: A text chunk from the stream.
+
+        Returns:
+            ``(kind, text)`` segments where kind is "thinking" or "response".
+        """
+        return self._record(self._splitter.feed(chunk))
 
     def process_chunk(self, chunk: str) -> Optional[str]:
         """Process a streaming chunk, separating thinking from response.
@@ -169,68 +357,9 @@ class ThinkingCapture:
 
         Returns:
             The non-thinking portion of the chunk (may be empty string
-            if the chunk is entirely thinking content), or None if
-            still buffering.
+            if the chunk is entirely thinking content or a partial tag).
         """
-        self._buffer += chunk
-        response_out = []
-
-        while self._buffer:
-            if self._in_thinking:
-                # Look for closing tag
-                close_pos = self._buffer.find(self._close_tag)
-                if close_pos >= 0:
-                    # Found closing tag
-                    thinking_text = self._buffer[:close_pos]
-                    self._thinking_parts.append(thinking_text)
-                    self._buffer = self._buffer[close_pos + len(self._close_tag):]
-                    self._in_thinking = False
-                else:
-                    # Still in thinking, buffer everything
-                    # But check if we might have a partial closing tag
-                    partial_match = False
-                    for i in range(1, len(self._close_tag)):
-                        if self._buffer.endswith(self._close_tag[:i]):
-                            partial_match = True
-                            safe = self._buffer[:-i]
-                            if safe:
-                                self._thinking_parts.append(safe)
-                            self._buffer = self._buffer[-i:]
-                            break
-                    if not partial_match:
-                        self._thinking_parts.append(self._buffer)
-                        self._buffer = ""
-                    break
-            else:
-                # Look for opening tag
-                open_pos = self._buffer.find(self._open_tag)
-                if open_pos >= 0:
-                    # Found opening tag
-                    before = self._buffer[:open_pos]
-                    if before:
-                        response_out.append(before)
-                        self._response_parts.append(before)
-                    self._buffer = self._buffer[open_pos + len(self._open_tag):]
-                    self._in_thinking = True
-                else:
-                    # Check for partial opening tag at end
-                    partial_match = False
-                    for i in range(1, len(self._open_tag)):
-                        if self._buffer.endswith(self._open_tag[:i]):
-                            partial_match = True
-                            safe = self._buffer[:-i]
-                            if safe:
-                                response_out.append(safe)
-                                self._response_parts.append(safe)
-                            self._buffer = self._buffer[-i:]
-                            break
-                    if not partial_match:
-                        response_out.append(self._buffer)
-                        self._response_parts.append(self._buffer)
-                        self._buffer = ""
-                    break
-
-        return "".join(response_out) if response_out else ""
+        return "".join(text for kind, text in self.process_segments(chunk) if kind == RESPONSE_KIND)
 
     def flush(self) -> str:
         """Flush any remaining buffer content.
@@ -240,17 +369,8 @@ class ThinkingCapture:
         Returns:
             Any remaining non-thinking content.
         """
-        if self._buffer:
-            if self._in_thinking:
-                self._thinking_parts.append(self._buffer)
-                self._buffer = ""
-                return ""
-            else:
-                remaining = self._buffer
-                self._response_parts.append(remaining)
-                self._buffer = ""
-                return remaining
-        return ""
+        segments = self._record(self._splitter.flush())
+        return "".join(text for kind, text in segments if kind == RESPONSE_KIND)
 
     def get_thinking(self) -> str:
         """Get all captured thinking content.
@@ -271,14 +391,13 @@ class ThinkingCapture:
     @property
     def is_in_thinking(self) -> bool:
         """Whether we're currently inside a thinking block."""
-        return self._in_thinking
+        return self._splitter.active_tag is not None
 
     def reset(self) -> None:
         """Reset capture state for reuse."""
         self._thinking_parts.clear()
         self._response_parts.clear()
-        self._in_thinking = False
-        self._buffer = ""
+        self._splitter.reset()
 
 
 def extract_anthropic_thinking(response: Any) -> Tuple[str, str]:
@@ -332,12 +451,10 @@ def create_thinking_callback(
     capture = ThinkingCapture(tag=tag)
 
     def callback(chunk: str) -> None:
-        response_text = capture.process_chunk(chunk)
-        if response_text:
-            on_response(response_text)
-        # Check if new thinking content was added
-        thinking = capture.get_thinking()
-        if thinking and capture.is_in_thinking:
-            on_thinking(chunk)
+        for kind, text in capture.process_segments(chunk):
+            if kind == THINKING_KIND:
+                on_thinking(text)
+            else:
+                on_response(text)
 
     return callback
@@ -0,0 +1,24 @@
+import threading
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_langfuse_client():
+    """
+    Returns a Langfuse client shared by the whole process.
+
+    Creating a Langfuse client starts its own background flush thread, so it should only
+    be done once rather than per request.
+
+    Raises:
+        ImportError: If langfuse is not installed.
+    """
+    global _client
+    if _client is not None:
+        return _client
+    with _client_lock:
+        if _client is None:
+            from langfuse import Langfuse
+            _client = Langfuse()
+        return _client
@@ -1,11 +1,157 @@
 from ..custom_logging import log
 from ..utils import ConfigManager
+from .client import get_langfuse_client
+from concurrent.futures import ThreadPoolExecutor
+import concurrent.futures
 import threading
-try:
-    from langfuse import Langfuse
-    langfuse = Langfuse()
-except ImportError:
-    langfuse = None
+import time
+import os
+
+# How long a prompt fetched from Langfuse is served before it is refreshed in the background
+PROMPT_REFRESH_SECONDS = 300
+# How long a request waits for a prompt that has never been fetched and has no promptConfig fallback
+COLD_PROMPT_TIMEOUT = 1.0
+# Comma separated prompt keys to fetch at startup, e.g. "hello,my_vac:intro"
+PREWARM_ENV = "LANGFUSE_PREWARM_PROMPTS"
+
+
+class PromptCache:
+    """
+    A process wide stale-while-revalidate cache of Langfuse prompts, keyed by template name.
+
+    Callers get the last known prompt straight away, and a stale or missing prompt is
+    refreshed by a background worker - only one fetch per template is in flight at a time.
+    A failed fetch keeps the last known prompt and is not retried until the next refresh.
+    """
+
+    def __init__(self, refresh_seconds: float = PROMPT_REFRESH_SECONDS, max_workers: int = 2):
+        self.refresh_seconds = refresh_seconds
+        self.max_workers = max_workers
+        # template -> (prompt or None, fetched_at)
+        self._entries = {}
+        # template -> Future of the fetch in flight
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+    def _get_executor(self):
+        if self._executor is None or self._pid != os.getpid():
+            # The parent's worker threads don't survive a fork
+            self._pending = {}
+            self._pid = os.getpid()
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="langfuse-prompts")
+        return self._executor
+
+    def get(self, template: str):
+        """
+        Returns (prompt, future) without waiting on Langfuse.
+
+        prompt is the last known Langfuse prompt or None, and future is the background
+        refresh started by this call or already in flight, or None if the prompt is fresh.
+        """
+        with self._lock:
+            entry = self._entries.get(template)
+            future = None
+            if entry is None or time.monotonic() - entry[1] >= self.refresh_seconds:
+                future = self._refresh_locked(template)
+        return (entry[0] if entry else None), future
+
+    def refresh(self, template: str):
+        """Starts a background fetch of template unless one is in flight, and returns its Future."""
+        with self._lock:
+            return self._refresh_locked(template)
+
+    def _refresh_locked(self, template):
+        executor = self._get_executor()
+        future = self._pending.get(template)
+        if future is None:
+            future = executor.submit(self._fetch, template)
+            self._pending[template] = future
+        return future
+
+    def _fetch(self, template):
+        prompt = None
+        try:
+            langfuse = get_langfuse_client()
+            # this cache decides when to refresh, so always ask Langfuse for the latest version
+            prompt = langfuse.get_prompt(template, cache_ttl_seconds=0)
+        except ImportError:
+            log.warning("No Langfuse import available - install via sunholo[http]")
+        except Exception as err:
+            log.warning(f"Langfuse error: {template} - {str(err)}")
+
+        with self._lock:
+            self._pending.pop(template, None)
+            if prompt is None:
+                previous = self._entries.get(template)
+                prompt = previous[0] if previous else None
+            self._entries[template] = (prompt, time.monotonic())
+        return prompt
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_prompt_cache = PromptCache()
+
+
+def get_prompt_cache() -> PromptCache:
+    """Returns the PromptCache shared by the process."""
+    return _prompt_cache
+
+
+def clear_prompt_cache():
+    """Forgets all cached prompts, so the next load fetches from Langfuse again."""
+    _prompt_cache.clear()
+
+
+def _template_name(key, prefix):
+    return f"{prefix}-{key}" if prefix else key
+
+
+def _local_prompt(key, prefix):
+    try:
+        return ConfigManager(prefix).promptConfig(key)
+    except ValueError as err:
+        log.warning(f"Could not load promptConfig for {prefix}: {str(err)}")
+        return None
+
+
+def prewarm_prompts(keys=None, prefix="sunholo"):
+    """
+    Starts fetching prompts from Langfuse in the background, so the first requests don't wait for them.
+
+    Args:
+        keys: A list of prompt keys, or "prefix:key" strings to use another prefix.
+            Defaults to the comma separated keys in the LANGFUSE_PREWARM_PROMPTS environment variable.
+        prefix: The prefix of keys that don't specify their own.
+
+    Returns:
+        list: The Futures of the fetches, which can be waited on if needed.
+
+    Example:
+
+    ```python
+    from sunholo.langfuse.prompts import prewarm_prompts
+    prewarm_prompts(["hello", "my_vac:intro"])
+    ```
+    """
+    if keys is None:
+        keys = [key.strip() for key in os.getenv(PREWARM_ENV, "").split(",") if key.strip()]
+
+    futures = []
+    for key in keys:
+        key_prefix = prefix
+        if ":" in key:
+            key_prefix, key = key.split(":", 1)
+        futures.append(_prompt_cache.refresh(_template_name(key, key_prefix)))
+    if futures:
+        log.info(f"Prewarming {len(futures)} Langfuse prompts")
+    return futures
+
 
 # Load the YAML file
 def load_prompt_from_yaml(key, prefix="sunholo", load_from_file=False, f_string=True):
@@ -14,6 +160,10 @@ def load_prompt_from_yaml(key, prefix="sunholo", load_from_file=False, f_string=
 
     If load_from_file=False, by default it will try to load from Langfuse, if fails (which is laggy so not ideal) then load from file.
 
+    Langfuse prompts are kept in a process wide cache and refreshed in the background every
+    PROMPT_REFRESH_SECONDS, so requests don't wait on Langfuse: until a prompt has been fetched
+    the local promptConfig is returned instead. Use `prewarm_prompts()` at startup to fetch them early.
+
     Prompts on Langfuse should be specified with a name with {prefix}-{key} e.g. "sunholo-hello"
     
     Prompts in files will use yaml:
@@ -56,33 +206,21 @@ def load_prompt_from_yaml(key, prefix="sunholo", load_from_file=False, f_string=
     ```
 
     """
-    # Initialize Langfuse client
     if load_from_file:
-        config = ConfigManager(prefix)
-        
-        return config.promptConfig(key)
-
-    if langfuse is None:
-        log.warning("No Langfuse import available - install via sunholo[http]")
-    else:
-        langfuse_result = [None]
-        
-        def langfuse_load():
-            try:
-                template = f"{prefix}-{key}" if prefix else key
-                prompt = langfuse.get_prompt(template, cache_ttl_seconds=300)
-                langfuse_result[0] = prompt.get_langchain_prompt() if f_string else prompt
-            except Exception as err:
-                log.warning(f"Langfuse error: {template} - {str(err)}")
-                config = ConfigManager(prefix)
-                langfuse_result[0] = config.promptConfig(key)
-
-        thread = threading.Thread(target=langfuse_load)
-        thread.start()
-        thread.join(timeout=1)
-
-        if langfuse_result[0]:
-            return langfuse_result[0]
-
-    config = ConfigManager(prefix)
-    return config.promptConfig(key)
\ No newline at end of file
+        return _local_prompt(key, prefix)
+
+    prompt, future = _prompt_cache.get(_template_name(key, prefix))
+    if prompt is None:
+        # not fetched from Langfuse yet (or unavailable) so serve the local promptConfig meanwhile
+        fallback = _local_prompt(key, prefix)
+        if fallback is not None or future is None:
+            return fallback
+        # nothing to serve at all, so wait a short while for the first fetch
+        try:
+            prompt = future.result(timeout=COLD_PROMPT_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            log.warning(f"Timed out loading {_template_name(key, prefix)} from Langfuse")
+        if prompt is None:
+            return fallback
+
+    return prompt.get_langchain_prompt() if f_string else prompt
@@ -20,7 +20,8 @@ for use in tool orchestration and permission systems.
 
 Supports:
 - Server registry with connection configs
-- Auto-discovery of tools from connected servers
+- Auto-discovery of tools from connected servers, concurrently with
+  per-server timeouts and a cached tool catalog per server
 - Tool ID naming convention (mcp_{server_id})
 - Integration with ExtensibleMCPServer and MCPClientManager
 
@@ -39,8 +40,10 @@ Usage:
 """
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +51,20 @@ logger = logging.getLogger(__name__)
 MCP_PREFIX = "mcp_"
 EXTERNAL_MCP_TOOL = "external_mcp"
 
+# Discovery defaults: seconds a server's tool catalog is reused for, seconds
+# to wait for each server, and servers discovered at the same time
+DISCOVERY_CACHE_TTL = 300.0
+DISCOVERY_TIMEOUT = 10.0
+DISCOVERY_CONCURRENCY = 8
+
+
+def _tool_field(tool: Any, name: str, default: Any) -> Any:
+    """Reads a field from an MCP Tool object or a tool dict."""
+    if isinstance(tool, dict):
+        return tool.get(name, default)
+    value = getattr(tool, name, None)
+    return default if value is None else value
+
 
 class MCPServerConfig:
     """Configuration for an MCP server.
@@ -111,15 +128,41 @@ class MCPDiscovery:
     Maintains a registry of MCP servers and their discovered tools.
     Tools are identified by the convention: mcp_{server_id}.
 
+    Servers are discovered concurrently, each within its own timeout, and
+    each server's tool catalog is cached for ``catalog_ttl`` seconds.
+    Registering or unregistering a server invalidates its catalog.
+
     Usage:
         discovery = MCPDiscovery()
         discovery.register_server("search", url="http://localhost:8080/mcp")
         tools = await discovery.discover_all()
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        catalog_ttl: float = DISCOVERY_CACHE_TTL,
+        discovery_timeout: float = DISCOVERY_TIMEOUT,
+        max_concurrency: int = DISCOVERY_CONCURRENCY,
+        client_manager: Any = None,
+    ):
+        """Initialize discovery.
+
+        Args:
+            catalog_ttl: Seconds a server's discovered tools are reused for.
+            discovery_timeout: Seconds to wait for each server to connect and
+                list its tools.
+            max_concurrency: Maximum servers discovered at the same time.
+            client_manager: MCPClientManager to connect with. A new one is
+                created for each discovery if not given.
+        """
+        self.catalog_ttl = catalog_ttl
+        self.discovery_timeout = discovery_timeout
+        self.max_concurrency = max_concurrency
+        self._client_manager = client_manager
         self._servers: Dict[str, MCPServerConfig] = {}
         self._discovered_tools: Dict[str, Dict[str, Any]] = {}
+        # server_id -> (monotonic time discovered, tool ids in listing order)
+        self._catalogs: Dict[str, Tuple[float, List[str]]] = {}
 
     def register_server(
         self,
@@ -135,6 +178,8 @@ class MCPDiscovery:
     ) -> None:
         """Register an MCP server for discovery.
 
+        Re-registering a server drops its cached tools.
+
         Args:
             server_id: Unique identifier.
             name: Human-readable name.
@@ -146,6 +191,7 @@ class MCPDiscovery:
             tags: Categorization tags.
             auto_discover: Discover tools on startup.
         """
+        self.invalidate(server_id)
         self._servers[server_id] = MCPServerConfig(
             server_id=server_id,
             name=name,
@@ -159,98 +205,150 @@ class MCPDiscovery:
         )
 
     def unregister_server(self, server_id: str) -> None:
-        """Remove a server from the registry."""
+        """Remove a server from the registry, with its discovered tools."""
         self._servers.pop(server_id, None)
-        # Remove discovered tools for this server
-        prefix = f"{MCP_PREFIX}{server_id}"
-        to_remove = [k for k in self._discovered_tools if k.startswith(prefix)]
-        for k in to_remove:
-            del self._discovered_tools[k]
+        self.invalidate(server_id)
+
+    def invalidate(self, server_id: Optional[str] = None) -> None:
+        """Drop the cached tools of a server, or of all servers if None."""
+        server_ids = [server_id] if server_id is not None else list(self._catalogs)
+        for sid in server_ids:
+            _, tool_ids = self._catalogs.pop(sid, (0.0, []))
+            for tool_id in tool_ids:
+                self._discovered_tools.pop(tool_id, None)
 
     def list_servers(self) -> List[Dict[str, Any]]:
         """List all registered servers."""
         return [s.to_dict() for s in self._servers.values()]
 
-    async def discover_server(self, server_id: str) -> List[Dict[str, Any]]:
+    def _cached_catalog(self, server_id: str) -> Optional[List[Dict[str, Any]]]:
+        cached = self._catalogs.get(server_id)
+        if cached is None or time.monotonic() - cached[0] > self.catalog_ttl:
+            return None
+        return [self._discovered_tools[tool_id] for tool_id in cached[1]]
+
+    async def _list_server_tools(self, config: MCPServerConfig) -> Optional[List[Any]]:
+        """Connects to a server and lists its tools, or None if it can't be reached."""
+        manager = self._client_manager
+        if manager is None:
+            from sunholo.mcp import MCPClientManager
+            if MCPClientManager is None:
+                logger.warning("MCPClientManager not available")
+                return None
+            manager = MCPClientManager()
+
+        # Connect based on transport type
+        if config.command:
+            await manager.connect_to_server(
+                config.server_id, config.command, config.args
+            )
+        elif config.url:
+            # For HTTP/SSE servers, connect via URL
+            await manager.connect_to_server(
+                config.server_id, "npx", ["-y", "mcp-remote", config.url]
+            )
+        else:
+            logger.warning("No connection method for server: %s", config.server_id)
+            return None
+
+        return await manager.list_tools(config.server_id)
+
+    async def discover_server(
+        self, server_id: str, refresh: bool = False
+    ) -> List[Dict[str, Any]]:
         """Discover tools on a specific server.
 
         Connects to the server via MCPClientManager and lists
-        available tools.
+        available tools, unless they were discovered less than
+        ``catalog_ttl`` seconds ago.
 
         Args:
             server_id: Server to discover.
+            refresh: Ignore the cached tools and list them again.
 
         Returns:
-            List of discovered tool info dicts.
+            List of discovered tool info dicts. If the server fails or
+            times out, its last discovered tools (if any).
         """
         if server_id not in self._servers:
             logger.warning("Unknown server: %s", server_id)
             return []
 
+        if not refresh:
+            cached = self._cached_catalog(server_id)
+            if cached is not None:
+                return cached
+
         config = self._servers[server_id]
 
         try:
-            from sunholo.mcp import MCPClientManager
-            if MCPClientManager is None:
-                logger.warning("MCPClientManager not available")
-                return []
-
-            manager = MCPClientManager()
-
-            # Connect based on transport type
-            if config.command:
-                await manager.connect_to_server(
-                    server_id, config.command, config.args
-                )
-            elif config.url:
-                # For HTTP/SSE servers, connect via URL
-                await manager.connect_to_server(
-                    server_id, "npx", ["-y", "mcp-remote", config.url]
-                )
-            else:
-                logger.warning("No connection method for server: %s", server_id)
-                return []
-
-            # List tools
-            tools = await manager.list_tools(server_id)
-            discovered = []
-
-            for tool in tools:
-                tool_name = tool.get("name", "")
-                tool_id = f"{MCP_PREFIX}{server_id}_{tool_name}" if tool_name else config.tool_id
-
-                info = {
-                    "tool_id": tool_id,
-                    "server_id": server_id,
-                    "name": tool_name,
-                    "description": tool.get("description", ""),
-                    "parameters": tool.get("inputSchema", {}),
-                    "server_name": config.name,
-                }
-                self._discovered_tools[tool_id] = info
-                discovered.append(info)
-
-            logger.info(
-                "Discovered %d tools from server %s", len(discovered), server_id
+            tools = await asyncio.wait_for(
+                self._list_server_tools(config), self.discovery_timeout
             )
-            return discovered
-
+        except asyncio.TimeoutError:
+            logger.error(
+                "Timed out after %ss discovering tools on %s",
+                self.discovery_timeout, server_id,
+            )
+            tools = None
         except Exception as e:
             logger.error("Failed to discover tools on %s: %s", server_id, e)
+            tools = None
+
+        if tools is None:
+            stale = self._catalogs.get(server_id)
+            return [self._discovered_tools[tool_id] for tool_id in stale[1]] if stale else []
+
+        # the server may have been unregistered while it was being listed
+        if self._servers.get(server_id) is not config:
             return []
 
-    async def discover_all(self) -> List[Dict[str, Any]]:
+        self.invalidate(server_id)
+        discovered = []
+        for tool in tools:
+            tool_name = _tool_field(tool, "name", "")
+            tool_id = f"{MCP_PREFIX}{server_id}_{tool_name}" if tool_name else config.tool_id
+
+            info = {
+                "tool_id": tool_id,
+                "server_id": server_id,
+                "name": tool_name,
+                "description": _tool_field(tool, "description", ""),
+                "parameters": _tool_field(tool, "inputSchema", {}),
+                "server_name": config.name,
+            }
+            self._discovered_tools[tool_id] = info
+            discovered.append(info)
+        self._catalogs[server_id] = (
+            time.monotonic(), [info["tool_id"] for info in discovered]
+        )
+
+        logger.info(
+            "Discovered %d tools from server %s", len(discovered), server_id
+        )
+        return discovered
+
+    async def discover_all(self, refresh: bool = False) -> List[Dict[str, Any]]:
         """Discover tools on all registered servers with auto_discover=True.
 
+        Servers are discovered concurrently, at most ``max_concurrency`` at
+        a time, so the slowest server costs at most ``discovery_timeout``.
+
+        Args:
+            refresh: Ignore cached tools and list every server again.
+
         Returns:
-            List of all discovered tool info dicts.
+            List of all discovered tool info dicts, in server registration order.
         """
-        all_tools = []
-        for server_id, config in self._servers.items():
-            if config.auto_discover:
-                tools = await self.discover_server(server_id)
-                all_tools.extend(tools)
-        return all_tools
+        server_ids = [sid for sid, config in self._servers.items() if config.auto_discover]
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async def discover(server_id: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.discover_server(server_id, refresh=refresh)
+
+        results = await asyncio.gather(*(discover(sid) for sid in server_ids))
+        return [info for tools in results for info in tools]
 
     def get_tool_info(self, tool_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed info for a specific MCP tool.
@@ -263,13 +361,27 @@ class MCPDiscovery:
         """
         return self._discovered_tools.get(tool_id)
 
+    def is_mcp_tool(self, tool_id: str) -> bool:
+        """Check if a tool ID belongs to a registered server or a discovered tool.
+
+        Args:
+            tool_id: Tool identifier string.
+
+        Returns:
+            True for external_mcp, a registered server's tool ID, or a
+            discovered tool's ID.
+        """
+        if tool_id == EXTERNAL_MCP_TOOL or tool_id in self._discovered_tools:
+            return True
+        return (
+            tool_id.startswith(MCP_PREFIX)
+            and tool_id[len(MCP_PREFIX):] in self._servers
+        )
+
     def get_tools_for_server(self, server_id: str) -> List[Dict[str, Any]]:
         """Get all discovered tools for a server."""
-        prefix = f"{MCP_PREFIX}{server_id}"
-        return [
-            info for tool_id, info in self._discovered_tools.items()
-            if tool_id.startswith(prefix)
-        ]
+        _, tool_ids = self._catalogs.get(server_id, (0.0, []))
+        return [self._discovered_tools[tool_id] for tool_id in tool_ids]
 
     def list_discovered_tools(self) -> List[Dict[str, Any]]:
         """List all discovered tools across all servers."""
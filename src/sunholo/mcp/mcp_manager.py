@@ -3,8 +3,11 @@ Proper MCP integration for VACRoutes using the official MCP Python SDK.
 This shows how to integrate MCP servers with your Flask/VACRoutes application.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import asyncio
+import time
+
+from ..custom_logging import log
 
 # MCP SDK imports - try different import paths
 try:
@@ -35,11 +38,19 @@ except ImportError:
 
 
 class MCPClientManager:
-    """Manages MCP client connections to various MCP servers."""
+    """Manages MCP client connections to various MCP servers.
+
+    Tool listings are cached per server for ``tool_cache_ttl`` seconds and
+    dropped when the server is (re)connected.
+    """
     
-    def __init__(self):
+    def __init__(self, tool_cache_ttl: float = 300.0, list_timeout: float = 10.0):
         self.sessions: Dict[str, ClientSession] = {}
         self.server_configs: Dict[str, Dict[str, Any]] = {}
+        self.tool_cache_ttl = tool_cache_ttl
+        self.list_timeout = list_timeout
+        # server name -> (monotonic time listed, tools)
+        self._tool_cache: Dict[str, Tuple[float, List[Tool]]] = {}
         
     async def connect_to_server(self, server_name: str, command: str, args: List[str] = None) -> ClientSession:
         """Connect to an MCP server via stdio."""
@@ -62,26 +73,54 @@ class MCPClientManager:
             "command": command,
             "args": args
         }
+        self.invalidate_tools(server_name)
         return session
+
+    def invalidate_tools(self, server_name: Optional[str] = None) -> None:
+        """Drop the cached tool listing of a server, or of all servers if None."""
+        if server_name is None:
+            self._tool_cache.clear()
+        else:
+            self._tool_cache.pop(server_name, None)
+
+    async def _server_tools(self, server_name: str, session: ClientSession, refresh: bool) -> List[Tool]:
+        cached = self._tool_cache.get(server_name)
+        if cached and not refresh and time.monotonic() - cached[0] <= self.tool_cache_ttl:
+            return cached[1]
+        result = await asyncio.wait_for(session.list_tools(), self.list_timeout)
+        tools = result.tools
+        if self.sessions.get(server_name) is session:
+            self._tool_cache[server_name] = (time.monotonic(), tools)
+        return tools
     
-    async def list_tools(self, server_name: Optional[str] = None) -> List[Tool]:
-        """List available tools from one or all connected servers."""
+    async def list_tools(self, server_name: Optional[str] = None, refresh: bool = False) -> List[Tool]:
+        """List available tools from one or all connected servers.
+
+        All servers are listed concurrently; a server that fails or takes
+        longer than ``list_timeout`` is logged and left out.
+        """
         if server_name:
             session = self.sessions.get(server_name)
             if session:
-                result = await session.list_tools()
-                return result.tools
+                return await self._server_tools(server_name, session, refresh)
             return []
         
         # List from all servers
+        names = list(self.sessions)
+        results = await asyncio.gather(
+            *(self._server_tools(name, self.sessions[name], refresh) for name in names),
+            return_exceptions=True,
+        )
         all_tools = []
-        for name, session in self.sessions.items():
-            result = await session.list_tools()
+        for name, tools in zip(names, results):
+            if isinstance(tools, BaseException):
+                log.warning(f"Could not list tools on MCP server {name}: {tools!r}")
+                continue
             # Add server name to tool metadata
-            for tool in result.tools:
+            for tool in tools:
                 tool.metadata = tool.metadata or {}
                 tool.metadata["server"] = name
-            all_tools.extend(result.tools)
+            all_tools.extend(tools)
         return all_tools
     
     async def call_tool(self, server_name: str, tool_name: str, arguments: Dict[str, Any]) -> CallToolResult:
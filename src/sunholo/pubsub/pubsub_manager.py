@@ -19,36 +19,114 @@ except ImportError:
     pubsub_v1 = None
 
 import json
+import threading
+import concurrent.futures
+from functools import lru_cache
 from ..custom_logging import log
 from ..utils.gcp_project import get_gcp_project
 
+# Client side batching for the shared publishers - messages are sent when any limit is hit
+DEFAULT_BATCH_SETTINGS = {
+    "max_messages": 100,
+    "max_bytes": 1024 * 1024,  # 1 MiB
+    "max_latency": 0.05,  # seconds
+}
+
+# Process-wide publishers keyed by (project_id, topic path), and topics already known to exist
+_publishers = {}
+_known_topics = set()
+_publishers_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _default_project_id():
+    _, project_id = default()
+    return project_id
+
+
+def get_publisher_client(project_id: str, pubsub_topic: str, batch_settings: dict = None):
+    """
+    Returns the process-wide PublisherClient for a (project, topic), creating it on first use.
+
+    Args:
+        project_id: The Google Cloud project.
+        pubsub_topic: The full topic path e.g. `projects/my-project/topics/my-topic`.
+        batch_settings: Optional overrides for DEFAULT_BATCH_SETTINGS, used only when the client is created.
+    """
+    key = (project_id, pubsub_topic)
+    with _publishers_lock:
+        publisher = _publishers.get(key)
+        if publisher is None:
+            settings = {**DEFAULT_BATCH_SETTINGS, **(batch_settings or {})}
+            publisher = pubsub_v1.PublisherClient(
+                batch_settings=pubsub_v1.types.BatchSettings(**settings))
+            _publishers[key] = publisher
+            log.info(f"Created shared Pub/Sub publisher for {pubsub_topic}")
+        return publisher
+
+
+def clear_publisher_cache():
+    """Forgets all shared publishers and known topics, e.g. after credentials change or in tests."""
+    with _publishers_lock:
+        _publishers.clear()
+        _known_topics.clear()
+
+
+def stop_publishers(topic: str = None):
+    """
+    Sends the messages still batched in the shared publishers and stops them, e.g. at shutdown.
+
+    Stopped publishers are forgotten, so a later publish creates a new one.
+
+    Args:
+        topic: Only stop the publishers for this topic name (not the full path). None stops all of them.
+    """
+    with _publishers_lock:
+        keys = [key for key in _publishers if topic is None or key[1].rsplit("/", 1)[-1] == topic]
+        publishers = [_publishers.pop(key) for key in keys]
+    for (_, pubsub_topic), publisher in zip(keys, publishers):
+        try:
+            publisher.stop()
+        except Exception as err:
+            log.warning(f"Could not flush the Pub/Sub publisher for {pubsub_topic}: {err}")
 
 
 class PubSubManager:
     """
     Creates a new PubSub topic is necessary and sends pubsub messages to it
+
+    The underlying PublisherClient is shared per (project, topic) across the process, and the
+    topic existence check only runs once per topic, so creating a PubSubManager is cheap.
+
+    Args:
+        memory_namespace: Sent as the `namespace` attribute on each message.
+        pubsub_topic: The topic name (not the full path).
+        project_id: The Google Cloud project. Defaults to the application default credentials project.
+        verbose: Print progress as well as logging it.
+        publisher: Optional publisher client (or a compatible fake) to use instead of the shared one.
+        batch_settings: Optional overrides for DEFAULT_BATCH_SETTINGS when the shared publisher is created.
     """
-    def __init__(self, memory_namespace: str, pubsub_topic: str=None, project_id: str=None, verbose:bool=False):
+    def __init__(self, memory_namespace: str, pubsub_topic: str=None, project_id: str=None, verbose:bool=False,
+                 publisher=None, batch_settings: dict=None):
         self.project_id = project_id
         self.pubsub_topic = pubsub_topic
         self.publisher = None
         self.verbose = verbose
         self.memory_namespace = memory_namespace
 
-        if not pubsub_v1:
+        if not pubsub_v1 and publisher is None:
             log.warning('google.cloud.pubsub not installed, install via `pip install google-cloud-pubsub`')
             return None
 
         # Get the project ID from the default Google Cloud settings or the environment variable
         if self.project_id is None:
-            _, project_id = default()
-            self.project_id = project_id or get_gcp_project() # do not use get_gcp_project(use_config=True) here, pass it in
+            self.project_id = _default_project_id() or get_gcp_project() # do not use get_gcp_project(use_config=True) here, pass it in
 
         if self.project_id:
-            log.info(f"Pubsub Project ID: {self.project_id}")
+            log.debug(f"Pubsub Project ID: {self.project_id}")
             # Create the Pub/Sub topic based on the project ID and memory_namespace
-            self.publisher = pubsub_v1.PublisherClient()
             self.pubsub_topic = f"projects/{self.project_id}/topics/{pubsub_topic}"
+            self.publisher = publisher or get_publisher_client(self.project_id, self.pubsub_topic, batch_settings)
             self._create_pubsub_topic_if_not_exists()
 
         else:
@@ -57,12 +135,16 @@ class PubSubManager:
 
     def _create_pubsub_topic_if_not_exists(self):
         """Creates the Pub/Sub topic if it doesn't already exist."""
+        if self.pubsub_topic in _known_topics:
+            return
         try:
             # Check if the topic exists
             self.publisher.get_topic(request={"topic": self.pubsub_topic})
+            _known_topics.add(self.pubsub_topic)
         except NotFound:
             # If the topic does not exist, create it
             self.publisher.create_topic(request={"name": self.pubsub_topic})
+            _known_topics.add(self.pubsub_topic)
             log.info(f"Created Pub/Sub topic: {self.pubsub_topic}")
             if self.verbose:
                 print(f"Created Pub/Sub topic: {self.pubsub_topic}")
@@ -159,3 +241,48 @@ class PubSubManager:
                                             namespace = self.memory_namespace)
             future.add_done_callback(self._callback)
 
+
+
+    def publish_messages(self, messages: list, timeout: float = 120) -> dict:
+        """
+        Publishes many messages at once and waits for them all to be acknowledged.
+
+        Every message is handed to the publisher before any result is awaited, so the client
+        can pack them into batches bounded by its batch settings and send those concurrently.
+
+        Args:
+            messages: A list of strings or dicts (dicts are JSON encoded).
+            timeout: Maximum seconds to wait for all publishes to complete.
+
+        Returns:
+            dict: A summary with `published`, `failed`, `bytes` and a list of `errors`.
+        """
+        summary = {"published": 0, "failed": 0, "bytes": 0, "errors": []}
+        if not (self.publisher and self.pubsub_topic):
+            summary["failed"] = len(messages)
+            summary["errors"].append("No publisher available")
+            return summary
+
+        futures = []
+        for message in messages:
+            if isinstance(message, dict):
+                message = json.dumps(message)
+            message_bytes = message.encode('utf-8')
+            summary["bytes"] += len(message_bytes)
+            futures.append(self.publisher.publish(self.pubsub_topic,
+                                                  message_bytes,
+                                                  namespace = self.memory_namespace))
+
+        done, not_done = concurrent.futures.wait(futures, timeout=timeout)
+        for future in done:
+            try:
+                future.result()
+                summary["published"] += 1
+            except Exception as e:
+                summary["failed"] += 1
+                summary["errors"].append(str(e))
+        if not_done:
+            summary["failed"] += len(not_done)
+            summary["errors"].append(f"{len(not_done)} messages not acknowledged within {timeout}s")
+
+        return summary
@@ -1,3 +1,4 @@
 from .streaming import start_streaming_chat, generate_proxy_stream, generate_proxy_stream_async, start_streaming_chat_async
 from .langserve import parse_langserve_token, parse_langserve_token_async
-from .stream_lookup import can_agent_stream
\ No newline at end of file
+from .stream_lookup import can_agent_stream
+from .sync_bridge import stream_sync_generator_async, BackgroundEventLoop, get_background_loop
\ No newline at end of file
@@ -26,21 +26,46 @@ class ContentBuffer:
     and clear the buffer content. The buffer can be used to collect text output for further
     processing or inspection.
 
+    Written text is kept as a list of pieces that are only joined when read, so writes
+    and drains cost the same however much text is waiting.
+
+    Sync writers notify a condition variable so that consumers can block in
+    `wait_for_content` and wake the instant new text is written, instead of polling.
+
     Attributes:
-        content (str): Stores the textual content of the buffer.
+        content (str): The textual content of the buffer.
+        closed (bool): Set once no more content will be written.
     """
 
     def __init__(self):
         """
         Initializes a new ContentBuffer instance.
 
-        The content buffer starts with an empty string, and logging is initialized to indicate
+        The content buffer starts empty, and logging is initialized to indicate
         that the buffer has been created.
         """
-        self.content = ""
+        self._pieces = []
+        self.closed = False
         self.lock = asyncio.Lock()  # Use an async lock to ensure atomic writes
         self.content_available = asyncio.Event()
+        self.condition = threading.Condition()  # Wakes sync readers on write
         log.debug("Content buffer initialized")
+
+    @property
+    def content(self) -> str:
+        if len(self._pieces) > 1:
+            # join once, so repeated reads don't join again
+            self._pieces = ["".join(self._pieces)]
+        return self._pieces[0] if self._pieces else ""
+
+    @content.setter
+    def content(self, text: str):
+        self._pieces = [text] if text else []
+
+    def _take(self) -> str:
+        content = "".join(self._pieces)
+        self._pieces = []
+        return content
     
     def write(self, text: str):
         """
@@ -49,9 +74,13 @@ class ContentBuffer:
         Args:
             text (str): The text to be added to the buffer.
 
-        Adds the given text to the existing content of the buffer.
+        Adds the given text to the existing content of the buffer and wakes
+        any reader blocked in `wait_for_content`.
         """
-        self.content += text
+        with self.condition:
+            if text:
+                self._pieces.append(text)
+            self.condition.notify_all()
 
     async def async_write(self, text: str):
         """
@@ -63,7 +92,8 @@ class ContentBuffer:
         Adds the given text to the existing content of the buffer.
         """
         async with self.lock:
-            self.content += text
+            if text:
+                self._pieces.append(text)
             self.content_available.set()
     
     def read(self) -> str:
@@ -75,7 +105,8 @@ class ContentBuffer:
 
         Provides the entire content stored in the buffer.
         """   
-        return self.content
+        with self.condition:
+            return self.content
 
     async def async_read(self) -> str:
         """
@@ -85,8 +116,7 @@ class ContentBuffer:
             str: The content of the buffer.
         """
         async with self.lock:
-            content = self.content
-            return content
+            return self.content
 
     def clear(self):
         """
@@ -94,7 +124,58 @@ class ContentBuffer:
 
         Empties the buffer content, resetting it to an empty string.
         """
-        self.content = ""
+        with self.condition:
+            self._pieces = []
+
+    def drain(self) -> str:
+        """
+        Atomically reads and clears the buffer content.
+
+        Unlike calling `read` then `clear`, text written by another thread in
+        between the two calls is never lost.
+
+        Returns:
+            str: The content of the buffer before it was cleared.
+        """
+        with self.condition:
+            return self._take()
+
+    async def async_drain(self) -> str:
+        """
+        Asynchronously reads and clears the buffer content in one step.
+
+        Unlike awaiting `async_read` then `async_clear`, text written by another task
+        in between is never lost.
+
+        Returns:
+            str: The content of the buffer before it was cleared.
+        """
+        async with self.lock:
+            self.content_available.clear()
+            return self._take()
+
+    def wait_for_content(self, timeout: float = None) -> bool:
+        """
+        Blocks until content is written, the buffer is closed, or the timeout lapses.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait. None waits forever.
+
+        Returns:
+            bool: True if there is content to read or the buffer was closed.
+        """
+        with self.condition:
+            return self.condition.wait_for(lambda: bool(self._pieces) or self.closed, timeout)
+
+    def close(self):
+        """
+        Marks the buffer as finished and wakes any waiting readers.
+
+        Writes are still accepted after closing so that a final flush is not lost.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
 
     async def async_clear(self):
         """
@@ -103,11 +184,160 @@ class ContentBuffer:
         Empties the buffer content, resetting it to an empty string.
         """
         async with self.lock:
-            self.content = ""
+            self._pieces = []
             self.content_available.clear()
 
 
-class BufferStreamingStdOutCallbackHandler:
+class SentenceFlushScanner:
+    """
+    Decides when streamed LLM text can be flushed, looking only at newly appended text.
+
+    Text is flushed when it ends with one of `tokens`, or up to the start of the latest
+    numbered list item (e.g. "\\n2. ") so that list items stream one at a time. Nothing is
+    flushed inside a ``` code block, so code arrives whole. Pending text is kept as a list
+    of pieces, so each token costs time in proportion to its own length, not to how much
+    text is waiting.
+
+    Attributes:
+        tokens (str): Characters that end a statement, for flushing.
+        in_code_block (bool): Whether the text so far has an unclosed ``` fence.
+    """
+
+    # a numbered list item, and the end of text that could still become one
+    _list_item = re.compile(r'\n(\d+\.)(?=\s)')
+    _partial_list_item = re.compile(r'\n\d*\.?\Z')
+    _backticks = re.compile(r'`+')
+
+    def __init__(self, tokens: str = ".?!\n"):
+        self.tokens = tokens
+        self.in_code_block = False
+        self._pieces = []
+        self._length = 0
+        # start offset of the latest list item in the pending text
+        self._list_item_start = None
+        # pending text that could be the start of a list item split across tokens
+        self._carry = ""
+        # backticks ending the text, and how many of them already made a fence
+        self._backtick_run = 0
+        self._last_char = ""
+
+    @property
+    def text(self) -> str:
+        """The pending text that has not been flushed yet."""
+        return "".join(self._pieces)
+
+    def feed(self, token: str) -> str:
+        """
+        Adds a token and returns the text that can be flushed now, or "".
+        """
+        if not token:
+            return ""
+        self._scan_list_items(token)
+        self._scan_fences(token)
+        self._pieces.append(token)
+        self._length += len(token)
+        self._last_char = token[-1]
+
+        if self.in_code_block:
+            return ""
+        if self._list_item_start is not None:
+            return self._flush_to(self._list_item_start)
+        if self._last_char in self.tokens:
+            return self.flush()
+        return ""
+
+    def flush(self) -> str:
+        """Returns all the pending text and clears it."""
+        text = "".join(self._pieces)
+        self._pieces = []
+        self._length = 0
+        self._list_item_start = None
+        self._carry = ""
+        return text
+
+    def _flush_to(self, offset):
+        text = "".join(self._pieces)
+        self._pieces = [text[offset:]] if offset < len(text) else []
+        self._length -= offset
+        self._list_item_start = None
+        return text[:offset]
+
+    def _scan_list_items(self, token):
+        # a list item can start in earlier tokens, so rescan the carried over end of the text
+        window = self._carry + token
+        window_start = self._length - len(self._carry)
+        scanned_to = 0
+        for match in self._list_item.finditer(window):
+            # keep the newline with the flushed text, as the list item starts at the number
+            self._list_item_start = window_start + match.start() + 1
+            scanned_to = match.end()
+        partial = self._partial_list_item.search(window, scanned_to)
+        self._carry = partial.group() if partial else ""
+
+    def _scan_fences(self, token):
+        for match in self._backticks.finditer(token):
+            run = len(match.group())
+            # backticks continuing a run from earlier tokens only count towards new fences
+            previous = self._backtick_run if match.start() == 0 else 0
+            fences = (previous + run) // 3 - previous // 3
+            if fences % 2:
+                self.in_code_block = not self.in_code_block
+        trailing = len(token) - len(token.rstrip('`'))
+        if trailing == len(token):
+            self._backtick_run += trailing
+        else:
+            self._backtick_run = trailing
+
+
+class _SentenceBufferingHandler:
+    """
+    Token handling shared by the sync and async buffer streaming callback handlers.
+
+    Heartbeat tokens are passed straight through, other tokens go through a
+    SentenceFlushScanner and are written once they complete a sentence or list item.
+    """
+
+    def __init__(self, content_buffer: ContentBuffer, tokens: str = ".?!\n", *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.content_buffer = content_buffer
+        self.scanner = SentenceFlushScanner(tokens)
+        log.info("Starting to stream LLM")
+
+    @property
+    def tokens(self) -> str:
+        return self.scanner.tokens
+
+    @tokens.setter
+    def tokens(self, tokens: str):
+        self.scanner.tokens = tokens
+
+    @property
+    def buffer(self) -> str:
+        return self.scanner.text
+
+    @property
+    def in_code_block(self) -> bool:
+        return self.scanner.in_code_block
+
+    def _is_heartbeat_token(self, token: str) -> bool:
+        """Detects if the token is a heartbeat message."""
+        return token.startswith('[[HEARTBEAT]]') and token.endswith('[[/HEARTBEAT]]')
+
+    def _strip_heartbeat_markers(self, token: str) -> str:
+        """Removes the [[HEARTBEAT]] markers from the token."""
+        return token[len('[[HEARTBEAT]]'):-len('[[/HEARTBEAT]]')]
+
+    def _process_token(self, token: str):
+        """
+        Returns the text a new token lets through to the content buffer, or None if there is none yet.
+        """
+        if self._is_heartbeat_token(token):
+            # Strip the [[HEARTBEAT]] markers and write immediately
+            return self._strip_heartbeat_markers(token)
+        return self.scanner.feed(token) or None
+
+
+class BufferStreamingStdOutCallbackHandler(_SentenceBufferingHandler):
     """
     A callback handler for streaming LLM output to a content buffer.
 
@@ -119,7 +349,7 @@ class BufferStreamingStdOutCallbackHandler:
     Attributes:
         content_buffer (ContentBuffer): The buffer to which content is streamed.
         tokens (str): Tokens that indicate the end of a statement, for buffer flushing.
-        buffer (str): Temporary storage for accumulating streamed tokens.
+        buffer (str): Streamed text that has not been written to the content buffer yet.
         stream_finished (threading.Event): Signals when the streaming is finished.
         in_code_block (bool): Indicates whether the current context is a code block.
         in_question_block (bool): Indicates whether the current context is a question block.
@@ -139,24 +369,11 @@ class BufferStreamingStdOutCallbackHandler:
         Sets up the callback handler with the given content buffer and tokens.
         Initializes tracking variables for code blocks, buffer content, and the finished signal.
         """
-        super().__init__(*args, **kwargs)
-        self.content_buffer = content_buffer
-        self.tokens = tokens
-        self.buffer = ""
+        super().__init__(content_buffer, tokens, *args, **kwargs)
         self.stream_finished = threading.Event()
 
-        self.in_code_block = False
         self.in_question_block = False
         self.question_buffer = ""
-        log.info("Starting to stream LLM")
-
-    def _is_heartbeat_token(self, token: str) -> bool:
-        """Detects if the token is a heartbeat message."""
-        return token.startswith('[[HEARTBEAT]]') and token.endswith('[[/HEARTBEAT]]')
-
-    def _strip_heartbeat_markers(self, token: str) -> str:
-        """Removes the [[HEARTBEAT]] markers from the token."""
-        return token[len('[[HEARTBEAT]]'):-len('[[/HEARTBEAT]]')]
 
     def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
         """
@@ -170,40 +387,9 @@ class BufferStreamingStdOutCallbackHandler:
         The buffer content is written to the content buffer when appropriate tokens or
         patterns are detected.
         """
-        #log.debug(f"on_llm_new_token: {token}")
-
-        # Check if the token is a heartbeat message
-        if self._is_heartbeat_token(token):
-            # Strip the [[HEARTBEAT]] markers and write immediately
-            heartbeat_content = self._strip_heartbeat_markers(token)
-            #log.info(f"Heartbeat token detected, writing immediately: {heartbeat_content}")
-            self.content_buffer.write(heartbeat_content)
-        else:
-            self.buffer += token
-
-            if '```' in token:
-                self.in_code_block = not self.in_code_block
-
-            if not self.in_code_block:
-                self._process_buffer()
-
-    def _process_buffer(self):
-        """
-        Processes the buffer content and writes to the content buffer.
-
-        If the buffer ends with a numbered list pattern or specified tokens, the buffer is flushed
-        to the content buffer. Otherwise, the buffer is left intact for further accumulation.
-        """
-        matches = list(re.finditer(r'\n(\d+\.\s)', self.buffer))
-        if matches:
-            last_match = matches[-1]
-            start_of_last_match = last_match.start() + 1
-            self.content_buffer.write(self.buffer[:start_of_last_match])
-            self.buffer = self.buffer[start_of_last_match:]
-        else:
-            if any(self.buffer.endswith(t) for t in self.tokens):
-                self.content_buffer.write(self.buffer)
-                self.buffer = ""
+        text = self._process_token(token)
+        if text is not None:
+            self.content_buffer.write(text)
 
     def on_llm_end(self, response, **kwargs: Any) -> None:
         """
@@ -216,17 +402,18 @@ class BufferStreamingStdOutCallbackHandler:
         Writes any remaining buffer content to the content buffer, and sets a signal indicating
         that the streaming has finished.
         """
-        if self.buffer:
-            self.content_buffer.write(self.buffer)
-            self.buffer = ""
+        remaining = self.scanner.flush()
+        if remaining:
+            self.content_buffer.write(remaining)
             log.info("Flushing remaining LLM response buffer")
 
         self.stream_finished.set()
+        self.content_buffer.close()
         log.info("Streaming LLM response ended successfully")
 
 
 
-class BufferStreamingStdOutCallbackHandlerAsync:
+class BufferStreamingStdOutCallbackHandlerAsync(_SentenceBufferingHandler):
     """
     An async callback handler for streaming LLM output to a content buffer.
 
@@ -238,7 +425,7 @@ class BufferStreamingStdOutCallbackHandlerAsync:
     Attributes:
         content_buffer (ContentBuffer): The buffer to which content is streamed.
         tokens (str): Tokens that indicate the end of a statement, for buffer flushing.
-        buffer (str): Temporary storage for accumulating streamed tokens.
+        buffer (str): Streamed text that has not been written to the content buffer yet.
         stream_finished (asyncio.Event): Signals when the streaming is finished.
         in_code_block (bool): Indicates whether the current context is a code block.
     """
@@ -256,57 +443,13 @@ class BufferStreamingStdOutCallbackHandlerAsync:
         Sets up the callback handler with the given content buffer and tokens.
         Initializes tracking variables for code blocks, buffer content, and the finished signal.
         """
-        super().__init__(*args, **kwargs)
-        self.content_buffer = content_buffer
-        self.tokens = tokens
-        self.buffer = ""
+        super().__init__(content_buffer, tokens, *args, **kwargs)
         self.stream_finished = asyncio.Event()  # Use asyncio.Event for async compatibility
-        self.in_code_block = False
-        log.info("Starting to stream LLM")
 
     async def async_on_llm_new_token(self, token: str, **kwargs: Any) -> None:
-        #log.debug(f"async_on_llm_new_token: {token}")
-
-        # Check if the token is a heartbeat message
-        if self._is_heartbeat_token(token):
-            # Strip the [[HEARTBEAT]] markers and write immediately
-            heartbeat_content = self._strip_heartbeat_markers(token)
-            #log.info(f"Heartbeat token detected, writing immediately: {heartbeat_content}")
-            await self.content_buffer.async_write(heartbeat_content)
-        else:
-            self.buffer += token
-
-            if '```' in token:
-                self.in_code_block = not self.in_code_block
-
-            if not self.in_code_block:
-                await self._async_process_buffer()
-
-    def _is_heartbeat_token(self, token: str) -> bool:
-        """Detects if the token is a heartbeat message."""
-        return token.startswith('[[HEARTBEAT]]') and token.endswith('[[/HEARTBEAT]]')
-
-    def _strip_heartbeat_markers(self, token: str) -> str:
-        """Removes the [[HEARTBEAT]] markers from the token."""
-        return token[len('[[HEARTBEAT]]'):-len('[[/HEARTBEAT]]')]
-
-    async def _async_process_buffer(self):
-        """
-        Asynchronously processes the buffer content and writes to the content buffer.
-
-        If the buffer ends with a numbered list pattern or specified tokens, the buffer is flushed
-        to the content buffer. Otherwise, the buffer is left intact for further accumulation.
-        """
-        matches = list(re.finditer(r'\n(\d+\.\s)', self.buffer))
-        if matches:
-            last_match = matches[-1]
-            start_of_last_match = last_match.start() + 1
-            await self.content_buffer.async_write(self.buffer[:start_of_last_match])
-            self.buffer = self.buffer[start_of_last_match:]
-        else:
-            if any(self.buffer.endswith(t) for t in self.tokens):
-                await self.content_buffer.async_write(self.buffer)
-                self.buffer = ""
+        text = self._process_token(token)
+        if text is not None:
+            await self.content_buffer.async_write(text)
 
     async def async_on_llm_end(self, response, **kwargs: Any) -> None:
         """
@@ -316,11 +459,10 @@ class BufferStreamingStdOutCallbackHandlerAsync:
             response: The result returned by the LLM.
             **kwargs: Additional keyword arguments.
         """
-        if self.buffer:
-            await self.content_buffer.async_write(self.buffer)
-            self.buffer = ""
+        remaining = self.scanner.flush()
+        if remaining:
+            await self.content_buffer.async_write(remaining)
             log.info("Flushing remaining LLM response buffer")
 
         self.stream_finished.set()
         log.info("Streaming LLM response ended successfully")
-
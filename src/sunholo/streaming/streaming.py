@@ -35,7 +35,28 @@ def start_streaming_chat(question,
                          wait_time=2,
                          timeout=120, # Timeout in seconds (2 minutes)
                          **kwargs): 
-    
+    """
+    Runs a sync `qna_func` in a thread and yields its output as it is produced.
+
+    The callback handler flushes complete sentences into a ContentBuffer, which wakes
+    this generator immediately, so each chunk is yielded as soon as a sentence boundary
+    is reached rather than on a fixed polling interval.
+
+    Parameters:
+    - question (str): The question to send to `qna_func`.
+    - vector_name (str): The VAC name passed to `qna_func`.
+    - qna_func (callable): Sync function accepting `question`, `vector_name`, `chat_history`,
+      `callback` and `**kwargs`.
+    - chat_history (list, optional): Previous messages in the chat session.
+    - wait_time (int, optional): The maximum seconds to block waiting for new content before
+      re-checking for errors and timeouts. Content written while a chunk is being consumed is
+      coalesced into the next yield.
+    - timeout (int, optional): The maximum seconds to wait for a new chunk before giving up.
+    - **kwargs: Additional keyword arguments that are passed to the `qna_func`.
+
+    Yields:
+    str: Chunks of the streamed answer, followed by the parsed final output.
+    """
     if not check_kwargs_support(qna_func):
         yield "No **kwargs in qna_func - please add it"
 
@@ -58,6 +79,9 @@ def start_streaming_chat(question,
             result_queue.put(final_result)
         except Exception as e:
             exception_queue.put(e)
+        finally:
+            # wake the generator even if qna_func never called on_llm_end
+            content_buffer.close()
 
 
     chat_thread = Thread(target=start_chat, args=(stop_event, result_queue, exception_queue))
@@ -67,19 +91,20 @@ def start_streaming_chat(question,
     first_start = start
     while not chat_callback_handler.stream_finished.is_set() and not stop_event.is_set():
 
-        time.sleep(wait_time) # Wait for x seconds
-        log.info(f"heartbeat - {round(time.time() - start, 2)} seconds")
+        content_buffer.wait_for_content(timeout=wait_time)
+        log.debug(f"heartbeat - {round(time.time() - start, 2)} seconds")
         # Check for exceptions and raise if any
         while not exception_queue.empty():
             raise exception_queue.get()
         
-        content_to_send = content_buffer.read()
+        content_to_send = content_buffer.drain()
 
         if content_to_send:
             log.info(f"==\n{content_to_send}")
             yield content_to_send
-            content_buffer.clear()
             start = time.time() # reset timeout
+        elif content_buffer.closed:
+            break
 
         elapsed_time = time.time() - start
         if elapsed_time > timeout: # If the elapsed time exceeds the timeout
@@ -92,11 +117,10 @@ def start_streaming_chat(question,
     
     # if  you need it to stop it elsewhere use 
     # stop_event.set()
-    content_to_send = content_buffer.read()
+    content_to_send = content_buffer.drain()
     if content_to_send:
         log.info(f"==Flush==\n{content_to_send}")
         yield content_to_send
-        content_buffer.clear()
 
     # Stop the stream thread
     chat_thread.join()
@@ -185,11 +209,10 @@ async def start_streaming_chat_async(question, vector_name, qna_func_async, chat
     await asyncio.sleep(0)
 
     # Read and yield any initial content from the content buffer
-    content_to_send = await content_buffer.async_read()
+    content_to_send = await content_buffer.async_drain()
     if content_to_send:
         log.info(f"Initial content: {content_to_send}")
         yield content_to_send
-        await content_buffer.async_clear()
 
     # Continue streaming until timeout or stop event
     start_time = asyncio.get_event_loop().time()
@@ -208,11 +231,10 @@ async def start_streaming_chat_async(question, vector_name, qna_func_async, chat
                 break
             continue
 
-        content_to_send = await content_buffer.async_read()
+        content_to_send = await content_buffer.async_drain()
         if content_to_send:
             log.info(f"==Async\n{content_to_send}")
             yield content_to_send
-            await content_buffer.async_clear()
         else:
             log.debug("Content available event set but no content found.")
 
@@ -220,11 +242,10 @@ async def start_streaming_chat_async(question, vector_name, qna_func_async, chat
     await chat_task  # Ensure the async task is awaited
 
     # Handle final flush of any remaining content
-    content_to_send = await content_buffer.async_read()
+    content_to_send = await content_buffer.async_drain()
     if content_to_send:
         log.info(f"==Flush Async==\n{content_to_send}")
         yield content_to_send
-        await content_buffer.async_clear()
 
     # Handle final result to match non-async behavior
     if kwargs.get("stream_only"):
@@ -0,0 +1,264 @@
+#   Copyright [2024] [Holosun ApS]
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+import asyncio
+import atexit
+import os
+import threading
+import concurrent.futures
+from typing import Any, AsyncGenerator, AsyncIterable, Awaitable, Callable, Iterable, Iterator, Optional
+
+from ..custom_logging import log
+
+_STREAM_END = object()
+
+
+class _WorkerError:
+    """Carries an exception raised in the worker thread over to the event loop."""
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+async def stream_sync_generator_async(
+        make_iterable: Callable[[], Iterable[Any]],
+        max_queue_size: int = 32,
+        executor: Optional[concurrent.futures.Executor] = None,
+        poll_interval: float = 0.1) -> AsyncGenerator[Any, None]:
+    """
+    Relays a sync generator running in a worker thread to an async consumer, item by item.
+
+    Each item is yielded as soon as the worker produces it. The queue between the two is
+    bounded, so a slow client applies backpressure to the worker rather than the whole answer
+    buffering in memory. If the consumer stops early (e.g. the HTTP client disconnects and the
+    response task is cancelled) the worker stops pulling from the generator and closes it.
+
+    Args:
+        make_iterable: Zero-argument callable returning the sync iterable, e.g.
+            `functools.partial(start_streaming_chat, question=..., ...)`.
+            It is called inside the worker thread.
+        max_queue_size: Maximum items held between the worker and the consumer.
+        executor: Executor to run the worker in. Defaults to the loop's default executor.
+        poll_interval: Seconds between cancellation checks while the worker waits for queue space.
+
+    Yields:
+        The items produced by the sync iterable. Exceptions raised by it are re-raised here.
+
+    Example:
+    ```python
+    from functools import partial
+    from sunholo.streaming import start_streaming_chat, stream_sync_generator_async
+
+    async def generate():
+        async for chunk in stream_sync_generator_async(
+                partial(start_streaming_chat, question="Hi", vector_name="my_vac", qna_func=my_sync_qna)):
+            yield chunk
+    ```
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=max_queue_size)
+    cancelled = threading.Event()
+
+    def put(item) -> bool:
+        # blocks the worker until there is space, waking regularly to check for cancellation
+        try:
+            future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        except RuntimeError:
+            # event loop has closed
+            return False
+        while True:
+            try:
+                future.result(timeout=poll_interval)
+                return True
+            except concurrent.futures.TimeoutError:
+                if cancelled.is_set():
+                    future.cancel()
+                    return False
+            except concurrent.futures.CancelledError:
+                return False
+
+    def produce():
+        iterable = None
+        try:
+            iterable = make_iterable()
+            for item in iterable:
+                if cancelled.is_set() or not put(item):
+                    log.info("Stream consumer went away - stopping sync stream worker")
+                    return
+        except Exception as err:
+            put(_WorkerError(err))
+        finally:
+            # runs the generator's own cleanup if we stopped early
+            close = getattr(iterable, "close", None)
+            if close:
+                close()
+            if not cancelled.is_set():
+                put(_STREAM_END)
+
+    loop.run_in_executor(executor, produce)
+    try:
+        while True:
+            item = await queue.get()
+            if item is _STREAM_END:
+                break
+            if isinstance(item, _WorkerError):
+                raise item.exc
+            yield item
+    finally:
+        # stops the worker if we exit early, e.g. on client disconnect
+        cancelled.set()
+
+
+class BackgroundEventLoop:
+    """
+    An asyncio event loop running in a daemon thread, for sync code such as Flask views to run coroutines on.
+
+    Creating a loop per request is a fixed cost, and throws away anything bound to that loop such
+    as MCP client sessions or aiohttp/httpx pools. Coroutines submitted here all share one
+    long-lived loop, so those connections are reused across requests.
+
+    The loop starts on first use and is recreated in a forked child, as the parent's thread
+    doesn't survive a fork. Coroutines should not block, as they share the loop with every other request.
+
+    Example:
+    ```python
+    from sunholo.streaming import get_background_loop
+
+    loop = get_background_loop()
+    tools = loop.run(mcp_client_manager.list_tools())
+    for chunk in loop.iterate(my_async_generator()):
+        print(chunk)
+    ```
+    """
+
+    def __init__(self, name: str = "sunholo-event-loop"):
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running event loop, started if needed."""
+        if self._loop is None or self._pid != os.getpid() or not self._thread.is_alive():
+            self._start()
+        return self._loop
+
+    def _start(self):
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=run, name=self.name, daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop, self._thread, self._pid = loop, thread, os.getpid()
+            log.info(f"Started background event loop {self.name}")
+
+    def submit(self, coro: Awaitable) -> concurrent.futures.Future:
+        """Schedules a coroutine on the loop and returns a Future for its result."""
+        loop = self.loop
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Can't wait on the background event loop from its own thread - await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """
+        Runs a coroutine on the loop and blocks until it returns.
+
+        Args:
+            coro: The coroutine to run.
+            timeout: Seconds to wait before cancelling it and raising TimeoutError. None waits forever.
+        """
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def iterate(self, async_iterable: AsyncIterable, timeout: Optional[float] = None) -> Iterator:
+        """
+        Iterates an async iterable on the loop from sync code, item by item.
+
+        If the caller stops early (e.g. the client disconnected) the async generator is closed on the loop.
+
+        Args:
+            async_iterable: The async iterable, e.g. an async generator.
+            timeout: Seconds to wait for each item. None waits forever.
+        """
+        iterator = async_iterable.__aiter__()
+        finished = False
+        try:
+            while True:
+                try:
+                    item = self.run(iterator.__anext__(), timeout)
+                except StopAsyncIteration:
+                    finished = True
+                    return
+                yield item
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if not finished and aclose and self._loop is not None and not self._loop.is_closed():
+                self.run(aclose())
+
+    def shutdown(self, timeout: float = 5):
+        """Cancels outstanding tasks, closes async generators and the loop's aiohttp session, then stops and closes the loop."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or self._pid != os.getpid() or loop.is_closed():
+                return
+            self._loop = self._thread = None
+
+        async def drain():
+            from ..utils.http_sessions import close_aiohttp_session
+
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await loop.shutdown_asyncgens()
+            # the shared aiohttp session is bound to this loop
+            await close_aiohttp_session()
+
+        if thread.is_alive():
+            try:
+                asyncio.run_coroutine_threadsafe(drain(), loop).result(timeout)
+            except Exception as err:
+                log.warning(f"Background event loop {self.name} did not shut down cleanly: {err}")
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+
+
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundEventLoop:
+    """Returns the BackgroundEventLoop shared by the process, which is shut down at exit."""
+    global _background_loop
+    if _background_loop is None:
+        with _background_loop_lock:
+            if _background_loop is None:
+                _background_loop = BackgroundEventLoop()
+                atexit.register(_background_loop.shutdown)
+    return _background_loop
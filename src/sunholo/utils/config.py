@@ -17,6 +17,7 @@ import json
 from datetime import datetime, timedelta
 from collections import defaultdict
 from .timedelta import format_timedelta
+from .config_store import config_store
 
 from ruamel.yaml import YAML
 yaml = YAML(typ='safe')
@@ -54,7 +55,7 @@ def load_all_configs():
     """
     Load all configuration files from the specified directory into a dictionary.
     Files are expected to be either YAML or JSON and must contain a 'kind' key at the root.
-    Caching is used to avoid reloading files within a 5-minute window.
+    Parsed files are cached in the process-wide config store and only re-parsed when they change.
     """
     from ..custom_logging import log
 
@@ -67,37 +68,9 @@ def load_all_configs():
     config_folder = os.path.join(config_folder, "config")
 
     log.debug(f"Loading all configs from folder: {config_folder}")
-    current_time = datetime.now()
-
-    configs_by_kind = defaultdict(dict)
-    for filename in os.listdir(config_folder):
-        #log.debug(f"config file: {filename}")
-        if filename in ["cloudbuild.yaml", "cloud_run_urls.json"]:
-            # skip these
-            continue
-        if filename.endswith(('.yaml', '.yml', '.json')):
-            config_file = os.path.join(config_folder, filename)
-            
-            # Check cache first
-            if filename in config_cache:
-                cached_config, cache_time = config_cache[filename]
-                time_to_recache = (current_time - cache_time)
-                if time_to_recache < timedelta(minutes=5):
-                    config = cached_config
-                else:
-                    config = reload_config_file(config_file, filename)
-            else:
-                config = reload_config_file(config_file, filename)
-
-            kind = config.get('kind')
-            if kind:
-                configs_by_kind[kind] = config
-            else:
-                log.warning(f"No 'kind' found in {filename}")
-    
-    #log.debug(f"Config recache in {format_timedelta(timedelta(minutes=5) - time_to_recache)}")
 
-    return configs_by_kind
+    # parsed files are shared with ConfigManager and only re-parsed when they change
+    return defaultdict(dict, config_store.load_folder(config_folder))
 
 def reload_config_file(config_file, filename):
     """
@@ -0,0 +1,288 @@
+#   Copyright [2024] [Holosun ApS]
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+import os
+import json
+import time
+import hashlib
+import threading
+
+SKIP_FILES = ("cloudbuild.yaml", "cloud_run_urls.json")
+CONFIG_EXTENSIONS = ('.yaml', '.yml', '.json')
+
+
+def merge_dicts(base: dict, override: dict) -> dict:
+    """
+    Recursively merge two dictionaries into a new one. Values in `override` win.
+
+    Neither input is modified, so parsed config documents can be shared safely.
+    """
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_dicts(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class _ConfigFile:
+    __slots__ = ("signature", "digest", "config")
+
+    def __init__(self, signature, digest, config):
+        self.signature = signature
+        self.digest = digest
+        self.config = config
+
+
+class ConfigStore:
+    """
+    A process-wide store of parsed config files, shared by every `ConfigManager`.
+
+    A file is only re-parsed when its modification time or size changes and its
+    contents hash differently, so unchanged configs are never parsed twice.
+    Folders are checked for changes at most every `check_interval` seconds, or not at
+    all on the request path while `start_watching` polls them in the background.
+
+    Every change to a loaded config bumps `generation`, so dependent caches can key on it,
+    and calls the functions registered with `register_reload_callback`.
+
+    Example:
+    ```python
+    from sunholo.utils.config_store import config_store
+
+    configs_by_kind = config_store.load_folders(["/configs", "./config"])
+    cache_key = ("my_cache", config_store.generation)
+    ```
+    """
+
+    def __init__(self, check_interval: float = 2.0):
+        self.check_interval = check_interval
+        self.generation = 0
+        self._files = {}      # path -> _ConfigFile
+        self._folders = {}    # folder -> (last_checked, configs_by_kind)
+        self._single_files = {}  # path -> last_checked, for files loaded via load_file
+        self._merged = {}     # folders tuple -> (generation, configs_by_kind)
+        self._callbacks = []
+        self._lock = threading.RLock()
+        self._watcher = None
+        self._stop_watching = threading.Event()
+
+    def register_reload_callback(self, callback):
+        """Registers `callback(filename)` to be called when a loaded config file changes."""
+        with self._lock:
+            if callback not in self._callbacks:
+                self._callbacks.append(callback)
+
+    def load_folder(self, folder: str, force: bool = False) -> dict:
+        """
+        Returns the configs in `folder` grouped by their 'kind' key.
+
+        Args:
+            folder: The folder holding the YAML or JSON config files.
+            force: Check the files for changes even if `check_interval` has not passed.
+        """
+        with self._lock:
+            entry = self._folders.get(folder)
+            if entry is not None and not force:
+                last_checked, configs_by_kind = entry
+                if self._watcher is not None or time.monotonic() - last_checked < self.check_interval:
+                    return configs_by_kind
+
+            configs_by_kind = self._scan_folder(folder, entry[1] if entry else None)
+            self._folders[folder] = (time.monotonic(), configs_by_kind)
+            return configs_by_kind
+
+    def load_file(self, path: str, force: bool = False):
+        """
+        Returns a single parsed YAML or JSON file, such as `cloud_run_urls.json`.
+
+        The file is checked for changes like config folders are, and a change bumps `generation`.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        path = os.path.normpath(path)
+        with self._lock:
+            last_checked = self._single_files.get(path)
+            cached = self._files.get(path)
+            if cached is not None and last_checked is not None and not force:
+                if self._watcher is not None or time.monotonic() - last_checked < self.check_interval:
+                    return cached.config
+
+            config, changed = self._load_file(path, os.path.basename(path))
+            self._single_files[path] = time.monotonic()
+            if changed and cached is not None:
+                self.generation += 1
+                self._notify([os.path.basename(path)])
+            return config
+
+    def load_folders(self, folders) -> dict:
+        """
+        Returns the configs of several folders merged by kind, later folders overriding earlier ones.
+
+        The merged result is shared until a config in one of the folders changes.
+        """
+        folders = tuple(folder for folder in folders if folder)
+        with self._lock:
+            loaded = [self.load_folder(folder) for folder in folders]
+            cached = self._merged.get(folders)
+            if cached is not None and cached[0] == self.generation:
+                return cached[1]
+
+            merged = {}
+            for configs_by_kind in loaded:
+                for kind, config in configs_by_kind.items():
+                    if kind in merged:
+                        merged[kind] = merge_dicts(merged[kind], config)
+                    else:
+                        merged[kind] = config
+            self._merged[folders] = (self.generation, merged)
+            return merged
+
+    def _scan_folder(self, folder, previous):
+        from ..custom_logging import log
+
+        changed = []
+        configs_by_kind = {}
+        seen = set()
+        folder_path = os.path.normpath(folder)
+        for filename in sorted(os.listdir(folder)):
+            if filename in SKIP_FILES or not filename.endswith(CONFIG_EXTENSIONS):
+                continue
+            path = os.path.join(folder_path, filename)
+            seen.add(path)
+            config, did_change = self._load_file(path, filename)
+            if did_change:
+                changed.append(filename)
+            if config is None:
+                log.error(f"No config found within {filename}")
+                continue
+            kind = config.get('kind')
+            if kind:
+                configs_by_kind[kind] = config
+            else:
+                log.warning(f"No 'kind' found in {filename}")
+
+        for path in [p for p in self._files if os.path.dirname(p) == folder_path
+                     and p not in seen and p not in self._single_files]:
+            del self._files[path]
+            changed.append(os.path.basename(path))
+
+        if previous is None or changed:
+            self.generation += 1
+        if previous is not None and changed:
+            self._notify(changed)
+        return configs_by_kind
+
+    def _notify(self, changed):
+        from ..custom_logging import log
+
+        for filename in changed:
+            log.info(f"Configuration {filename} has changed")
+            for callback in list(self._callbacks):
+                try:
+                    callback(filename)
+                except Exception as err:
+                    log.warning(f"Config reload callback {callback} failed for {filename}: {err}")
+
+    def _load_file(self, path, filename):
+        """Returns (config, changed), only parsing the file if its contents changed."""
+        from ..custom_logging import log
+
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(path)
+        if cached is not None and cached.signature == signature:
+            return cached.config, False
+
+        with open(path, 'rb') as file:
+            raw = file.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if cached is not None and cached.digest == digest:
+            # touched but not changed
+            cached.signature = signature
+            return cached.config, False
+
+        config = self._parse(raw, filename)
+        self._files[path] = _ConfigFile(signature, digest, config)
+        log.debug(f"Loaded and cached {path}")
+        return config, cached is None or cached.config != config
+
+    @staticmethod
+    def _parse(raw: bytes, filename: str):
+        text = raw.decode('utf-8')
+        if filename.endswith('.json'):
+            return json.loads(text)
+
+        from ruamel.yaml import YAML
+        # Create YAML parser that forbids duplicates
+        yaml = YAML(typ='safe')
+        yaml.allow_duplicate_keys = False
+        return yaml.load(text)
+
+    def refresh(self):
+        """Checks every loaded folder and file for changes now."""
+        with self._lock:
+            folders = list(self._folders)
+            files = list(self._single_files)
+        for folder in folders:
+            try:
+                self.load_folder(folder, force=True)
+            except Exception as err:
+                from ..custom_logging import log
+                log.warning(f"Could not refresh configs in {folder}: {err}")
+        for path in files:
+            try:
+                self.load_file(path, force=True)
+            except Exception as err:
+                from ..custom_logging import log
+                log.warning(f"Could not refresh config file {path}: {err}")
+
+    def start_watching(self, interval: float = None):
+        """
+        Polls loaded folders for changes in a background thread every `interval` seconds.
+
+        While watching, config lookups never touch the filesystem.
+        """
+        interval = interval or self.check_interval
+        with self._lock:
+            if self._watcher is not None and self._watcher.is_alive():
+                return
+            self._stop_watching.clear()
+
+            def watch():
+                while not self._stop_watching.wait(interval):
+                    self.refresh()
+
+            self._watcher = threading.Thread(target=watch, name="sunholo-config-watcher", daemon=True)
+            self._watcher.start()
+
+    def stop_watching(self):
+        with self._lock:
+            watcher, self._watcher = self._watcher, None
+        self._stop_watching.set()
+        if watcher is not None:
+            watcher.join(timeout=5)
+
+    def clear(self):
+        """Forgets all loaded configs so they are re-read on next use."""
+        with self._lock:
+            self._files.clear()
+            self._folders.clear()
+            self._single_files.clear()
+            self._merged.clear()
+            self.generation += 1
+
+
+config_store = ConfigStore()
@@ -0,0 +1,157 @@
+#   Copyright [2024] [Holosun ApS]
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+"""
+Shared keep-alive HTTP sessions for calls between VACs.
+
+Connections are pooled per upstream host and reused across requests, so only the first
+request to a host pays for the TCP and TLS handshake. The sessions are shared by every
+user's requests, so they never store cookies.
+
+Usage:
+    from sunholo.utils.http_sessions import get_http_session, get_aiohttp_session
+
+    resp = get_http_session().post(url, json=data)
+
+    session = get_aiohttp_session()
+    async with session.post(url, json=data) as resp:
+        ...
+"""
+import asyncio
+import atexit
+import http.cookiejar
+import os
+import threading
+import weakref
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Upstream hosts to keep a connection pool for
+HTTP_POOL_HOSTS = 20
+# Keep-alive connections per upstream host
+HTTP_POOL_PER_HOST = 20
+# Total connections per aiohttp session across all hosts
+HTTP_POOL_MAX_CONNECTIONS = 100
+# Seconds an idle keep-alive connection is kept open
+HTTP_KEEPALIVE_TIMEOUT = 60
+
+_session = None
+_session_lock = threading.Lock()
+# aiohttp sessions are bound to the event loop they were created in
+_aiohttp_sessions = weakref.WeakKeyDictionary()
+
+_pool_limits = {
+    "pool_hosts": HTTP_POOL_HOSTS,
+    "per_host": HTTP_POOL_PER_HOST,
+    "max_connections": HTTP_POOL_MAX_CONNECTIONS,
+    "keepalive_timeout": HTTP_KEEPALIVE_TIMEOUT,
+}
+
+
+def configure_http_pools(pool_hosts: int = None, per_host: int = None,
+                         max_connections: int = None, keepalive_timeout: float = None):
+    """
+    Sets the connection limits for sessions created after this call, e.g. at app startup.
+
+    Args:
+        pool_hosts: Upstream hosts to keep a connection pool for.
+        per_host: Keep-alive connections per upstream host.
+        max_connections: Total connections per async session across all hosts.
+        keepalive_timeout: Seconds an idle async connection is kept open.
+    """
+    updates = {"pool_hosts": pool_hosts, "per_host": per_host,
+               "max_connections": max_connections, "keepalive_timeout": keepalive_timeout}
+    with _session_lock:
+        _pool_limits.update({key: value for key, value in updates.items() if value is not None})
+
+
+def get_http_session():
+    """
+    Returns the process-wide `requests.Session`, with a keep-alive connection pool per host.
+    """
+    global _session
+    if requests is None:
+        raise ImportError("requests is required - install via `pip install requests`")
+    if _session is not None:
+        return _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=_pool_limits["pool_hosts"],
+                                  pool_maxsize=_pool_limits["per_host"])
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            # don't send one user's upstream cookies (affinity, auth) on another user's requests
+            session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+            _session = session
+        return _session
+
+
+def get_aiohttp_session():
+    """
+    Returns an `aiohttp.ClientSession` shared within the running event loop.
+
+    Must be called from a coroutine. Call `close_aiohttp_session` from the loop before it
+    closes, e.g. in an app shutdown hook - the VACRoutes apps do this for you.
+    """
+    if aiohttp is None:
+        raise ImportError("aiohttp is required for async operations. "
+                          "Install it with: pip install aiohttp or pip install sunholo[http]")
+    loop = asyncio.get_running_loop()
+    session = _aiohttp_sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=_pool_limits["max_connections"],
+                                         limit_per_host=_pool_limits["per_host"],
+                                         keepalive_timeout=_pool_limits["keepalive_timeout"])
+        session = aiohttp.ClientSession(connector=connector, cookie_jar=aiohttp.DummyCookieJar())
+        _aiohttp_sessions[loop] = session
+    return session
+
+
+async def close_aiohttp_session():
+    """Closes the running event loop's shared aiohttp session, e.g. in an app shutdown hook."""
+    session = _aiohttp_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def close_http_session():
+    """Closes the process-wide requests session and its pooled connections."""
+    global _session
+    with _session_lock:
+        session, _session = _session, None
+    if session is not None:
+        session.close()
+
+
+def _reset_after_fork():
+    # pooled sockets must not be shared with a forked child
+    global _session, _session_lock
+    _session = None
+    _session_lock = threading.Lock()
+    _aiohttp_sessions.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+atexit.register(close_http_session)
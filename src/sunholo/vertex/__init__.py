@@ -1,6 +1,16 @@
-from .init import init_vertex, init_genai
-from .memory_tools import get_vertex_memories, print_grounding_response, get_google_search_grounding
-from .safety import vertex_safety, genai_safety
-from .extensions_class import VertexAIExtensions
-from .extensions_call import get_extension_content, parse_extension_input, dynamic_extension_call
+# Submodules are imported on first attribute access, see sunholo/_lazy.py
+from .._lazy import lazy_attributes
 
+__getattr__, __dir__ = lazy_attributes(__name__, globals(), {
+    "init_vertex": ".init:init_vertex",
+    "init_genai": ".init:init_genai",
+    "get_vertex_memories": ".memory_tools:get_vertex_memories",
+    "print_grounding_response": ".memory_tools:print_grounding_response",
+    "get_google_search_grounding": ".memory_tools:get_google_search_grounding",
+    "vertex_safety": ".safety:vertex_safety",
+    "genai_safety": ".safety:genai_safety",
+    "VertexAIExtensions": ".extensions_class:VertexAIExtensions",
+    "get_extension_content": ".extensions_call:get_extension_content",
+    "parse_extension_input": ".extensions_call:parse_extension_input",
+    "dynamic_extension_call": ".extensions_call:dynamic_extension_call",
+})
@@ -0,0 +1,79 @@
+#   Copyright [2024] [Holosun ApS]
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Tuple
+
+
+class FakePublisherClient:
+    """
+    Offline stand-in for google.cloud.pubsub_v1.PublisherClient.
+
+    Records published messages and simulates API latency so that throughput and
+    request-path latency can be benchmarked without Pub/Sub.
+
+    Args:
+        publish_latency: Seconds each publish future takes to resolve.
+        admin_latency: Seconds each get_topic/create_topic call blocks the caller.
+        batched: Hold published messages in a client-side batch until `stop()` sends them.
+    """
+
+    def __init__(self, publish_latency: float = 0.0, admin_latency: float = 0.0, batched: bool = False):
+        self.publish_latency = publish_latency
+        self.admin_latency = admin_latency
+        self.batched = batched
+        self.stopped = False
+        self.messages: List[Tuple[str, bytes, dict]] = []
+        self.batch: List[Tuple[str, bytes, dict]] = []
+        self.topics = set()
+        self.get_topic_calls = 0
+        self._lock = threading.Lock()
+
+    def get_topic(self, request):
+        time.sleep(self.admin_latency)
+        with self._lock:
+            self.get_topic_calls += 1
+            self.topics.add(request["topic"])
+        return request["topic"]
+
+    def create_topic(self, request):
+        time.sleep(self.admin_latency)
+        with self._lock:
+            self.topics.add(request["name"])
+        return request["name"]
+
+    def publish(self, topic, data: bytes, **attrs):
+        future = Future()
+        with self._lock:
+            if self.stopped:
+                raise RuntimeError("Cannot publish on a stopped publisher.")
+            (self.batch if self.batched else self.messages).append((topic, data, attrs))
+            message_id = str(len(self.messages) + len(self.batch))
+
+        if self.publish_latency:
+            timer = threading.Timer(self.publish_latency, future.set_result, args=(message_id,))
+            timer.daemon = True
+            timer.start()
+        else:
+            future.set_result(message_id)
+        return future
+
+
+    def stop(self):
+        with self._lock:
+            self.stopped = True
+            self.messages.extend(self.batch)
+            self.batch.clear()
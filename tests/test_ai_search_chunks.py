@@ -0,0 +1,57 @@
+"""Tests for concurrent fan-out in sunholo.discovery_engine.get_ai_search_chunks."""
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from sunholo.discovery_engine import get_ai_search_chunks as chunks_module
+
+MEMORIES = [
+    {"first": {"vectorstore": "vertex_ai_search"}},
+    {"second": {"vectorstore": "vertex_ai_search", "read_only": True, "vector_name": "other"}},
+    {"slow": {"vectorstore": "vertex_ai_search", "read_only": True, "vector_name": "slow", "timeout": 0.3}},
+]
+
+
+def delay_for(vector_name):
+    return {"my_vac": 0.2, "other": 0.1, "slow": 2}[vector_name]
+
+
+@pytest.fixture
+def config(monkeypatch):
+    monkeypatch.setattr(chunks_module, "load_memories", lambda config: MEMORIES)
+    config = MagicMock()
+    config.vector_name = "my_vac"
+    config.vacConfig.return_value = {"project_id": "my-project"}
+    return config
+
+
+def test_get_all_chunks_runs_memories_concurrently(config, monkeypatch):
+    def fake_get_chunks(question, vector_name, num_chunks, filter_str=None, project_id=None, serving_config=None):
+        time.sleep(delay_for(vector_name))
+        return f"chunk-{vector_name}"
+
+    monkeypatch.setattr(chunks_module, "get_chunks", fake_get_chunks)
+
+    start = time.perf_counter()
+    result = chunks_module.get_all_chunks("q", config)
+
+    assert time.perf_counter() - start < 0.6
+    # config order is kept and the slow memory is dropped
+    assert result == "chunk-my_vac\nchunk-other"
+
+
+@pytest.mark.asyncio
+async def test_async_get_all_chunks_runs_memories_concurrently(config, monkeypatch):
+    async def fake_async_get_chunks(question, vector_name, num_chunks, filter_str, project_id=None):
+        await asyncio.sleep(delay_for(vector_name))
+        return f"chunk-{vector_name}"
+
+    monkeypatch.setattr(chunks_module, "async_get_chunks", fake_async_get_chunks)
+
+    start = time.perf_counter()
+    result = await chunks_module.async_get_all_chunks("q", config)
+
+    assert time.perf_counter() - start < 0.6
+    assert result == "chunk-my_vac\nchunk-other"
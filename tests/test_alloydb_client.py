@@ -0,0 +1,96 @@
+"""Tests for bulk inserts in sunholo.database.alloydb_client.AlloyDBClient.insert_rows_safely."""
+import re
+
+import pytest
+
+from sunholo.database.alloydb_client import AlloyDBClient
+
+
+COLUMNS = [("id", "integer"), ("name", "text"), ("price", "numeric"), ("source", "text")]
+
+
+class FakeEngine:
+    """Stands in for the langchain AlloyDBEngine, failing any insert containing a 'bad' name."""
+
+    def __init__(self):
+        self.inserts = []
+        self.next_id = 0
+
+    async def _afetch(self, query, params=None):
+        if "information_schema.columns" in query:
+            return [(name, col_type, "YES", None, None) for name, col_type in COLUMNS]
+
+        assert query.strip().startswith("INSERT")
+        params = params or {}
+        if any(value == "bad" for value in params.values()):
+            raise ValueError("invalid input syntax")
+        rows = len(re.findall(r"\(:p\d+_0", query))
+        self.inserts.append(rows)
+        ids = []
+        for _ in range(rows):
+            self.next_id += 1
+            ids.append((self.next_id,))
+        return ids
+
+
+@pytest.fixture
+def client():
+    client = AlloyDBClient.__new__(AlloyDBClient)
+    client.engine = FakeEngine()
+    client.engine_type = "langchain"
+    return client
+
+
+def make_rows(n):
+    return [{"Name": f"item {i}", "price": f"${i},50", "ignored": "x"} for i in range(n)]
+
+
+class TestInsertRowsSafely:
+    @pytest.mark.asyncio
+    async def test_inserts_in_batches(self, client):
+        result = await client.insert_rows_safely("items", make_rows(1200), batch_size=500)
+
+        assert client.engine.inserts == [500, 500, 200]
+        assert result["success"] is True
+        assert result["inserted_rows"] == 1200
+        assert result["failed_rows"] == 0
+        assert result["return_ids"][0] == ["(1,)"]
+        assert len(result["return_ids"]) == 1200
+
+    def test_converts_and_adds_metadata(self, client):
+        converted = client._convert_rows(make_rows(2), [{"name": n, "type": t} for n, t in COLUMNS],
+                                         metadata={"source": "gs://bucket/file.pdf"})
+
+        assert converted[1] == {"name": "item 1", "price": 1.5, "source": "gs://bucket/file.pdf"}
+
+    @pytest.mark.asyncio
+    async def test_bisects_failed_batches(self, client):
+        rows = make_rows(100)
+        rows[37]["name"] = "bad"
+        rows[80]["name"] = "bad"
+
+        result = await client.insert_rows_safely("items", rows, continue_on_error=True, batch_size=100)
+
+        assert result["inserted_rows"] == 98
+        assert result["failed_rows"] == 2
+        assert [e["row_index"] for e in result["errors"]] == [37, 80]
+        assert result["errors"][0]["row_data"] is rows[37]
+        assert len(result["return_ids"]) == 98
+        # only the failed batch is split up, far fewer statements than one per row
+        assert len(client.engine.inserts) < 20
+
+    @pytest.mark.asyncio
+    async def test_stops_at_first_error(self, client):
+        rows = make_rows(10)
+        rows[4]["name"] = "bad"
+
+        result = await client.insert_rows_safely("items", rows, batch_size=10)
+
+        assert result["success"] is False
+        assert result["inserted_rows"] == 4
+        assert result["failed_rows"] == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_rows(self, client):
+        result = await client.insert_rows_safely("items", [])
+        assert result["total_rows"] == 0
@@ -0,0 +1,155 @@
+"""Tests for the shared BackgroundEventLoop and its use by the Flask VACRoutes."""
+import asyncio
+import threading
+import types
+
+import pytest
+
+from sunholo.streaming import BackgroundEventLoop
+
+
+@pytest.fixture
+def background_loop():
+    loop = BackgroundEventLoop(name="test-event-loop")
+    yield loop
+    loop.shutdown()
+
+
+class TestBackgroundEventLoop:
+    def test_coroutines_share_one_loop(self, background_loop):
+        async def running_loop():
+            return asyncio.get_running_loop()
+
+        first = background_loop.run(running_loop())
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(background_loop.run(running_loop())))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [first] * 4
+        assert first is background_loop.loop
+
+    def test_exceptions_are_raised_in_the_caller(self, background_loop):
+        async def fail():
+            raise ValueError("bad")
+
+        with pytest.raises(ValueError, match="bad"):
+            background_loop.run(fail())
+
+    def test_timeout_cancels_the_coroutine(self, background_loop):
+        cancelled = threading.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(TimeoutError):
+            background_loop.run(slow(), timeout=0.05)
+        assert cancelled.wait(1)
+
+    def test_iterate_closes_generator_when_stopped_early(self, background_loop):
+        closed = threading.Event()
+
+        async def numbers():
+            try:
+                for i in range(100):
+                    yield i
+            finally:
+                closed.set()
+
+        items = background_loop.iterate(numbers())
+        assert [next(items) for _ in range(3)] == [0, 1, 2]
+        items.close()
+
+        assert closed.is_set()
+        assert list(background_loop.iterate(numbers())) == list(range(100))
+
+    def test_shutdown_cancels_pending_tasks(self, background_loop):
+        cancelled = threading.Event()
+
+        async def forever():
+            try:
+                await asyncio.sleep(100)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        background_loop.submit(forever())
+        loop = background_loop.loop
+        background_loop.shutdown()
+
+        assert cancelled.is_set()
+        assert loop.is_closed()
+
+
+class FakeMCPClientManager:
+    """Only works on the loop it connected on, like a real MCP client session."""
+
+    def __init__(self):
+        self.loop = None
+        self.connections = 0
+
+    async def connect_to_server(self, server_name, command, args=None):
+        self.loop = asyncio.get_running_loop()
+        self.connections += 1
+
+    def _check_loop(self):
+        assert asyncio.get_running_loop() is self.loop, "session used from another event loop"
+
+    async def list_tools(self, server_name=None):
+        self._check_loop()
+        return [types.SimpleNamespace(name="search", description="Search", inputSchema={}, metadata=None)]
+
+    async def call_tool(self, server_name, tool_name, arguments):
+        self._check_loop()
+        return types.SimpleNamespace(content=types.SimpleNamespace(text=f"{tool_name}({arguments['q']})"))
+
+
+async def async_interpreter(question, vector_name, chat_history, callback, **kwargs):
+    for token in ["Hello", " there.", " Bye."]:
+        await callback.async_on_llm_new_token(token)
+    await callback.async_on_llm_end("Hello there. Bye.")
+    return {"answer": "Hello there. Bye."}
+
+
+@pytest.fixture
+def flask_client(monkeypatch, tmp_path):
+    flask = pytest.importorskip("flask")
+    from sunholo.agents.flask import vac_routes
+
+    monkeypatch.setenv("VAC_CONFIG_FOLDER", str(tmp_path))
+    monkeypatch.setattr(vac_routes, "MCPClientManager", FakeMCPClientManager)
+    monkeypatch.setattr(vac_routes, "queue_archive_qa", lambda *args, **kwargs: None)
+
+    app = flask.Flask(__name__)
+    routes = vac_routes.VACRoutes(app, async_interpreter, add_langfuse_eval=False,
+                                  mcp_servers=[{"name": "search", "command": "search-server"}])
+    # wait for the MCP connections started in the background
+    routes.background_loop.run(asyncio.sleep(0))
+    return routes, app.test_client()
+
+
+def test_mcp_sessions_are_reused_across_requests(flask_client):
+    routes, client = flask_client
+
+    for _ in range(3):
+        assert client.get("/mcp/tools").get_json()["tools"][0]["name"] == "search"
+        response = client.post("/mcp/call", json={"server": "search", "tool": "search", "arguments": {"q": "x"}})
+        assert response.get_json() == {"result": "search(x)"}
+
+    assert routes.mcp_client_manager.connections == 1
+
+
+def test_async_stream_interpreter_streams_on_background_loop(flask_client):
+    _, client = flask_client
+
+    response = client.post("/vac/streaming/my_vac", json={"user_input": "hi"})
+
+    assert response.status_code == 200
+    assert response.get_data(as_text=True) == 'Hello there. Bye.{"answer": "Hello there. Bye."}'
@@ -0,0 +1,114 @@
+"""Tests for in-process per-page PDF parsing in sunholo.chunker.pdfs and loaders."""
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pypdf")
+pytest.importorskip("langchain")
+
+from sunholo.chunker import loaders, pdfs
+
+
+def write_pdf(path, page_count):
+    """Writes a minimal PDF whose page N contains the text 'Page N'."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(1, page_count + 1):
+        stream = f"BT /F1 12 Tf 72 720 Td (Page {page}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        content_ref = len(objects)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_ref} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {page_count} >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    path.write_bytes(out)
+    return path
+
+
+@pytest.mark.parametrize("page_count, max_workers", [(3, 4), (40, 1), (40, 4)])
+def test_page_texts_are_in_order(tmp_path, page_count, max_workers):
+    pdf = write_pdf(tmp_path / "doc.pdf", page_count)
+
+    texts = pdfs.extract_pdf_page_texts(pdf, max_workers=max_workers)
+
+    assert [text.strip() for text in texts] == [f"Page {page}" for page in range(1, page_count + 1)]
+
+
+def test_worker_processes_are_not_forked(tmp_path, monkeypatch):
+    start_methods = []
+    executor = pdfs.ProcessPoolExecutor
+
+    def recording_executor(*args, mp_context=None, **kwargs):
+        start_methods.append(mp_context.get_start_method() if mp_context else None)
+        return executor(*args, mp_context=mp_context, **kwargs)
+
+    monkeypatch.setattr(pdfs, "ProcessPoolExecutor", recording_executor)
+    pdf = write_pdf(tmp_path / "doc.pdf", 16)
+
+    texts = pdfs.extract_pdf_page_texts(pdf, max_workers=2)
+
+    assert len(texts) == 16
+    assert start_methods and all(method in ("forkserver", "spawn") for method in start_methods)
+
+
+def test_read_pdf_file(tmp_path):
+    pdf = write_pdf(tmp_path / "doc.pdf", 20)
+
+    doc = pdfs.read_pdf_file(pdf, metadata={"source": "doc.pdf"}, max_workers=2)
+
+    assert doc.page_content.split("\n")[:3] == ["Page 1", "Page 2", "Page 3"]
+    assert doc.page_content.rstrip().endswith("Page 20")
+    assert doc.metadata == {"source": "doc.pdf"}
+
+
+def test_pages_are_parsed_concurrently_in_page_order(monkeypatch):
+    from langchain.schema import Document
+
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_read_file_to_documents(page, metadata=None):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        # later pages finish first
+        time.sleep(0.01 * (10 - int(page.split("_p")[1])))
+        with lock:
+            running -= 1
+        docs = [Document(page_content=f"{page} element {i}", metadata={"page_number": 1}) for i in range(2)]
+        for doc in docs:
+            doc.metadata.update(metadata)
+        return docs
+
+    monkeypatch.setattr(loaders, "read_file_to_documents", fake_read_file_to_documents)
+    pages = [f"doc_p{page:02d}" for page in range(1, 10)]
+
+    docs = loaders.read_pdf_pages_to_documents(pages, metadata={"source": "doc.pdf"}, max_workers=3)
+
+    assert [doc.page_content for doc in docs] == [f"{page} element {i}" for page in pages for i in range(2)]
+    assert [doc.metadata["page_number"] for doc in docs] == [page for page in range(1, 10) for _ in range(2)]
+    assert all(doc.metadata["source"] == "doc.pdf" for doc in docs)
+    assert peak == 3
+
+
+def test_failed_page_is_skipped(monkeypatch):
+    monkeypatch.setattr(loaders, "read_file_to_documents", lambda page, metadata=None: None)
+    assert loaders.read_pdf_pages_to_documents(["a_p01", "a_p02"], metadata={}) == []
+
+
+def test_pdf_parse_config_defaults():
+    assert pdfs.pdf_parse_config() == (pdfs.PDF_FANOUT_PAGES, pdfs.PDF_PARSE_WORKERS)
@@ -0,0 +1,98 @@
+"""Tests for linear-time document assembly in sunholo.chunker.splitter and doc_handling."""
+import json
+import time
+
+import pytest
+
+pytest.importorskip("langchain")
+
+from langchain.schema import Document
+
+from sunholo.chunker import doc_handling, splitter
+
+# Budget for a synthetic 10k element document, the quadratic versions took several seconds
+BENCHMARK_ELEMENTS = 10_000
+BENCHMARK_BUDGET_SECONDS = 2.0
+
+
+def make_elements(count, text="Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 3):
+    return [Document(page_content=f"{i} {text}", metadata={"objectId": "gs://bucket/big.pdf", "element": i})
+            for i in range(count)]
+
+
+@pytest.fixture(autouse=True)
+def no_side_effects(monkeypatch):
+    monkeypatch.setattr(splitter, "send_doc_to_docstore", lambda docs, vector_name: (None, docs))
+    monkeypatch.setattr(splitter, "summarise_docs", lambda docs, vector_name: None)
+    monkeypatch.setattr(splitter, "upload_doc_images", lambda metadata: None)
+    monkeypatch.setattr(doc_handling, "upload_doc_images", lambda metadata: None)
+
+
+def test_small_documents_are_combined():
+    docs = [Document(page_content="short one", metadata={"objectId": "a"}),
+            Document(page_content="short\ttwo", metadata={"objectId": "a"}),
+            Document(page_content="x" * 900, metadata={"objectId": "b"})]
+
+    chunks = splitter.chunk_doc_to_docs(docs, extension=".txt", min_size=50, chunk_size=1024, chunk_overlap=0)
+
+    assert [chunk.page_content for chunk in chunks] == ["short one\nshort two\n", "x" * 900]
+    assert all(chunk.metadata["doc_id"] for chunk in chunks)
+
+
+def test_small_chunks_are_prepended_to_the_next_chunk():
+    text = "tiny\n\n" + "a" * 60 + "\n\n" + "b" * 60
+    docs = [Document(page_content=text, metadata={"objectId": "a"})]
+
+    chunks = splitter.chunk_doc_to_docs(docs, extension=".txt", min_size=20, chunk_size=62, chunk_overlap=0)
+
+    assert [chunk.page_content for chunk in chunks] == ["tiny\n" + "a" * 60, "b" * 60]
+
+
+def test_iter_doc_chunks_is_lazy():
+    docs = [Document(page_content="x" * 900, metadata={"objectId": f"doc-{i}"}) for i in range(3)]
+
+    chunks = splitter.iter_doc_chunks(docs, extension=".txt", min_size=100)
+    first = next(chunks)
+
+    assert first.page_content == "x" * 900
+    assert "doc_id" not in docs[2].metadata
+    assert len(list(chunks)) == 2
+
+
+def test_empty_documents():
+    assert splitter.chunk_doc_to_docs([]) is None
+    assert list(splitter.iter_doc_chunks([])) == []
+
+
+def test_create_big_doc_joins_content():
+    docs = [Document(page_content="one\ttwo", metadata={"objectId": "a", "page": 1}),
+            Document(page_content="three", metadata={"objectId": "a", "page": 2})]
+
+    doc_id, big_doc, docs = doc_handling.create_big_doc(docs)
+
+    assert big_doc.page_content == "\none two\nthree"
+    assert big_doc.metadata["char_count"] == len(big_doc.page_content)
+    assert len(json.loads(big_doc.metadata["chunk_metadata"])) == 2
+    assert docs[1].metadata["docstore_doc_id"] == str(doc_id)
+
+
+def test_create_big_doc_benchmark():
+    docs = make_elements(BENCHMARK_ELEMENTS)
+
+    start = time.perf_counter()
+    _, big_doc, _ = doc_handling.create_big_doc(docs)
+    elapsed = time.perf_counter() - start
+
+    assert big_doc.page_content.count("\n") == BENCHMARK_ELEMENTS
+    assert elapsed < BENCHMARK_BUDGET_SECONDS, f"create_big_doc took {elapsed:.2f}s"
+
+
+def test_chunk_doc_to_docs_benchmark():
+    docs = make_elements(BENCHMARK_ELEMENTS)
+
+    start = time.perf_counter()
+    chunks = splitter.chunk_doc_to_docs(docs, extension=".txt", min_size=800)
+    elapsed = time.perf_counter() - start
+
+    assert f"{BENCHMARK_ELEMENTS - 1} Lorem" in chunks[-1].page_content
+    assert elapsed < BENCHMARK_BUDGET_SECONDS, f"chunk_doc_to_docs took {elapsed:.2f}s"
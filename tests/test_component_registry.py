@@ -0,0 +1,74 @@
+"""Tests for sunholo.components.registry."""
+import threading
+import time
+
+from sunholo.components.registry import ComponentRegistry, embeddings_key
+
+
+class TestComponentRegistry:
+    def test_reuses_component(self):
+        registry = ComponentRegistry()
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return object()
+
+        first = registry.get_or_create(("vectorstore", "vac", "lancedb"), factory)
+        second = registry.get_or_create(("vectorstore", "vac", "lancedb"), factory)
+        assert first is second
+        assert len(calls) == 1
+
+    def test_ttl_expiry(self):
+        registry = ComponentRegistry(ttl=0.01)
+        first = registry.get_or_create(("x", "vac"), object)
+        time.sleep(0.02)
+        assert registry.get_or_create(("x", "vac"), object) is not first
+
+    def test_none_is_not_cached(self):
+        registry = ComponentRegistry()
+        assert registry.get_or_create(("x", "vac"), lambda: None) is None
+        assert len(registry) == 0
+
+    def test_invalidate_by_vector_name(self):
+        registry = ComponentRegistry()
+        registry.get_or_create(("x", "vac_a"), object)
+        registry.get_or_create(("x", "vac_b"), object)
+        registry.invalidate("vac_a")
+        assert len(registry) == 1
+        registry.invalidate()
+        assert len(registry) == 0
+
+    def test_lru_eviction(self):
+        registry = ComponentRegistry(max_size=2)
+        for name in ["a", "b", "c"]:
+            registry.get_or_create(("x", name), object)
+        assert len(registry) == 2
+
+    def test_concurrent_callers_build_once(self):
+        registry = ComponentRegistry()
+        calls = []
+
+        def slow_factory():
+            calls.append(1)
+            time.sleep(0.05)
+            return object()
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            registry.get_or_create(("x", "vac"), slow_factory))) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert len({id(r) for r in results}) == 1
+
+    def test_embeddings_key_uses_model(self):
+        class FakeEmbeddings:
+            def __init__(self, model):
+                self.model = model
+
+        assert embeddings_key(FakeEmbeddings("m1")) == embeddings_key(FakeEmbeddings("m1"))
+        assert embeddings_key(FakeEmbeddings("m1")) != embeddings_key(FakeEmbeddings("m2"))
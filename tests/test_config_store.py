@@ -0,0 +1,121 @@
+"""Tests for the shared config store behind sunholo.utils.ConfigManager."""
+import os
+
+import pytest
+
+from sunholo.utils import ConfigManager
+from sunholo.utils.config_store import ConfigStore, config_store
+
+
+VAC_CONFIG = """kind: vacConfig
+apiVersion: v1
+vac:
+  my_vac:
+    agent: langserve
+    llm: {llm}
+"""
+
+
+def write_config(folder, llm="vertex", filename="vac_config.yaml"):
+    path = folder / filename
+    path.write_text(VAC_CONFIG.format(llm=llm))
+    return path
+
+
+@pytest.fixture
+def count_parses(monkeypatch):
+    parses = []
+    original = ConfigStore._parse
+
+    def counting_parse(raw, filename):
+        parses.append(filename)
+        return original(raw, filename)
+
+    monkeypatch.setattr(ConfigStore, "_parse", staticmethod(counting_parse))
+    return parses
+
+
+class TestConfigStore:
+    def test_unchanged_files_are_parsed_once(self, tmp_path, count_parses):
+        write_config(tmp_path)
+        store = ConfigStore(check_interval=0)
+
+        for _ in range(10):
+            configs = store.load_folder(str(tmp_path))
+
+        assert configs["vacConfig"]["vac"]["my_vac"]["llm"] == "vertex"
+        assert count_parses == ["vac_config.yaml"]
+
+    def test_touched_file_with_same_contents_is_not_reparsed(self, tmp_path, count_parses):
+        path = write_config(tmp_path)
+        store = ConfigStore(check_interval=0)
+        store.load_folder(str(tmp_path))
+        generation = store.generation
+
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+        store.load_folder(str(tmp_path))
+
+        assert count_parses == ["vac_config.yaml"]
+        assert store.generation == generation
+
+    def test_changed_file_bumps_generation_and_calls_callbacks(self, tmp_path):
+        path = write_config(tmp_path)
+        store = ConfigStore(check_interval=0)
+        changed = []
+        store.register_reload_callback(changed.append)
+        store.load_folder(str(tmp_path))
+        generation = store.generation
+
+        write_config(tmp_path, llm="openai")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+        configs = store.load_folder(str(tmp_path))
+
+        assert configs["vacConfig"]["vac"]["my_vac"]["llm"] == "openai"
+        assert store.generation == generation + 1
+        assert changed == ["vac_config.yaml"]
+
+    def test_folders_are_not_rechecked_within_interval(self, tmp_path, count_parses):
+        write_config(tmp_path)
+        store = ConfigStore(check_interval=60)
+        store.load_folder(str(tmp_path))
+
+        write_config(tmp_path, llm="a-longer-llm-name")
+        configs = store.load_folder(str(tmp_path))
+
+        assert configs["vacConfig"]["vac"]["my_vac"]["llm"] == "vertex"
+        assert store.load_folder(str(tmp_path), force=True)["vacConfig"]["vac"]["my_vac"]["llm"] == "a-longer-llm-name"
+
+    def test_merging_folders_does_not_modify_parsed_configs(self, tmp_path):
+        global_folder = tmp_path / "global"
+        local_folder = tmp_path / "local"
+        global_folder.mkdir()
+        local_folder.mkdir()
+        write_config(global_folder, llm="vertex")
+        write_config(local_folder, llm="openai")
+        store = ConfigStore(check_interval=0)
+
+        merged = store.load_folders([str(global_folder), str(local_folder)])
+
+        assert merged["vacConfig"]["vac"]["my_vac"]["llm"] == "openai"
+        assert store.load_folder(str(global_folder))["vacConfig"]["vac"]["my_vac"]["llm"] == "vertex"
+        assert store.load_folders([str(global_folder), str(local_folder)]) is merged
+
+
+class TestConfigManagerSharing:
+    def test_instances_share_parsed_configs(self, tmp_path, monkeypatch, count_parses):
+        write_config(tmp_path)
+        monkeypatch.setenv("VAC_CONFIG_FOLDER", str(tmp_path))
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(config_store, "check_interval", 0)
+        ConfigManager.clear_instance_cache()
+        try:
+            first = ConfigManager("my_vac")
+            second = ConfigManager("other_vac", validate=False)
+
+            assert first.vacConfig("llm") == "vertex"
+            assert second.configs_by_kind["vacConfig"] is first.configs_by_kind["vacConfig"]
+            assert count_parses.count("vac_config.yaml") == 1
+        finally:
+            ConfigManager.clear_instance_cache()
@@ -0,0 +1,83 @@
+"""Tests for batch embedding in sunholo.embedder.embed_chunk."""
+import base64
+import json
+
+import pytest
+
+from sunholo.embedder import embed_chunk
+from sunholo.langchain_types import Document
+
+
+class FakeVectorStore:
+    def __init__(self, name):
+        self.name = name
+        self.calls = []
+
+    def add_documents(self, docs, ids=None):
+        self.calls.append((docs, ids))
+
+
+def make_message(vector_name, content, **metadata):
+    payload = {"page_content": content,
+               "metadata": {"vector_name": vector_name, "source": "test", **metadata}}
+    data = base64.b64encode(json.dumps(payload).encode("utf-8")).decode("utf-8")
+    return {"message": {"data": data, "messageId": "1", "publishTime": "now"}}
+
+
+@pytest.fixture
+def fake_stores(monkeypatch):
+    stores = {}
+
+    def pick_vectorstore(vs_str, vector_name=None, embeddings=None, **kwargs):
+        return stores.setdefault((vs_str, vector_name), FakeVectorStore(vs_str))
+
+    memories = [{"main": {"vectorstore": "lancedb"}},
+                {"backup": {"vectorstore": "alloydb"}},
+                {"readonly": {"vectorstore": "supabase", "read_only": True}}]
+
+    monkeypatch.setattr(embed_chunk, "Document", Document)
+    monkeypatch.setattr(embed_chunk, "ConfigManager", lambda vector_name: vector_name)
+    monkeypatch.setattr(embed_chunk, "get_cached_embeddings", lambda config=None: "embeddings")
+    monkeypatch.setattr(embed_chunk, "load_memories", lambda config=None: memories)
+    monkeypatch.setattr(embed_chunk, "get_cached_vectorstore", pick_vectorstore)
+    return stores
+
+
+class TestEmbedPubsubChunks:
+    def test_one_bulk_write_per_store(self, fake_stores):
+        messages = [make_message("vac_a", "x" * 150, doc_id=f"id-{i}") for i in range(50)]
+
+        result = embed_chunk.embed_pubsub_chunks(messages)
+
+        assert set(fake_stores) == {("lancedb", "vac_a"), ("alloydb", "vac_a")}
+        for store in fake_stores.values():
+            assert len(store.calls) == 1
+            docs, ids = store.calls[0]
+            assert len(docs) == 50
+            assert ids == [f"id-{i}" for i in range(50)]
+        assert len(result["metadata"]) == 100
+        assert result["failed_indexes"] == set()
+
+    def test_groups_by_vector_name_and_skips_short_chunks(self, fake_stores):
+        messages = [make_message("vac_a", "x" * 150, doc_id="a"),
+                    make_message("vac_b", "x" * 150, doc_id="b"),
+                    make_message("vac_a", "too short", doc_id="c")]
+
+        result = embed_chunk.embed_pubsub_chunks(messages)
+
+        assert len(fake_stores[("lancedb", "vac_a")].calls[0][0]) == 1
+        assert len(fake_stores[("lancedb", "vac_b")].calls[0][0]) == 1
+        assert result["skipped"] == {2: "Too little characters"}
+
+    def test_failed_store_marks_messages_for_retry(self, fake_stores):
+        def failing_add(docs, ids=None):
+            raise RuntimeError("store down")
+
+        fake_stores[("alloydb", "vac_a")] = FakeVectorStore("alloydb")
+        fake_stores[("alloydb", "vac_a")].add_documents = failing_add
+        messages = [make_message("vac_a", "x" * 150, doc_id=f"id-{i}") for i in range(3)]
+
+        result = embed_chunk.embed_pubsub_chunks(messages)
+
+        assert result["failed_indexes"] == {0, 1, 2}
+        assert len(fake_stores[("lancedb", "vac_a")].calls) == 1
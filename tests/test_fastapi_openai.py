@@ -0,0 +1,162 @@
+"""Tests for the OpenAI-compatible endpoint of VACRoutesFastAPI with sync interpreters."""
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from sunholo.agents.fastapi import vac_routes
+from sunholo.agents.fastapi.vac_routes import OpenAIChunkEnvelope, VACRoutesFastAPI
+
+TOKENS = ["Hello", " there.", " How", " are", " you?"]
+ANSWER = "".join(TOKENS)
+
+
+def sync_interpreter(question, vector_name, chat_history, callback, **kwargs):
+    for token in TOKENS:
+        callback.on_llm_new_token(token)
+        time.sleep(0.05)
+    callback.on_llm_end(ANSWER)
+    return {"answer": ANSWER}
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    # the MCP server isn't under test here
+    monkeypatch.setattr(vac_routes, "VACMCPServer", None)
+
+    def make(interpreter, **kwargs):
+        app = FastAPI()
+        routes = VACRoutesFastAPI(app, interpreter, **kwargs)
+        return routes, TestClient(app)
+    return make
+
+
+def openai_request(stream):
+    return {"model": "my_vac", "stream": stream, "messages": [{"role": "user", "content": "hi"}]}
+
+
+class FakeRequest:
+    def __init__(self, data):
+        self.data = data
+
+    async def json(self):
+        return dict(self.data)
+
+
+async def read_events(routes):
+    """Returns the (data, seconds since start) of each SSE event, timed as the app yields them."""
+    events = []
+    start = time.perf_counter()
+    response = await routes.handle_openai_compatible(FakeRequest(openai_request(True)))
+    async for event in response.body_iterator:
+        assert event.startswith("data: ") and event.endswith("\n\n")
+        events.append((event[len("data: "):-2], time.perf_counter() - start))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_sync_interpreter_streams_deltas(make_client):
+    routes, _ = make_client(sync_interpreter)
+
+    events = await read_events(routes)
+
+    assert events[-1][0] == "[DONE]"
+    chunks = [json.loads(data) for data, _ in events[:-1]]
+    deltas = [chunk["choices"][0]["delta"].get("content") for chunk in chunks[:-1]]
+    assert "".join(deltas) == ANSWER
+    assert len(deltas) > 1
+    assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+    assert {chunk["id"] for chunk in chunks} == {chunks[0]["id"]}
+    # the first sentence arrives before the interpreter has finished
+    assert events[0][1] < events[-1][1] - 0.1
+
+
+def test_sync_interpreters_run_in_their_own_pool(make_client):
+    threads = set()
+
+    def recording_interpreter(question, vector_name, chat_history, callback, **kwargs):
+        threads.add(threading.current_thread().name)
+        return sync_interpreter(question, vector_name, chat_history, callback, **kwargs)
+
+    routes, client = make_client(recording_interpreter, interpreter_workers=2)
+    assert routes.interpreter_executor._max_workers == 2
+
+    response = client.post("/openai/v1/chat/completions", json=openai_request(False))
+
+    assert response.status_code == 200
+    assert response.json()["choices"][0]["message"]["content"] == ANSWER
+    assert all(name.startswith("vac-interpreter") for name in threads)
+
+
+def test_chunk_envelope_matches_full_serialisation():
+    envelope = OpenAIChunkEnvelope("abc", "my_vac", "1.0")
+
+    def parse(event):
+        assert event.startswith("data: ") and event.endswith("\n\n")
+        return json.loads(event[len("data: "):])
+
+    chunk = parse(envelope.delta('say "hi"\n'))
+    final = parse(envelope.delta("all", final=True))
+
+    assert chunk == {"id": "abc", "object": "chat.completion.chunk", "created": chunk["created"],
+                     "model": "my_vac",
+                     "choices": [{"index": 0, "delta": {"content": 'say "hi"\n'}, "finish_reason": None}]}
+    assert final["system_fingerprint"] == "1.0"
+    assert final["choices"][0]["logprobs"] is None
+    assert parse(envelope.stop)["choices"][0]["finish_reason"] == "stop"
+
+
+def test_lifespan_closes_http_sessions_and_flushes_archive(make_client, monkeypatch):
+    from sunholo.utils import http_sessions
+
+    flushes = []
+    monkeypatch.setattr(vac_routes, "flush_archive", lambda timeout=None: flushes.append(timeout))
+    routes, client = make_client(sync_interpreter)
+    with client:
+        session = http_sessions.get_http_session()
+
+    assert flushes == [vac_routes.ARCHIVE_FLUSH_TIMEOUT]
+    assert http_sessions._session is None
+    assert http_sessions.get_http_session() is not session
+
+
+def test_interpreter_pool_is_shut_down_with_the_app(make_client):
+    routes, client = make_client(sync_interpreter)
+    assert routes._interpreter_executor is None
+
+    with client:
+        response = client.post("/openai/v1/chat/completions", json=openai_request(False))
+        assert response.status_code == 200
+        executor = routes.interpreter_executor
+
+    assert routes._interpreter_executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+
+
+@pytest.mark.asyncio
+async def test_mcp_lifespan_shuts_down_the_interpreter_pool(make_client):
+    from contextlib import asynccontextmanager
+
+    class FakeMCPApp:
+        @asynccontextmanager
+        async def lifespan(self, app):
+            yield
+
+    routes, _ = make_client(sync_interpreter)
+    routes.vac_mcp_server = type("FakeMCPServer", (), {"get_http_app": lambda self: FakeMCPApp()})()
+    executor = routes.interpreter_executor
+
+    async with routes.get_mcp_lifespan()(FastAPI()):
+        pass
+
+    assert routes._interpreter_executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
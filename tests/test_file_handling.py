@@ -0,0 +1,194 @@
+"""Tests for concurrent probing, handle caching and per-file timeouts in sunholo.genai.file_handling."""
+import threading
+import time
+import types
+
+import pytest
+
+from sunholo.genai import file_handling
+
+
+class FakeGenai:
+    """Stands in for the `google.generativeai` module."""
+
+    def __init__(self, existing=(), probe_latency=0.0, upload_latency=None):
+        self.existing = set(existing)
+        self.probe_latency = probe_latency
+        self.upload_latency = upload_latency or {}
+        self.probes = []
+        self.uploads = []
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def get_file(self, name):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.probe_latency)
+        with self.lock:
+            self.running -= 1
+            self.probes.append(name)
+        if name not in self.existing:
+            raise LookupError(f"{name} not found")
+        return f"existing:{name}"
+
+    def upload_file(self, path, name=None, mime_type=None, display_name=None):
+        time.sleep(self.upload_latency.get(display_name, 0))
+        with open(path, "rb") as f:
+            self.uploads.append((display_name, f.read()))
+        return f"uploaded:{display_name}"
+
+
+@pytest.fixture
+def gcs(monkeypatch):
+    objects = {}
+
+    def info(gs_uri):
+        obj = objects.get(gs_uri)
+        return (obj["generation"], len(obj["data"])) if obj else (None, None)
+
+    def download(gs_uri, file_path):
+        with open(file_path, "wb") as f:
+            f.write(objects[gs_uri]["data"])
+
+    monkeypatch.setattr(file_handling, "get_gcs_object_info", info)
+    monkeypatch.setattr(file_handling, "download_gcs_to_file", download)
+    file_handling.clear_file_handle_cache()
+    yield objects
+    file_handling.clear_file_handle_cache()
+
+
+def use_genai(monkeypatch, fake):
+    monkeypatch.setattr(file_handling, "genai", fake)
+    return fake
+
+
+def attachments(objects, count, generation=1):
+    gs_list = []
+    for i in range(count):
+        path = f"users/me/file_{i}.png"
+        objects[f"gs://bucket/{path}"] = {"generation": generation, "data": f"png {i}".encode()}
+        gs_list.append({"storagePath": path, "contentType": "image/png", "name": f"file_{i}.png",
+                        "url": f"https://example.com/{i}"})
+    return gs_list
+
+
+def file_data(content):
+    return [item["parts"][0]["file_data"] for item in content
+            if isinstance(item, dict) and "file_data" in item["parts"][0]]
+
+
+@pytest.mark.asyncio
+async def test_probes_run_concurrently(gcs, monkeypatch):
+    fake = use_genai(monkeypatch, FakeGenai(existing={f"file-{i}" for i in range(16)}, probe_latency=0.05))
+    gs_list = attachments(gcs, 16)
+
+    start = time.perf_counter()
+    content = await file_handling.construct_file_content(gs_list, "bucket")
+    elapsed = time.perf_counter() - start
+
+    assert content[::2] == [f"existing:file-{i}" for i in range(16)]
+    assert fake.peak == file_handling.PROBE_CONCURRENCY
+    assert elapsed < 16 * 0.05 / 2
+
+
+@pytest.mark.asyncio
+async def test_uploaded_handles_are_reused_until_the_object_changes(gcs, monkeypatch):
+    fake = use_genai(monkeypatch, FakeGenai())
+    gs_list = attachments(gcs, 3)
+
+    first = await file_handling.construct_file_content(gs_list, "bucket")
+    assert file_data(first) == [f"uploaded:file_{i}.png" for i in range(3)]
+    assert len(fake.uploads) == 3
+    probes = len(fake.probes)
+
+    second = await file_handling.construct_file_content(gs_list, "bucket")
+    assert second == first
+    assert len(fake.uploads) == 3
+    assert len(fake.probes) == probes
+
+    gcs["gs://bucket/users/me/file_1.png"] = {"generation": 2, "data": b"new png"}
+    await file_handling.construct_file_content(gs_list, "bucket")
+    assert fake.uploads[-1] == ("file_1.png", b"new png")
+    assert len(fake.uploads) == 4
+
+
+@pytest.mark.asyncio
+async def test_slow_file_times_out_alone(gcs, monkeypatch):
+    use_genai(monkeypatch, FakeGenai(upload_latency={"file_1.png": 1.0}))
+    gs_list = attachments(gcs, 3)
+
+    start = time.perf_counter()
+    content = await file_handling.construct_file_content(gs_list, "bucket", timeout=0.3)
+
+    assert time.perf_counter() - start < 0.9
+    assert file_data(content) == ["uploaded:file_0.png", "uploaded:file_2.png"]
+    assert "file_1.png could not be processed within the time limit" in content[1]["parts"][0]["text"]
+
+
+@pytest.mark.asyncio
+async def test_too_large_files_are_not_downloaded(gcs, monkeypatch):
+    fake = use_genai(monkeypatch, FakeGenai())
+    gs_list = attachments(gcs, 1)
+    gcs["gs://bucket/users/me/file_0.png"]["data"] = b"x" * (file_handling.MAX_UPLOAD_BYTES + 1)
+    monkeypatch.setattr(file_handling, "download_gcs_to_file",
+                        lambda gs_uri, file_path: pytest.fail("should not download"))
+
+    content = await file_handling.construct_file_content(gs_list, "bucket")
+
+    assert "too large" in content[0]["parts"][0]["text"]
+    assert fake.uploads == []
+
+
+@pytest.mark.asyncio
+async def test_genai_sdk_uses_one_shared_client(gcs, monkeypatch):
+    created = []
+
+    class FakeFiles:
+        def get(self, name):
+            raise LookupError(name)
+
+        def upload(self, path, config):
+            return f"uploaded:{config['display_name']}"
+
+    def make_client():
+        created.append(1)
+        return types.SimpleNamespace(files=FakeFiles())
+
+    monkeypatch.setattr(file_handling, "genaiv2", types.SimpleNamespace(Client=make_client))
+    file_handling._clients.pop("genai", None)
+    gs_list = attachments(gcs, 4)
+
+    try:
+        content = await file_handling.construct_file_content(gs_list, "bucket", genai_lib=True)
+    finally:
+        file_handling._clients.pop("genai", None)
+
+    assert content[::2] == [f"uploaded:file_{i}.png" for i in range(4)]
+    assert len(created) == 1
+
+
+def test_file_handle_cache_is_bounded(gcs, monkeypatch):
+    monkeypatch.setattr(file_handling, "FILE_HANDLE_CACHE_SIZE", 3)
+    for i in range(5):
+        file_handling._cache_file_content(f"gs://bucket/{i}", 1, "genai", [f"handle {i}"])
+    # a hit makes a handle most recently used
+    assert file_handling._cached_file_content("gs://bucket/2", 1, "genai") == ["handle 2"]
+    file_handling._cache_file_content("gs://bucket/5", 1, "genai", ["handle 5"])
+
+    assert [key[0] for key in file_handling._file_handle_cache] == \
+        ["gs://bucket/4", "gs://bucket/2", "gs://bucket/5"]
+    assert file_handling._cached_file_content("gs://bucket/0", 1, "genai") is None
+
+
+def test_expired_and_overwritten_handles_are_pruned(gcs, monkeypatch):
+    file_handling._cache_file_content("gs://bucket/doc", 1, "genai", ["v1"])
+    file_handling._cache_file_content("gs://bucket/doc", 2, "genai", ["v2"])
+    monkeypatch.setattr(file_handling, "FILE_HANDLE_TTL", -1)
+    file_handling._cache_file_content("gs://bucket/old", 1, "genai", ["expired"])
+    monkeypatch.setattr(file_handling, "FILE_HANDLE_TTL", 3600)
+    file_handling._cache_file_content("gs://bucket/new", 1, "genai", ["new"])
+
+    assert list(file_handling._file_handle_cache) == [
+        ("gs://bucket/doc", 2, "genai"), ("gs://bucket/new", 1, "genai")]
@@ -0,0 +1,235 @@
+"""Tests for the content fingerprint store that lets the chunk -> embed pipeline skip unchanged content."""
+import base64
+import json
+
+import pytest
+
+from fixtures.fake_pubsub import FakePublisherClient
+from sunholo.database import fingerprints
+from sunholo.database.fingerprints import SQLiteFingerprintStore, chunk_key, content_fingerprint
+from sunholo.embedder import embed_chunk
+from sunholo.langchain_types import Document
+from sunholo.pubsub import pubsub_manager
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteFingerprintStore(str(tmp_path / "fingerprints.sqlite"))
+    yield store
+    store.close()
+
+
+def make_chunk(content, source="gs://bucket/doc.pdf"):
+    return Document(page_content=content, metadata={"source": source})
+
+
+class TestSQLiteFingerprintStore:
+    def test_put_and_get(self, store):
+        assert store.get("vac", "doc:a") is None
+        store.put("vac", "doc:a", "hash-1")
+        store.put("vac", "doc:a", "hash-2")
+
+        assert store.get("vac", "doc:a") == "hash-2"
+        assert store.get("other_vac", "doc:a") is None
+        assert store.is_unchanged("vac", "doc:a", "hash-2")
+
+    def test_get_many_beyond_parameter_limit(self, store):
+        store.put_many("vac", {f"key-{i}": f"hash-{i}" for i in range(2000)})
+
+        found = store.get_many("vac", [f"key-{i}" for i in range(0, 2500, 2)])
+
+        assert len(found) == 1000
+        assert found["key-1998"] == "hash-1998"
+
+    def test_only_changed_chunks_pass_the_filter(self, store):
+        store.record_chunks("vac", [make_chunk("first"), make_chunk("second")])
+
+        chunks = [make_chunk("first"), make_chunk("second, edited"), make_chunk("first", source="other.pdf")]
+        changed = store.filter_changed_chunks("vac", chunks)
+
+        assert [(doc.page_content, doc.metadata["source"]) for doc in changed] == \
+            [("second, edited", "gs://bucket/doc.pdf"), ("first", "other.pdf")]
+
+    def test_stores_must_implement_get_many_and_put_many(self):
+        class GetOnlyStore(fingerprints.FingerprintStore):
+            def get_many(self, vector_name, keys):
+                return {}
+
+        with pytest.raises(TypeError):
+            GetOnlyStore()
+
+    def test_chunk_key_is_content_addressed(self):
+        assert chunk_key(make_chunk("same")) == chunk_key(make_chunk("same"))
+        assert chunk_key(make_chunk("same")) != chunk_key(make_chunk("different"))
+        assert chunk_key(make_chunk("same")).endswith(content_fingerprint("same"))
+
+
+class FakeConfig:
+    def __init__(self, store_config):
+        self.store_config = store_config
+
+    def vacConfig(self, key):
+        return self.store_config if key == "fingerprint_store" else None
+
+
+def test_stores_are_shared_per_config(tmp_path):
+    fingerprints.clear_fingerprint_stores()
+    config = FakeConfig({"type": "sqlite", "path": str(tmp_path / "shared.sqlite")})
+    try:
+        assert fingerprints.get_fingerprint_store("vac", config=config) is \
+            fingerprints.get_fingerprint_store("other_vac", config=config)
+        assert fingerprints.get_fingerprint_store("vac", config=FakeConfig(None)) is None
+    finally:
+        fingerprints.clear_fingerprint_stores()
+
+
+class FakeVectorStore:
+    def __init__(self):
+        self.docs = []
+        self.fail = False
+
+    def add_documents(self, docs, ids=None):
+        if self.fail:
+            raise RuntimeError("store down")
+        self.docs.extend(docs)
+
+    def as_retriever(self, **kwargs):
+        # embed_pubsub_chunk writes through the retriever
+        return self
+
+
+def make_message(content, source="gs://bucket/doc.pdf"):
+    payload = {"page_content": content, "metadata": {"vector_name": "vac", "source": source, "doc_id": "id"}}
+    data = base64.b64encode(json.dumps(payload).encode("utf-8")).decode("utf-8")
+    return {"message": {"data": data, "messageId": "1", "publishTime": "now"}}
+
+
+@pytest.fixture
+def embedder(monkeypatch, store):
+    vectorstore = FakeVectorStore()
+    monkeypatch.setattr(embed_chunk, "Document", Document)
+    monkeypatch.setattr(embed_chunk, "ConfigManager", lambda vector_name: vector_name)
+    monkeypatch.setattr(embed_chunk, "get_cached_embeddings", lambda config=None: "embeddings")
+    monkeypatch.setattr(embed_chunk, "load_memories", lambda config=None: [{"main": {"vectorstore": "lancedb"}}])
+    monkeypatch.setattr(embed_chunk, "get_cached_vectorstore", lambda *args, **kwargs: vectorstore)
+    monkeypatch.setattr(embed_chunk, "get_fingerprint_store", lambda vector_name, config=None: store)
+    return vectorstore
+
+
+class TestEmbedder:
+    def test_only_changed_chunks_are_re_embedded(self, embedder):
+        first = [make_message(f"paragraph {i} " * 20) for i in range(5)]
+        embed_chunk.embed_pubsub_chunks(first)
+        assert len(embedder.docs) == 5
+
+        # the document is updated: one paragraph edited, one added
+        updated = first[:4] + [make_message("paragraph 4 edited " * 20), make_message("paragraph 5 " * 20)]
+        result = embed_chunk.embed_pubsub_chunks(updated)
+
+        assert len(embedder.docs) == 7
+        assert result["skipped"] == {i: "Unchanged content" for i in range(4)}
+
+    def test_failed_writes_are_not_recorded(self, embedder):
+        embedder.fail = True
+        result = embed_chunk.embed_pubsub_chunks([make_message("content " * 20)])
+        assert result["failed_indexes"] == {0}
+
+        embedder.fail = False
+        result = embed_chunk.embed_pubsub_chunks([make_message("content " * 20)])
+        assert result["skipped"] == {}
+        assert len(embedder.docs) == 1
+
+    def test_single_chunk_is_skipped_once_embedded(self, embedder):
+        message = make_message("content " * 20)
+        assert embed_chunk.embed_pubsub_chunk(message)
+        assert embed_chunk.embed_pubsub_chunk(message) == "Unchanged content"
+        assert len(embedder.docs) == 1
+
+
+def test_publish_chunks_skips_embedded_chunks(monkeypatch, store):
+    from sunholo.chunker import publish
+
+    fake = FakePublisherClient()
+    monkeypatch.setattr(pubsub_manager, "get_publisher_client", lambda project_id, topic, batch_settings=None: fake)
+    if pubsub_manager.pubsub_v1 is None:
+        monkeypatch.setattr(pubsub_manager, "pubsub_v1", object())
+    pubsub_manager.clear_publisher_cache()
+    monkeypatch.setattr(publish, "get_gcp_project", lambda: "proj")
+    monkeypatch.setattr(publish, "get_fingerprint_store", lambda vector_name: store)
+
+    chunks = [make_chunk(f"chunk number {i}") for i in range(10)]
+    store.record_chunks("vac", chunks[:7])
+
+    try:
+        summary = publish.publish_chunks(chunks, "vac")
+    finally:
+        pubsub_manager.clear_publisher_cache()
+
+    assert summary["published"] == 3
+    assert summary["unchanged"] == 7
+    assert [json.loads(data)["page_content"] for _, data, _ in fake.messages] == \
+        [f"chunk number {i}" for i in range(7, 10)]
+
+
+class FakeBlob:
+    def download_to_filename(self, path):
+        with open(path, "w") as f:
+            f.write("some text")
+
+
+class FakeStorageClient:
+    def get_bucket(self, bucket_name):
+        return type("Bucket", (), {"blob": lambda self, name: FakeBlob()})()
+
+
+class FailingStore(SQLiteFingerprintStore):
+    def get_many(self, vector_name, keys):
+        raise ConnectionError("fingerprint database is down")
+
+
+@pytest.fixture
+def gcs_chunker(monkeypatch):
+    """handle_gcs_message for a text file, with the chunks sharing the metadata dict like the loaders do."""
+    from sunholo.chunker import message_data
+
+    def use_store(fingerprint_store):
+        monkeypatch.setattr(message_data, "get_fingerprint_store", lambda vector_name: fingerprint_store)
+        return message_data.handle_gcs_message
+
+    monkeypatch.setattr(message_data, "storage", type("storage", (), {"Client": FakeStorageClient}))
+    monkeypatch.setattr(message_data, "pdf_parse_config", lambda vector_name: (10, 1))
+    monkeypatch.setattr(message_data.loaders, "read_file_to_documents",
+                        lambda page, metadata: [Document(page_content="some text", metadata=metadata)])
+    monkeypatch.setattr(message_data, "chunk_doc_to_docs", lambda docs, suffix, vector_name: docs)
+    return use_store
+
+
+def test_chunker_processes_files_when_the_store_fails(gcs_chunker, tmp_path):
+    failing = FailingStore(str(tmp_path / "failing.sqlite"))
+    try:
+        chunks, metadata = gcs_chunker(failing)("gs://bucket/doc.txt", {}, "vac")
+    finally:
+        failing.close()
+
+    assert [chunk.page_content for chunk in chunks] == ["some text"]
+    assert "content_fingerprint" not in metadata
+    assert "fingerprint_key" not in metadata
+
+
+def test_fingerprint_stays_out_of_chunk_metadata(gcs_chunker, store, monkeypatch):
+    from sunholo.chunker import process_chunker_data
+
+    published = []
+    monkeypatch.setattr(process_chunker_data, "process_docs_chunks_vector_name",
+                        lambda chunks, vector_name, metadata: published.append((chunks, dict(metadata))) or metadata)
+    monkeypatch.setattr(process_chunker_data, "get_fingerprint_store", lambda vector_name: store)
+
+    chunks, metadata = gcs_chunker(store)("gs://bucket/doc.txt", {}, "vac")
+    returned = process_chunker_data.format_chunk_return(chunks, metadata, "vac")
+
+    internal_keys = {"content_fingerprint", "fingerprint_key"}
+    assert not internal_keys & set(chunks[0].metadata)
+    assert not internal_keys & set(published[0][1])
+    assert not internal_keys & set(returned)
+    # recorded, so the unchanged file is skipped next time
+    assert gcs_chunker(store)("gs://bucket/doc.txt", {}, "vac") == (None, None)
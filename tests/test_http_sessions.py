@@ -0,0 +1,115 @@
+"""Tests that send_to_qa / send_to_qa_async reuse pooled keep-alive connections."""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from sunholo.agents import dispatch_to_qa
+from sunholo.utils import http_sessions
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.client_ports.append(self.client_address[1])
+        self.server.cookies.append(self.headers.get("Cookie"))
+        body = json.dumps({"answer": "ok"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Set-Cookie", "affinity=user-a; Path=/")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def qa_server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RecordingHandler)
+    server.client_ports = []
+    server.cookies = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    endpoint = f"http://127.0.0.1:{server.server_port}/vac/my_vac"
+
+    monkeypatch.setattr(dispatch_to_qa, "prep_request_payload",
+                        lambda user_input, chat_history, vector_name, stream, **kwargs: (endpoint, {"user_input": user_input}))
+    monkeypatch.setattr(dispatch_to_qa, "get_header", lambda vector_name: {})
+
+    async def fake_header_async(vector_name):
+        return {}
+    monkeypatch.setattr(dispatch_to_qa, "get_header_async", fake_header_async)
+
+    http_sessions.close_http_session()
+    yield server
+    http_sessions.close_http_session()
+    server.shutdown()
+    server.server_close()
+
+
+def test_sync_session_is_shared():
+    assert http_sessions.get_http_session() is http_sessions.get_http_session()
+
+
+def test_send_to_qa_reuses_connection(qa_server):
+    for _ in range(5):
+        assert dispatch_to_qa.send_to_qa("hi", "my_vac", []) == {"answer": "ok"}
+
+    assert len(qa_server.client_ports) == 5
+    assert len(set(qa_server.client_ports)) == 1
+
+
+def test_sync_session_does_not_send_upstream_cookies(qa_server):
+    for _ in range(2):
+        dispatch_to_qa.send_to_qa("hi", "my_vac", [])
+
+    assert qa_server.cookies == [None, None]
+    assert len(http_sessions.get_http_session().cookies) == 0
+
+
+@pytest.mark.asyncio
+async def test_async_session_does_not_send_upstream_cookies(qa_server, monkeypatch):
+    # aiohttp's default jar ignores cookies from IP addresses, so use a host name
+    endpoint = f"http://localhost:{qa_server.server_port}/vac/my_vac"
+    monkeypatch.setattr(dispatch_to_qa, "prep_request_payload",
+                        lambda user_input, chat_history, vector_name, stream, **kwargs: (endpoint, {"user_input": user_input}))
+    try:
+        for _ in range(2):
+            [r async for r in dispatch_to_qa.send_to_qa_async("hi", "my_vac", [])]
+
+        assert qa_server.cookies == [None, None]
+    finally:
+        await http_sessions.close_aiohttp_session()
+
+
+def test_background_loop_closes_its_aiohttp_session():
+    from sunholo.streaming import BackgroundEventLoop
+
+    background_loop = BackgroundEventLoop(name="test-session-loop")
+
+    async def open_session():
+        return http_sessions.get_aiohttp_session()
+
+    session = background_loop.run(open_session())
+    background_loop.shutdown()
+
+    assert session.closed
+
+
+@pytest.mark.asyncio
+async def test_send_to_qa_async_reuses_connection(qa_server):
+    try:
+        for _ in range(5):
+            responses = [r async for r in dispatch_to_qa.send_to_qa_async("hi", "my_vac", [])]
+            assert responses == [{"answer": "ok"}]
+
+        assert http_sessions.get_aiohttp_session() is http_sessions.get_aiohttp_session()
+        assert len(qa_server.client_ports) == 5
+        assert len(set(qa_server.client_ports)) == 1
+    finally:
+        await http_sessions.close_aiohttp_session()
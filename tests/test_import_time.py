@@ -0,0 +1,74 @@
+"""Import-time regression tests: `import sunholo` must not pull in the heavy subpackages."""
+import subprocess
+import sys
+
+import pytest
+
+# Modules that are expensive to import and must only load when actually used
+HEAVY_MODULES = ["fastapi", "flask", "langchain", "langchain_core", "langfuse",
+                 "google.cloud.storage", "google.genai", "sunholo.agents", "sunholo.components"]
+# Generous budget for the cumulative import time, in microseconds
+IMPORT_BUDGET_US = 300_000
+
+
+def import_times(statement):
+    """Returns {module: cumulative_us} from `python -X importtime -c statement` in a fresh interpreter."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("statement, root", [
+    ("import sunholo", "sunholo"),
+    ("from sunholo.utils import ConfigManager", "sunholo.utils"),
+])
+def test_import_does_not_load_heavy_modules(statement, root):
+    times = import_times(statement)
+
+    loaded = [module for module in HEAVY_MODULES if module in times]
+    assert not loaded, f"`{statement}` imported {loaded}"
+    assert times[root] < IMPORT_BUDGET_US, f"`{statement}` took {times[root] / 1000:.0f}ms"
+
+
+def test_lazy_attributes_still_resolve():
+    code = ("import sunholo; "
+            "assert sunholo.utils.ConfigManager; "
+            "from sunholo.agents import send_to_qa; "
+            "from sunholo.database import do_sql; "
+            "assert 'sunholo.agents.dispatch_to_qa' in __import__('sys').modules")
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_unknown_attribute_raises():
+    import sunholo
+    with pytest.raises(AttributeError):
+        sunholo.not_a_subpackage
+
+
+LAZY_PACKAGES = ["sunholo", "sunholo.agents", "sunholo.chunker", "sunholo.components", "sunholo.database",
+                 "sunholo.discovery_engine", "sunholo.genai", "sunholo.vertex"]
+
+
+@pytest.mark.parametrize("package", LAZY_PACKAGES)
+def test_every_submodule_is_an_attribute(package):
+    # a fresh interpreter, so submodules are only loaded via attribute access
+    code = f"""
+import importlib, pkgutil
+package = importlib.import_module({package!r})
+missing = []
+for info in pkgutil.iter_modules(package.__path__):
+    try:
+        getattr(package, info.name)
+    except AttributeError as err:
+        missing.append(f"{{info.name}}: {{err}}")
+    except Exception:
+        pass  # the submodule needs an optional dependency that isn't installed
+assert not missing, missing
+"""
+    subprocess.run([sys.executable, "-c", code], check=True)
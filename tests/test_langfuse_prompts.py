@@ -0,0 +1,140 @@
+"""Tests for the stale-while-revalidate Langfuse prompt cache in sunholo.langfuse.prompts."""
+import threading
+import time
+
+import pytest
+
+from sunholo.langfuse import prompts
+
+
+class FakePrompt:
+    def __init__(self, text):
+        self.text = text
+
+    def get_langchain_prompt(self):
+        return self.text.replace("{{", "{").replace("}}", "}")
+
+
+class FakeLangfuse:
+    def __init__(self, prompts_by_name, latency=0.0):
+        self.prompts_by_name = prompts_by_name
+        self.latency = latency
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def get_prompt(self, name, cache_ttl_seconds=None):
+        self.calls.append(name)
+        self.release.wait()
+        time.sleep(self.latency)
+        if name not in self.prompts_by_name:
+            raise LookupError(f"{name} not found")
+        return FakePrompt(self.prompts_by_name[name])
+
+
+class FakeConfig:
+    def __init__(self, local_prompts):
+        self.local_prompts = local_prompts
+
+    def promptConfig(self, key):
+        return self.local_prompts.get(key)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = prompts.PromptCache()
+    monkeypatch.setattr(prompts, "_prompt_cache", cache)
+    return cache
+
+
+def use(monkeypatch, langfuse, local_prompts=None):
+    monkeypatch.setattr(prompts, "get_langfuse_client", lambda: langfuse)
+    monkeypatch.setattr(prompts, "ConfigManager", lambda prefix: FakeConfig(local_prompts or {}))
+    return langfuse
+
+
+def wait_for(future):
+    assert future is not None
+    return future.result(timeout=5)
+
+
+def test_slow_langfuse_is_not_waited_on(cache, monkeypatch):
+    langfuse = use(monkeypatch, FakeLangfuse({"sunholo-hello": "Hi {{name}} from Langfuse"}),
+                   local_prompts={"hello": "Hi {name} from file"})
+    langfuse.release.clear()
+
+    start = time.perf_counter()
+    assert prompts.load_prompt_from_yaml("hello") == "Hi {name} from file"
+    assert time.perf_counter() - start < 0.1
+
+    langfuse.release.set()
+    _, future = cache.get("sunholo-hello")
+    wait_for(future)
+
+    assert prompts.load_prompt_from_yaml("hello") == "Hi {name} from Langfuse"
+    assert prompts.load_prompt_from_yaml("hello", f_string=False).text == "Hi {{name}} from Langfuse"
+    assert langfuse.calls == ["sunholo-hello"]
+
+
+def test_stale_prompts_are_served_while_refreshing(cache, monkeypatch):
+    langfuse = use(monkeypatch, FakeLangfuse({"sunholo-hello": "version 1"}))
+    wait_for(cache.refresh("sunholo-hello"))
+
+    langfuse.prompts_by_name["sunholo-hello"] = "version 2"
+    cache.refresh_seconds = 0
+    langfuse.release.clear()
+
+    # every stale read returns at once, and shares the one refresh in flight
+    assert [prompts.load_prompt_from_yaml("hello") for _ in range(5)] == ["version 1"] * 5
+    langfuse.release.set()
+    _, future = cache.get("sunholo-hello")
+    wait_for(future)
+
+    cache.refresh_seconds = 300
+    assert prompts.load_prompt_from_yaml("hello") == "version 2"
+    assert langfuse.calls.count("sunholo-hello") <= 3
+
+
+def test_failed_refresh_keeps_last_known_prompt(cache, monkeypatch):
+    langfuse = use(monkeypatch, FakeLangfuse({"sunholo-hello": "version 1"}))
+    wait_for(cache.refresh("sunholo-hello"))
+
+    del langfuse.prompts_by_name["sunholo-hello"]
+    assert wait_for(cache.refresh("sunholo-hello")).text == "version 1"
+    assert prompts.load_prompt_from_yaml("hello") == "version 1"
+
+
+def test_cold_prompt_without_local_fallback_waits_for_first_fetch(cache, monkeypatch):
+    use(monkeypatch, FakeLangfuse({"my_vac-intro": "Welcome"}, latency=0.05))
+
+    assert prompts.load_prompt_from_yaml("intro", prefix="my_vac") == "Welcome"
+
+
+def test_missing_prompt_is_not_refetched_every_call(cache, monkeypatch):
+    langfuse = use(monkeypatch, FakeLangfuse({}), local_prompts={"hello": "from file"})
+
+    for _ in range(5):
+        assert prompts.load_prompt_from_yaml("hello") == "from file"
+        _, future = cache.get("sunholo-hello")
+        if future is not None:
+            future.result(timeout=5)
+
+    assert langfuse.calls == ["sunholo-hello"]
+
+
+def test_prewarm_from_environment(cache, monkeypatch):
+    langfuse = use(monkeypatch, FakeLangfuse({"sunholo-hello": "Hello", "my_vac-intro": "Welcome"}))
+    monkeypatch.setenv(prompts.PREWARM_ENV, "hello, my_vac:intro")
+
+    futures = prompts.prewarm_prompts()
+    for future in futures:
+        future.result(timeout=5)
+
+    assert sorted(langfuse.calls) == ["my_vac-intro", "sunholo-hello"]
+    assert prompts.load_prompt_from_yaml("intro", prefix="my_vac") == "Welcome"
+    assert len(langfuse.calls) == 2
+
+
+def test_prewarm_without_keys_does_nothing(cache, monkeypatch):
+    monkeypatch.delenv(prompts.PREWARM_ENV, raising=False)
+    assert prompts.prewarm_prompts() == []
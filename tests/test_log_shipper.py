@@ -0,0 +1,177 @@
+"""Tests for the background batched Cloud Logging shipper in sunholo.custom_logging."""
+import threading
+
+import pytest
+
+from sunholo import custom_logging
+from sunholo.custom_logging import GoogleCloudLogging, LogShipper
+
+
+class FakeBatch:
+    def __init__(self, logger):
+        self.logger = logger
+        self.entries = []
+
+    def log_struct(self, info, severity=None, source_location=None):
+        self.entries.append((info, severity, source_location))
+
+    def commit(self):
+        self.logger.client.gate.wait(5)
+        if self.logger.client.fail_commits:
+            raise RuntimeError("commit failed")
+        self.logger.client.commits.append((self.logger.name, list(self.entries)))
+
+
+class FakeLogger:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def log_struct(self, info, severity=None, source_location=None):
+        self.client.single_writes.append((self.name, info, severity))
+
+
+class FakeClient:
+    def __init__(self):
+        self.commits = []
+        self.single_writes = []
+        self.fail_commits = False
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def logger(self, name):
+        return FakeLogger(self, name)
+
+    def entries(self):
+        return [entry for _, batch in self.commits for entry in batch]
+
+
+@pytest.fixture
+def client():
+    return FakeClient()
+
+
+def test_entries_are_written_in_batches(client):
+    shipper = LogShipper(client, flush_interval=0.01)
+    client.gate.clear()
+    for i in range(100):
+        shipper.submit("my-log", {"i": i})
+    client.gate.set()
+
+    assert shipper.flush(timeout=5)
+    assert [info["i"] for info, _, _ in client.entries()] == list(range(100))
+    assert len(client.commits) < 100
+
+
+def test_reused_payload_dict_does_not_change_queued_entries(client):
+    shipper = LogShipper(client, flush_interval=0.01)
+    client.gate.clear()
+    payload = {"i": 0}
+    shipper.submit("my-log", payload)
+    payload["i"] = 1
+    shipper.submit("my-log", payload)
+    client.gate.set()
+
+    assert shipper.flush(timeout=5)
+    assert [info["i"] for info, _, _ in client.entries()] == [0, 1]
+
+
+def test_batches_are_grouped_by_logger_name(client):
+    shipper = LogShipper(client, flush_interval=0.01)
+    client.gate.clear()
+    shipper.submit("log-a", {"n": 1})
+    shipper.submit("log-b", {"n": 2})
+    shipper.submit("log-a", {"n": 3})
+    client.gate.set()
+    shipper.flush(timeout=5)
+
+    by_name = {}
+    for name, entries in client.commits:
+        by_name.setdefault(name, []).extend(info["n"] for info, _, _ in entries)
+    assert by_name == {"log-a": [1, 3], "log-b": [2]}
+
+
+def test_full_queue_drops_info_but_keeps_warnings(client):
+    shipper = LogShipper(client, max_queue=10, flush_interval=0.01, sample_watermark=1.0,
+                         priority_timeout=0.01)
+    client.gate.clear()
+    shipper.submit("my-log", {"first": True})  # taken by the worker, which blocks on the gate
+    while shipper._queue.qsize():
+        pass
+
+    queued = [shipper.submit("my-log", {"i": i}) for i in range(20)]
+    assert queued.count(True) == 10
+    assert shipper.submit("my-log", {"warn": True}, severity="WARNING") is False
+    assert shipper.dropped == 11
+
+    client.gate.set()
+    shipper.flush(timeout=5)
+    drop_reports = [info for info, severity, _ in client.entries() if "dropped_entries" in info]
+    assert drop_reports and drop_reports[0]["dropped_entries"] == 11
+
+
+def test_info_is_sampled_above_watermark(client):
+    shipper = LogShipper(client, max_queue=100, flush_interval=0.01, sample_watermark=0.1, sample_rate=5)
+    client.gate.clear()
+    shipper.submit("my-log", {"first": True})
+    while shipper._queue.qsize():
+        pass
+
+    queued = [shipper.submit("my-log", {"i": i}) for i in range(60)]
+    warnings = [shipper.submit("my-log", {"w": i}, severity="ERROR") for i in range(5)]
+    client.gate.set()
+    shipper.flush(timeout=5)
+
+    assert queued[:10] == [True] * 10
+    assert queued[10:].count(True) == 10
+    assert all(warnings)
+
+
+def test_failed_batch_falls_back_to_single_writes(client):
+    client.fail_commits = True
+    shipper = LogShipper(client, flush_interval=0.01)
+    shipper.submit("my-log", {"i": 1})
+    shipper.submit("my-log", {"i": 2})
+    shipper.flush(timeout=5)
+
+    assert [info["i"] for _, info, _ in client.single_writes] == [1, 2]
+
+
+def test_flush_times_out_when_writes_are_stuck(client):
+    shipper = LogShipper(client, flush_interval=0.01)
+    client.gate.clear()
+    shipper.submit("my-log", {"i": 1})
+    assert shipper.flush(timeout=0.05) is False
+    client.gate.set()
+    assert shipper.flush(timeout=5) is True
+
+
+@pytest.fixture
+def cloud_logger(monkeypatch, client):
+    from sunholo.utils import gcp
+    monkeypatch.setattr(gcp, "is_gcp_logged_in", lambda: True)
+    monkeypatch.setattr(custom_logging, "Client", lambda project: client)
+    logger = GoogleCloudLogging(project_id="test-project", logger_name="test-log-shipper")
+    yield logger
+    GoogleCloudLogging._instances.pop(("test-project", "test-log-shipper"), None)
+
+
+def test_structured_log_does_not_write_synchronously(cloud_logger, client):
+    client.gate.clear()
+    cloud_logger.update_trace_id("abc-123")
+    cloud_logger.info("hello", log_struct={"k": "v"})
+    assert client.commits == []
+
+    client.gate.set()
+    assert custom_logging.flush_logs(timeout=5)
+    [(info, severity, source_location)] = client.entries()
+    assert severity == "INFO"
+    assert info["k"] == "v"
+    assert info["trace_id"] == "abc-123"
+    assert info["version"] == cloud_logger.version
+    assert info["message"] == f"test-log-shipper-abc-123 [{cloud_logger.version}] hello"
+    assert source_location["file"] == __file__
+    assert source_location["function"] == "test_structured_log_does_not_write_synchronously"
@@ -1,4 +1,8 @@
 """Tests for sunholo.mcp.discovery module."""
+import asyncio
+import time
+import types
+
 import pytest
 
 from sunholo.mcp.discovery import (
@@ -139,3 +143,177 @@ class TestIsMcpTool:
 
     def test_prefix_constant(self):
         assert MCP_PREFIX == "mcp_"
+
+
+class FakeClientManager:
+    """Lists tools per server after a delay, counting how often each is listed."""
+
+    def __init__(self, delays=None, default_delay=0.0):
+        self.delays = delays or {}
+        self.default_delay = default_delay
+        self.listed = {}
+        self.tools = {}
+
+    async def connect_to_server(self, server_name, command, args=None):
+        pass
+
+    async def list_tools(self, server_name):
+        await asyncio.sleep(self.delays.get(server_name, self.default_delay))
+        self.listed[server_name] = self.listed.get(server_name, 0) + 1
+        return self.tools.get(server_name, [
+            types.SimpleNamespace(name="query", description=f"Query {server_name}",
+                                  inputSchema={"type": "object"}),
+        ])
+
+
+def make_discovery(manager, servers, **kwargs):
+    discovery = MCPDiscovery(client_manager=manager, **kwargs)
+    for server_id in servers:
+        discovery.register_server(server_id, command="serve")
+    return discovery
+
+
+class TestConcurrentDiscovery:
+    @pytest.mark.asyncio
+    async def test_servers_are_discovered_concurrently(self):
+        servers = [f"server{i}" for i in range(12)]
+        discovery = make_discovery(FakeClientManager(default_delay=0.1), servers)
+
+        start = time.perf_counter()
+        tools = await discovery.discover_all()
+        elapsed = time.perf_counter() - start
+
+        assert [t["tool_id"] for t in tools] == [f"mcp_{s}_query" for s in servers]
+        assert elapsed < 0.6
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        servers = [f"server{i}" for i in range(4)]
+        discovery = make_discovery(FakeClientManager(default_delay=0.1), servers, max_concurrency=1)
+
+        start = time.perf_counter()
+        await discovery.discover_all()
+        assert time.perf_counter() - start >= 0.4
+
+    @pytest.mark.asyncio
+    async def test_slow_server_times_out(self):
+        manager = FakeClientManager(delays={"slow": 5})
+        discovery = make_discovery(manager, ["fast", "slow"], discovery_timeout=0.1)
+
+        start = time.perf_counter()
+        tools = await discovery.discover_all()
+
+        assert time.perf_counter() - start < 1
+        assert [t["server_id"] for t in tools] == ["fast"]
+
+    @pytest.mark.asyncio
+    async def test_catalog_is_cached(self):
+        manager = FakeClientManager()
+        discovery = make_discovery(manager, ["search"])
+
+        first = await discovery.discover_all()
+        assert await discovery.discover_all() == first
+        assert manager.listed == {"search": 1}
+
+        await discovery.discover_all(refresh=True)
+        assert manager.listed == {"search": 2}
+
+    @pytest.mark.asyncio
+    async def test_catalog_expires(self):
+        manager = FakeClientManager()
+        discovery = make_discovery(manager, ["search"], catalog_ttl=0)
+
+        await discovery.discover_all()
+        await asyncio.sleep(0.01)
+        await discovery.discover_all()
+        assert manager.listed == {"search": 2}
+
+    @pytest.mark.asyncio
+    async def test_register_and_unregister_invalidate(self):
+        manager = FakeClientManager()
+        discovery = make_discovery(manager, ["search", "search_v2"])
+        await discovery.discover_all()
+        assert discovery.get_tool_info("mcp_search_query")["description"] == "Query search"
+
+        discovery.register_server("search", command="serve-again")
+        assert discovery.get_tool_info("mcp_search_query") is None
+        assert discovery.get_tools_for_server("search_v2")[0]["name"] == "query"
+        await discovery.discover_all()
+        assert manager.listed == {"search": 2, "search_v2": 1}
+
+        discovery.unregister_server("search")
+        assert discovery.get_tools_for_server("search") == []
+        assert not discovery.is_mcp_tool("mcp_search_query")
+        assert discovery.is_mcp_tool("mcp_search_v2_query")
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_last_catalog(self):
+        manager = FakeClientManager()
+        discovery = make_discovery(manager, ["search"], discovery_timeout=0.1)
+        first = await discovery.discover_all()
+
+        manager.delays["search"] = 5
+        assert await discovery.discover_all(refresh=True) == first
+        assert discovery.get_tool_info("mcp_search_query") is not None
+
+    @pytest.mark.asyncio
+    async def test_dict_tools(self):
+        manager = FakeClientManager()
+        manager.tools["search"] = [{"name": "find", "description": "Find things"}]
+        discovery = make_discovery(manager, ["search"])
+
+        tools = await discovery.discover_server("search")
+        assert tools[0]["description"] == "Find things"
+        assert tools[0]["parameters"] == {}
+
+    def test_is_mcp_tool_for_registered_servers(self):
+        discovery = make_discovery(FakeClientManager(), ["search"])
+        assert discovery.is_mcp_tool("mcp_search")
+        assert discovery.is_mcp_tool(EXTERNAL_MCP_TOOL)
+        assert not discovery.is_mcp_tool("mcp_email")
+        assert not discovery.is_mcp_tool("search")
+
+
+class FakeSession:
+    def __init__(self, name, delay=0.0):
+        self.name = name
+        self.delay = delay
+        self.calls = 0
+
+    async def list_tools(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return types.SimpleNamespace(tools=[types.SimpleNamespace(name=f"{self.name}_tool", metadata=None)])
+
+
+class TestMCPClientManagerListTools:
+    @pytest.fixture
+    def manager(self):
+        from sunholo.mcp.mcp_manager import MCPClientManager
+        return MCPClientManager(list_timeout=0.2)
+
+    @pytest.mark.asyncio
+    async def test_lists_servers_concurrently_and_skips_slow_ones(self, manager):
+        manager.sessions = {f"s{i}": FakeSession(f"s{i}", delay=0.1) for i in range(5)}
+        manager.sessions["slow"] = FakeSession("slow", delay=5)
+
+        start = time.perf_counter()
+        tools = await manager.list_tools()
+
+        assert time.perf_counter() - start < 0.5
+        assert [t.name for t in tools] == [f"s{i}_tool" for i in range(5)]
+        assert tools[0].metadata == {"server": "s0"}
+
+    @pytest.mark.asyncio
+    async def test_tools_are_cached_until_invalidated(self, manager):
+        session = FakeSession("search")
+        manager.sessions = {"search": session}
+
+        await manager.list_tools("search")
+        await manager.list_tools()
+        assert session.calls == 1
+
+        await manager.list_tools("search", refresh=True)
+        manager.invalidate_tools("search")
+        await manager.list_tools("search")
+        assert session.calls == 3
@@ -0,0 +1,123 @@
+"""Tests for the shared publisher cache and fire-and-forget archiving."""
+import json
+import subprocess
+import sys
+import time
+
+import pytest
+
+from fixtures.fake_pubsub import FakePublisherClient
+from sunholo.pubsub import pubsub_manager
+from sunholo.pubsub import PubSubManager
+from sunholo import archive
+
+
+@pytest.fixture
+def fake_publisher(monkeypatch):
+    fake = FakePublisherClient()
+    monkeypatch.setattr(pubsub_manager, "get_publisher_client",
+                        lambda project_id, topic, batch_settings=None: fake)
+    # google-cloud-pubsub may not be installed - the fake stands in for it
+    if pubsub_manager.pubsub_v1 is None:
+        monkeypatch.setattr(pubsub_manager, "pubsub_v1", object())
+    pubsub_manager.clear_publisher_cache()
+    yield fake
+    pubsub_manager.clear_publisher_cache()
+
+
+class TestPubSubManager:
+    def test_topic_check_is_memoized(self, fake_publisher):
+        for _ in range(5):
+            PubSubManager("ns", pubsub_topic="my-topic", project_id="proj", publisher=fake_publisher)
+        assert fake_publisher.get_topic_calls == 1
+
+    def test_publish_message_serialises_dicts(self, fake_publisher):
+        manager = PubSubManager("ns", pubsub_topic="my-topic", project_id="proj", publisher=fake_publisher)
+        manager.publish_message({"a": 1})
+
+        topic, data, attrs = fake_publisher.messages[0]
+        assert topic == "projects/proj/topics/my-topic"
+        assert json.loads(data) == {"a": 1}
+        assert attrs == {"namespace": "ns"}
+
+
+class TestArchiveQA:
+    def test_queue_archive_qa_does_not_block_on_publisher(self, fake_publisher, monkeypatch):
+        monkeypatch.setattr(pubsub_manager, "_default_project_id", lambda: "proj")
+        fake_publisher.admin_latency = 0.2
+
+        start = time.perf_counter()
+        for i in range(20):
+            assert archive.queue_archive_qa({"answer": f"answer {i}"}, "my_vac")
+        request_latency = time.perf_counter() - start
+
+        assert request_latency < 0.1
+        assert archive.flush_archive(timeout=5)
+        assert len(fake_publisher.messages) == 20
+        assert fake_publisher.get_topic_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_archive_qa_async(self, fake_publisher, monkeypatch):
+        monkeypatch.setattr(pubsub_manager, "_default_project_id", lambda: "proj")
+
+        assert await archive.archive_qa_async({"answer": "hi"}, "my_vac")
+        assert archive.flush_archive(timeout=5)
+
+        topic, data, _ = fake_publisher.messages[-1]
+        assert topic == "projects/proj/topics/qna-to-pubsub-bq-archive"
+        assert json.loads(data)["bot_output"] == {"answer": "hi"}
+
+
+    def test_flush_archive_publishes_queued_and_batched_messages(self, monkeypatch):
+        monkeypatch.setattr(pubsub_manager, "_default_project_id", lambda: "proj")
+        if pubsub_manager.pubsub_v1 is None:
+            monkeypatch.setattr(pubsub_manager, "pubsub_v1", object())
+        pubsub_manager.clear_publisher_cache()
+        # a shared publisher that holds messages in its client-side batch until stopped
+        fake = FakePublisherClient(admin_latency=0.05, batched=True)
+        topic = f"projects/proj/topics/{archive.archive.ARCHIVE_TOPIC}"
+        pubsub_manager._publishers[("proj", topic)] = fake
+
+        try:
+            for i in range(10):
+                assert archive.queue_archive_qa({"answer": f"answer {i}"}, "my_vac")
+            assert archive.flush_archive(timeout=5)
+        finally:
+            pubsub_manager.clear_publisher_cache()
+
+        assert fake.stopped
+        assert [json.loads(data)["bot_output"]["answer"] for _, data, _ in fake.messages] == \
+            [f"answer {i}" for i in range(10)]
+        assert ("proj", topic) not in pubsub_manager._publishers
+
+    def test_queued_messages_are_published_at_exit(self):
+        code = ("import time\n"
+                "from sunholo.archive import archive\n"
+                "def slow_archive_qa(bot_output, vector_name):\n"
+                "    time.sleep(0.2)\n"
+                "    print('archived', bot_output, flush=True)\n"
+                "archive.archive_qa = slow_archive_qa\n"
+                "archive.queue_archive_qa('answer', 'my_vac')\n")
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert "archived answer" in result.stdout
+
+
+class TestPublishChunks:
+    def test_publish_chunks_reports_summary(self, fake_publisher, monkeypatch):
+        from sunholo.chunker import publish
+        from sunholo.langchain_types import Document
+
+        monkeypatch.setattr(publish, "get_gcp_project", lambda: "proj")
+        fake_publisher.publish_latency = 0.01
+        chunks = [Document(page_content=f"chunk number {i}") for i in range(200)]
+
+        start = time.perf_counter()
+        summary = publish.publish_chunks(chunks, "my_vac")
+
+        # futures resolve concurrently rather than one publish latency per chunk
+        assert time.perf_counter() - start < 1
+        assert summary["published"] == 200
+        assert summary["failed"] == 0
+        assert len(fake_publisher.messages) == 200
+        assert all(topic == "projects/proj/topics/chunk-to-pubsub-embed"
+                   for topic, _, _ in fake_publisher.messages)
@@ -0,0 +1,112 @@
+"""Tests for the memoized routing table in sunholo.agents.route."""
+import json
+import os
+
+import pytest
+
+from sunholo.agents import route
+from sunholo.utils import ConfigManager
+from sunholo.utils.config_store import config_store
+
+
+VAC_CONFIG = """kind: vacConfig
+apiVersion: v1
+vac:
+  my_vac:
+    agent: langserve
+    llm: vertex
+"""
+
+AGENT_CONFIG = """kind: agentConfig
+apiVersion: v2
+agents:
+  default:
+    post:
+      stream: "{stem}/vac/streaming/{vector_name}"
+      invoke: "{stem}/vac/{vector_name}"
+    get:
+      health: "{stem}/health"
+"""
+
+
+def bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+
+@pytest.fixture
+def config_folder(tmp_path, monkeypatch):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "vac_config.yaml").write_text(VAC_CONFIG)
+    (config_dir / "agent_config.yaml").write_text(AGENT_CONFIG)
+    (config_dir / "cloud_run_urls.json").write_text(json.dumps({"langserve": "https://langserve.run.app"}))
+
+    monkeypatch.setenv("VAC_CONFIG_FOLDER", str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config_store, "check_interval", 0)
+    ConfigManager.clear_instance_cache()
+    route.clear_routing_table()
+    yield config_dir
+    ConfigManager.clear_instance_cache()
+    route.clear_routing_table()
+
+
+@pytest.fixture
+def count_agent_config(monkeypatch):
+    calls = []
+    original = ConfigManager.agentConfig
+
+    def counting(self, key):
+        calls.append(key)
+        return original(self, key)
+
+    monkeypatch.setattr(ConfigManager, "agentConfig", counting)
+    return calls
+
+
+def test_endpoints_are_built_once(config_folder, count_agent_config):
+    for _ in range(10):
+        endpoints = route.route_endpoint("my_vac")
+
+    assert endpoints == {"stream": "https://langserve.run.app/vac/streaming/my_vac",
+                         "invoke": "https://langserve.run.app/vac/my_vac"}
+    assert len(count_agent_config) == 1
+
+
+def test_endpoints_are_keyed_by_method_and_override(config_folder):
+    assert route.lookup_endpoints("my_vac", method="get") == {"health": "https://langserve.run.app/health"}
+    assert route.lookup_endpoints("my_vac", override_endpoint="http://localhost:8080")["invoke"] == \
+        "http://localhost:8080/vac/my_vac"
+
+
+def test_route_endpoint_returns_a_copy(config_folder):
+    route.route_endpoint("my_vac")["invoke"] = "changed"
+    assert route.route_endpoint("my_vac")["invoke"] == "https://langserve.run.app/vac/my_vac"
+
+
+def test_config_change_rebuilds_routes(config_folder, count_agent_config):
+    route.lookup_endpoints("my_vac")
+
+    agent_config = config_folder / "agent_config.yaml"
+    agent_config.write_text(AGENT_CONFIG.replace("/vac/{vector_name}", "/v2/vac/{vector_name}"))
+    bump_mtime(agent_config)
+
+    assert route.lookup_endpoints("my_vac")["invoke"] == "https://langserve.run.app/v2/vac/my_vac"
+    assert len(count_agent_config) == 2
+
+
+def test_cloud_run_urls_change_rebuilds_routes(config_folder):
+    assert route.route_vac("my_vac") == "https://langserve.run.app"
+
+    urls = config_folder / "cloud_run_urls.json"
+    urls.write_text(json.dumps({"langserve": "https://langserve-new.run.app"}))
+    bump_mtime(urls)
+
+    assert route.route_vac("my_vac") == "https://langserve-new.run.app"
+
+
+def test_unknown_agent_raises(config_folder):
+    (config_folder / "cloud_run_urls.json").write_text(json.dumps({}))
+    with pytest.raises(ValueError, match="agent_url not found"):
+        route.route_vac("my_vac")
@@ -0,0 +1,250 @@
+"""Tests and latency benchmark for sunholo.streaming.start_streaming_chat."""
+import time
+
+import pytest
+
+from sunholo.streaming import start_streaming_chat
+from sunholo.streaming.content_buffer import (
+    BufferStreamingStdOutCallbackHandler,
+    BufferStreamingStdOutCallbackHandlerAsync,
+    ContentBuffer,
+    SentenceFlushScanner,
+)
+
+
+SENTENCES = [f"Sentence number {i} is here." for i in range(5)]
+TOKEN_DELAY = 0.01
+
+
+def fake_token_qna(question, vector_name, chat_history=None, callback=None, **kwargs):
+    """Emits whitespace separated tokens with a small delay, like a streaming LLM."""
+    for sentence in SENTENCES:
+        for word in sentence.split(" "):
+            callback.on_llm_new_token(word + " ")
+            time.sleep(TOKEN_DELAY)
+    answer = " ".join(SENTENCES)
+    callback.on_llm_end(answer)
+    return {"answer": answer}
+
+
+def fake_qna_without_end(question, vector_name, chat_history=None, callback=None, **kwargs):
+    callback.on_llm_new_token("No end callback.")
+    return "No end callback."
+
+
+def fake_qna_error(question, vector_name, chat_history=None, callback=None, **kwargs):
+    raise RuntimeError("boom")
+
+
+def measure_stream(qna_func, **kwargs):
+    """Returns (chunks, time_to_first_token, inter_chunk_gaps) for a streaming run."""
+    start = time.perf_counter()
+    stamps = []
+    chunks = []
+    for chunk in start_streaming_chat("q", "vac", qna_func, **kwargs):
+        stamps.append(time.perf_counter())
+        chunks.append(chunk)
+    ttft = stamps[0] - start
+    gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+    return chunks, ttft, gaps
+
+
+class TestContentBuffer:
+    def test_drain_reads_and_clears(self):
+        buffer = ContentBuffer()
+        buffer.write("hello")
+        assert buffer.drain() == "hello"
+        assert buffer.read() == ""
+
+    def test_wait_for_content_times_out(self):
+        buffer = ContentBuffer()
+        assert buffer.wait_for_content(timeout=0.01) is False
+
+    def test_close_wakes_waiters(self):
+        buffer = ContentBuffer()
+        buffer.close()
+        assert buffer.wait_for_content(timeout=1) is True
+
+    def test_writes_are_joined_in_order(self):
+        buffer = ContentBuffer()
+        for piece in ["a", "", "b", "c"]:
+            buffer.write(piece)
+        assert buffer.read() == "abc"
+        buffer.write("d")
+        assert buffer.content == "abcd"
+        assert buffer.drain() == "abcd"
+        assert buffer.wait_for_content(timeout=0.01) is False
+
+    @pytest.mark.asyncio
+    async def test_async_drain_clears_the_event(self):
+        buffer = ContentBuffer()
+        await buffer.async_write("one ")
+        await buffer.async_write("two")
+        assert await buffer.async_drain() == "one two"
+        assert not buffer.content_available.is_set()
+        assert await buffer.async_read() == ""
+
+
+def feed(tokens, tokens_to_flush=".?!\n"):
+    """Returns the flushes a SentenceFlushScanner makes for the tokens, then what is left."""
+    scanner = SentenceFlushScanner(tokens_to_flush)
+    flushes = [flushed for flushed in (scanner.feed(token) for token in tokens) if flushed]
+    return flushes, scanner.flush()
+
+
+class TestSentenceFlushScanner:
+    def test_flushes_at_sentence_ends(self):
+        assert feed(["Hello", " world", ".", " More"]) == (["Hello world."], " More")
+
+    def test_flushes_before_each_list_item(self):
+        flushes, rest = feed(list("Steps:\n1. one\n2. two"), tokens_to_flush="")
+        assert flushes == ["Steps:\n", "1. one\n"]
+        assert rest == "2. two"
+
+    def test_list_items_split_across_tokens(self):
+        flushes, rest = feed(["Intro", "\n1", "2", ".", " twelve", "\n", "13", ". thirteen"], tokens_to_flush="")
+        assert flushes == ["Intro\n", "12. twelve\n"]
+        assert rest == "13. thirteen"
+
+    @pytest.mark.parametrize("tokens, expected", [
+        (list("Code:\n```python\nx = 1.\ny = 2\n```\nDone."),
+         ["Code:\n", "```python\nx = 1.\ny = 2\n```\n", "Done."]),
+        (["Code:\n", "```python\nx = 1.", "\ny = 2\n```", "\nDone."],
+         ["Code:\n", "```python\nx = 1.\ny = 2\n```\nDone."]),
+    ])
+    def test_code_blocks_are_held_until_closed(self, tokens, expected):
+        assert feed(tokens) == (expected, "")
+
+    def test_two_fences_in_one_token_close_the_block(self):
+        scanner = SentenceFlushScanner()
+        assert scanner.feed("Use `x` or ```a``` inline.") == "Use `x` or ```a``` inline."
+        assert not scanner.in_code_block
+
+    def test_handlers_share_the_scanner(self):
+        buffer = ContentBuffer()
+        handler = BufferStreamingStdOutCallbackHandler(buffer)
+        handler.on_llm_new_token("[[HEARTBEAT]]...[[/HEARTBEAT]]")
+        handler.on_llm_new_token("Half a sentence")
+        assert buffer.drain() == "..."
+        assert handler.buffer == "Half a sentence"
+        handler.on_llm_end(None)
+        assert buffer.drain() == "Half a sentence"
+        assert buffer.closed
+
+    @pytest.mark.asyncio
+    async def test_async_handler(self):
+        buffer = ContentBuffer()
+        handler = BufferStreamingStdOutCallbackHandlerAsync(buffer)
+        for token in ["One.", " Two", " three"]:
+            await handler.async_on_llm_new_token(token)
+        assert await buffer.async_drain() == "One."
+        await handler.async_on_llm_end(None)
+        assert await buffer.async_drain() == " Two three"
+        assert handler.stream_finished.is_set()
+
+
+BENCHMARK_TOKENS = 50_000
+
+
+@pytest.mark.parametrize("text", [
+    pytest.param(("no sentence ends in this long answer " * 2000)[:BENCHMARK_TOKENS], id="prose"),
+    pytest.param(("Steps:\n" + "".join(f"{i}. do step {i}\n" for i in range(1, 5000)))[:BENCHMARK_TOKENS], id="list"),
+    pytest.param("```python\n" + ("result = compute(value)  # one line\n" * 1500)[:BENCHMARK_TOKENS - 15] + "```\n",
+                 id="code-fences"),
+])
+def test_single_character_token_benchmark(text):
+    """Feeds 50k single character tokens: time per token should not grow with the pending text."""
+    buffer = ContentBuffer()
+    handler = BufferStreamingStdOutCallbackHandler(buffer)
+
+    start = time.perf_counter()
+    for char in text:
+        handler.on_llm_new_token(char)
+    handler.on_llm_end(None)
+    elapsed = time.perf_counter() - start
+
+    assert buffer.drain() == text
+    assert elapsed < 1.0, f"{len(text)} tokens took {elapsed:.3f}s"
+
+
+class TestStartStreamingChatLatency:
+    def test_time_to_first_token_is_not_bound_to_wait_time(self):
+        chunks, ttft, gaps = measure_stream(fake_token_qna, wait_time=2)
+
+        # first sentence is 5 tokens, so it is ready after ~5 * TOKEN_DELAY
+        assert ttft < 0.5, f"TTFT {ttft:.3f}s should not wait for wait_time"
+        assert max(gaps) < 0.5, f"inter-chunk gaps {gaps} should track sentence boundaries"
+
+    def test_streams_every_sentence_then_final_output(self):
+        chunks, _, _ = measure_stream(fake_token_qna, wait_time=2)
+
+        streamed = "".join(c for c in chunks if isinstance(c, str))
+        for sentence in SENTENCES:
+            assert sentence in streamed
+        assert chunks[-1] == {"answer": " ".join(SENTENCES)}
+
+    def test_finishes_without_on_llm_end(self):
+        start = time.perf_counter()
+        chunks = list(start_streaming_chat("q", "vac", fake_qna_without_end, wait_time=2, timeout=5))
+        assert time.perf_counter() - start < 1
+        assert "No end callback." in chunks
+        assert chunks[-1] == {"answer": "No end callback."}
+
+    def test_raises_qna_exceptions(self):
+        with pytest.raises(RuntimeError, match="boom"):
+            list(start_streaming_chat("q", "vac", fake_qna_error, wait_time=2))
+
+
+class TestStreamSyncGeneratorAsync:
+    @pytest.mark.asyncio
+    async def test_relays_items_before_generator_finishes(self):
+        from sunholo.streaming import stream_sync_generator_async
+
+        def slow_gen():
+            yield "first"
+            time.sleep(0.5)
+            yield "second"
+
+        start = time.perf_counter()
+        received = []
+        async for item in stream_sync_generator_async(slow_gen):
+            received.append((item, time.perf_counter() - start))
+
+        assert [item for item, _ in received] == ["first", "second"]
+        assert received[0][1] < 0.3
+
+    @pytest.mark.asyncio
+    async def test_reraises_worker_errors(self):
+        from sunholo.streaming import stream_sync_generator_async
+
+        def failing_gen():
+            yield "ok"
+            raise ValueError("bad chunk")
+
+        received = []
+        with pytest.raises(ValueError, match="bad chunk"):
+            async for item in stream_sync_generator_async(failing_gen):
+                received.append(item)
+        assert received == ["ok"]
+
+    @pytest.mark.asyncio
+    async def test_stops_worker_when_consumer_exits(self):
+        import asyncio
+        import threading
+        from sunholo.streaming import stream_sync_generator_async
+
+        closed = threading.Event()
+
+        def endless_gen():
+            try:
+                while True:
+                    yield "tick"
+            finally:
+                closed.set()
+
+        stream = stream_sync_generator_async(endless_gen, max_queue_size=2, poll_interval=0.01)
+        async for _ in stream:
+            break
+        await stream.aclose()
+
+        assert await asyncio.to_thread(closed.wait, 2)
@@ -1,7 +1,10 @@
 """Tests for sunholo.genai.thinking module."""
+import time
+
 import pytest
 
 from sunholo.genai.thinking import (
+    TagSplitter,
     ThinkingCapture,
     ThinkingContent,
     extract_thinking,
@@ -150,6 +153,72 @@ class TestThinkingCapture:
         assert capture.get_response() == "response"
 
 
+    def test_multiple_tags(self):
+        capture = ThinkingCapture(tags=["thinking", "reasoning"])
+        capture.process_chunk("<reasoning>a</reasoning>b<thin")
+        capture.process_chunk("king>c</thinking>d")
+        assert capture.get_thinking() == "ac"
+        assert capture.get_response() == "bd"
+
+    def test_process_segments(self):
+        capture = ThinkingCapture()
+        assert capture.process_segments("Hi <thinking>hmm") == [("response", "Hi "), ("thinking", "hmm")]
+        assert capture.process_segments("</thinking>") == []
+        assert not capture.is_in_thinking
+
+
+class TestTagSplitter:
+    def test_segments_by_kind(self):
+        splitter = TagSplitter({"thinking": "thinking", "tool_call": "tool"})
+        chunks = ["Let me <thinking>plan</thin", "king><tool", "_call>search()</tool_call>Done"]
+        assert list(splitter.split(chunks)) == [
+            ("response", "Let me "),
+            ("thinking", "plan"),
+            ("tool", "search()"),
+            ("response", "Done"),
+        ]
+
+    def test_tag_names_are_default_kinds(self):
+        splitter = TagSplitter(["thinking", "reflection"])
+        assert splitter.feed("<reflection>r</reflection>") == [("reflection", "r")]
+        assert splitter.kind == "response"
+
+    def test_other_tags_inside_a_tag_are_text(self):
+        splitter = TagSplitter()
+        segments = splitter.feed("<thinking>use <reasoning> here</thinking>")
+        assert segments == [("thinking", "use <reasoning> here")]
+
+    def test_unknown_tags_and_lone_brackets_are_text(self):
+        splitter = TagSplitter()
+        assert splitter.feed("a < b <b>bold</b> <thi") == [("response", "a < b <b>bold</b> ")]
+        assert splitter.feed("s is not a tag") == [("response", "<this is not a tag")]
+
+    def test_partial_marker_is_flushed_at_end(self):
+        splitter = TagSplitter()
+        assert splitter.feed("<thinking>almost</th") == [("thinking", "almost")]
+        assert splitter.flush() == [("thinking", "</th")]
+        assert splitter.active_tag == "thinking"
+
+    @pytest.mark.parametrize("tags", [[], ["a<b"], [""]])
+    def test_invalid_tags(self, tags):
+        with pytest.raises(ValueError):
+            TagSplitter(tags)
+
+    def test_single_character_token_benchmark(self):
+        """A long thinking section streamed a character at a time is scanned in linear time."""
+        text = "<thinking>" + ("consider the </think option <and> more " * 2500) + "</thinking>The answer."
+        splitter = TagSplitter()
+
+        start = time.perf_counter()
+        segments = list(splitter.split(text))
+        elapsed = time.perf_counter() - start
+
+        thinking = "".join(t for kind, t in segments if kind == "thinking")
+        assert thinking == text[len("<thinking>"):-len("</thinking>The answer.")]
+        assert "".join(t for kind, t in segments if kind == "response") == "The answer."
+        assert elapsed < 1.0
+
+
 class TestExtractAnthropicThinking:
     def test_with_thinking_blocks(self):
         """Test with mock Anthropic response-like object."""
@@ -214,6 +283,21 @@ class TestCreateThinkingCallback:
         assert "Hello " in "".join(response_chunks)
         assert "world" in "".join(response_chunks)
 
+    def test_callback_routes_thinking_segments(self):
+        thinking_chunks = []
+        response_chunks = []
+
+        callback = create_thinking_callback(
+            on_thinking=thinking_chunks.append,
+            on_response=response_chunks.append,
+        )
+
+        callback("Hi <think")
+        callback("ing>hmm</thinking>there")
+
+        assert thinking_chunks == ["hmm"]
+        assert response_chunks == ["Hi ", "there"]
+
 
 class TestThinkingContent:
     def test_defaults(self):
@@ -0,0 +1,101 @@
+"""Tests for the ID token cache used by sunholo.auth.get_header."""
+import base64
+import json
+import threading
+import time
+
+import pytest
+
+from sunholo.auth.token_cache import IdTokenCache, token_expiry
+
+
+def make_token(expires_in, name="token"):
+    def b64(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+    return f"{b64({'alg': 'RS256'})}.{b64({'exp': time.time() + expires_in, 'sub': name})}.signature"
+
+
+class CountingFetcher:
+    def __init__(self, expires_in=3600, delay=0.0):
+        self.expires_in = expires_in
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        time.sleep(self.delay)
+        with self.lock:
+            self.calls += 1
+            return make_token(self.expires_in, name=f"token-{self.calls}")
+
+
+def test_token_expiry_reads_exp_claim():
+    assert abs(token_expiry(make_token(600)) - (time.time() + 600)) < 2
+    assert token_expiry("not-a-jwt") > time.time() + 3000
+
+
+class TestIdTokenCache:
+    def test_reuses_token_until_near_expiry(self):
+        cache = IdTokenCache()
+        fetch = CountingFetcher()
+
+        tokens = {cache.get("https://a.run.app", fetch) for _ in range(50)}
+
+        assert len(tokens) == 1
+        assert fetch.calls == 1
+
+    def test_tokens_are_keyed_by_audience(self):
+        cache = IdTokenCache()
+        fetch = CountingFetcher()
+
+        assert cache.get("https://a.run.app", fetch) != cache.get("https://b.run.app", fetch)
+        assert fetch.calls == 2
+
+    def test_refreshes_in_background_before_expiry(self):
+        cache = IdTokenCache(refresh_margin=300)
+        fetch = CountingFetcher(expires_in=120, delay=0.05)
+
+        first = cache.get("aud", fetch)
+        # within the refresh margin: the cached token is returned straight away
+        start = time.perf_counter()
+        assert cache.get("aud", fetch) == first
+        assert time.perf_counter() - start < 0.04
+
+        deadline = time.time() + 2
+        while fetch.calls < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        assert fetch.calls == 2
+        assert cache.get("aud", fetch) != first
+
+    def test_concurrent_callers_share_one_fetch(self):
+        cache = IdTokenCache()
+        fetch = CountingFetcher(delay=0.1)
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(cache.get("aud", fetch))) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert fetch.calls == 1
+        assert len(set(results)) == 1
+
+    def test_expired_tokens_are_fetched_again(self):
+        cache = IdTokenCache(min_ttl=30)
+        fetch = CountingFetcher(expires_in=10)
+
+        cache.get("aud", fetch)
+        cache.get("aud", fetch)
+
+        assert fetch.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_async_get_uses_cache(self):
+        cache = IdTokenCache()
+        fetch = CountingFetcher()
+
+        first = await cache.aget("aud", fetch)
+        assert await cache.aget("aud", fetch) == first
+        assert cache.get("aud", fetch) == first
+        assert fetch.calls == 1